@@ -169,7 +169,7 @@ export class RequestsCreateComponent implements OnInit {
           this.close();
         },
         error: err => {
-          this.notificationsService.pushNotification(Notification('ERROR', `Failed to submit evaluation for model ${this.selectedModel!}`));
+          this.notificationsService.pushNotification(Notification('ERROR', `Failed to submit evaluation for model ${this.selectedModel!}: ${err.message}`));
         }
       });
   }
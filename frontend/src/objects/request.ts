@@ -2,6 +2,7 @@ export enum RequestStatus {
   QUEUED = "QUEUED",
   SCHEDULING = "SCHEDULING",
   PROCESSING = "PROCESSING",
+  UPLOADING = "UPLOADING",
   FAILED = "FAILED",
   COMPLETED = "COMPLETED",
 }
@@ -72,7 +72,13 @@ export class RequestsService {
           return submissionResult;
         }),
         catchError(error => {
-          const errorString = mapHttpError(error);
+          let errorString = mapHttpError(error);
+
+          // admission control rejected the request, see server WorkRequestAdmissionController
+          if (error.status === 429 && error.headers?.get('Retry-After') != null) {
+            errorString = `${errorString}, please retry in ${error.headers.get('Retry-After')} seconds`;
+          }
+
           const submissionResult = {
             success: false,
             error: errorString
@@ -0,0 +1,147 @@
+###
+# Microbenchmark of the WorkRequest cache reconciliation (see library/cache_reconciliation.py),
+#   against the previous nested filter / any(map(...)) of WorkRequestWorker._handle_work_request_cache.
+#
+# The database is replaced by an in-memory table, so only the reconciliation itself is measured.
+#   Every run checks that the non-cached entries match the previous implementation (where it is run) and
+#   that the lookups are done in fixed-size batches of unique hashes.
+#
+# From the server base directory:
+#   PYTHONPATH=src python benchmarks/cache_reconciliation.py
+###
+
+from random import Random
+from sys import argv
+from time import perf_counter
+from typing import Dict, List
+
+from library.cache_reconciliation import CacheReconciliation, hash_input
+
+SIZES = [1000, 10000, 100000]
+# the previous implementation is quadratic, it is only run up to this size
+LEGACY_MAX_SIZE = 10000
+HIT_RATIO = 0.5
+DUPLICATE_RATIO = 0.1
+BATCH_SIZE = 1000
+
+
+class CachedRecord:
+    input_hash: str
+    input: str
+    result: str
+
+    def __init__(self, input_hash: str, input: str, result: str):
+        self.input_hash = input_hash
+        self.input = input
+        self.result = result
+
+
+class InMemoryCacheTable:
+    _records: Dict[str, CachedRecord]
+
+    query_count: int
+    max_query_size: int
+
+    def __init__(self, inputs: List[str]):
+        self._records = dict(
+            map(
+                lambda input: (
+                    hash_input(input),
+                    CachedRecord(hash_input(input), input, '{"value": 1}'),
+                ),
+                inputs,
+            )
+        )
+
+        self.query_count = 0
+        self.max_query_size = 0
+
+    def select(self, input_hashes: List[str]) -> List[CachedRecord]:
+        self.query_count += 1
+        self.max_query_size = max(self.max_query_size, len(input_hashes))
+
+        return [
+            self._records[input_hash]
+            for input_hash in input_hashes
+            if input_hash in self._records
+        ]
+
+
+def generate_inputs(size: int, rng: Random) -> tuple[List[str], List[str]]:
+    unique_count = max(1, int(size * (1 - DUPLICATE_RATIO)))
+    unique_inputs = [
+        "C%dCC(=O)O%d" % (i, rng.randint(0, 1 << 30)) for i in range(unique_count)
+    ]
+    inputs = unique_inputs + [
+        rng.choice(unique_inputs) for _ in range(size - unique_count)
+    ]
+    rng.shuffle(inputs)
+    cached_inputs = rng.sample(unique_inputs, int(unique_count * HIT_RATIO))
+
+    return inputs, cached_inputs
+
+
+def legacy_non_cached_entries(
+    inputs: List[str], cached_results: List[CachedRecord]
+) -> List[str]:
+    return list(
+        filter(
+            lambda input: not any(
+                map(
+                    lambda cached_result: input == cached_result.input,
+                    cached_results,
+                )
+            ),
+            inputs,
+        )
+    )
+
+
+def run(size: int, rng: Random) -> str:
+    inputs, cached_inputs = generate_inputs(size, rng)
+    table = InMemoryCacheTable(cached_inputs)
+
+    start = perf_counter()
+    reconciliation: CacheReconciliation[CachedRecord] = CacheReconciliation(inputs)
+    reconciliation.lookup(table.select, BATCH_SIZE)
+    cached_records = reconciliation.cached_records()
+    non_cached_entries = reconciliation.non_cached_inputs()
+    duration = perf_counter() - start
+
+    unique_count = len(reconciliation.unique_inputs)
+    expected_queries = (unique_count + BATCH_SIZE - 1) // BATCH_SIZE
+
+    assert len(cached_records) == len(cached_inputs)
+    assert len(non_cached_entries) + len(reconciliation.hit_indexes()) == size
+    assert table.query_count == expected_queries
+    assert table.max_query_size <= BATCH_SIZE
+
+    legacy = "skipped"
+
+    if size <= LEGACY_MAX_SIZE:
+        start = perf_counter()
+        legacy_entries = legacy_non_cached_entries(inputs, cached_records)
+        legacy_duration = perf_counter() - start
+
+        assert legacy_entries == non_cached_entries
+
+        legacy = "%.4fs (x%.0f)" % (legacy_duration, legacy_duration / duration)
+
+    return (
+        "inputs = %6d, unique = %6d, hits = %6d, queries = %3d | reconciliation = %.4fs | legacy = %s"
+        % (
+            size,
+            unique_count,
+            len(cached_records),
+            table.query_count,
+            duration,
+            legacy,
+        )
+    )
+
+
+if __name__ == "__main__":
+    rng = Random(int(argv[1]) if len(argv) > 1 else 42)
+
+    for size in SIZES:
+        print(run(size, rng))
@@ -0,0 +1,46 @@
+# usage (from the server base directory): ./operations/simulate-local.sh simulation/configs/example.json
+
+# NOTE: a dedicated, fresh postgresql docker instance per run
+echo -e "\nStarting simulation docker postgresql..."
+docker rm -f ersilia-pgsql-simulation > /dev/null 2>&1
+docker run --name ersilia-pgsql-simulation -p 5433:5432 -e POSTGRES_PASSWORD=password -d postgres
+
+until docker exec ersilia-pgsql-simulation pg_isready -U postgres > /dev/null 2>&1; do
+    sleep 1
+done
+
+if [ "$VIRTUAL_ENV" = "" ]; then
+    echo "\nActivating virtual env..."
+    export VIRTUAL_ENV="$(pwd)/.venv"
+    export PATH="$VIRTUAL_ENV/bin:$PATH"
+fi
+
+export APPLICATION_NAME="ersilia-hub-simulation"
+
+export DATABASE_HOST="localhost"
+export DATABASE_PORT="5433"
+export DATABASE_NAME="postgres"
+export DATABASE_USERNAME="postgres"
+export DATABASE_PASSWORD="password"
+export DATABASE_SCHEMA="public"
+export DATABASE_MIGRATIONS_PATH="src/db/migrations"
+
+export LOG_LEVEL_WorkRequestController="WARN"
+export LOG_LEVEL_WorkRequestWorker="WARN"
+export LOG_LEVEL_ModelInstanceHandler="WARN"
+export LOG_LEVEL_JobSubmissionProcess="WARN"
+export LOG_LEVEL_ModelInputCache="WARN"
+
+export ERSILIA_CATALOG_MODELS_URL="http://localhost/unused"
+
+export SERVER_ID="simulation-0"
+
+export PASSWORD_SALT="simulation"
+
+export PYTHONPATH="$(pwd)/src"
+
+echo "\nStarting simulation..."
+
+python3 simulation/run.py $1
+
+export VIRTUAL_ENV=""
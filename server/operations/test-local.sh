@@ -28,6 +28,7 @@ export LOG_LEVEL_K8sController="DEBUG"
 export LOG_LEVEL_K8sProxyController="INFO"
 export LOG_LEVEL_WorkRequestController="DEBUG"
 export LOG_LEVEL_WorkRequestWorker="TRACE"
+export LOG_LEVEL_WorkRequestNotifier="DEBUG"
 export LOG_LEVEL_JobSubmissionTask="TRACE"
 export LOG_LEVEL_S3IntegrationController="DEBUG"
 export LOG_LEVEL_AuthController="INFO"
@@ -0,0 +1,25 @@
+from datetime import datetime
+from json import load
+from sys import argv
+
+from simulation.config import SimulationConfig
+from simulation.process import SimulationProcess
+
+RESULTS_PATH = "simulation/results"
+
+
+if __name__ == "__main__":
+    config: SimulationConfig | None = None
+
+    with open(argv[1], "r") as file:
+        config = SimulationConfig.from_json(load(file))
+
+    report = SimulationProcess(config).run()
+    report_text = report.to_text()
+
+    print(report_text)
+
+    report_timestamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
+
+    with open(f"{RESULTS_PATH}/{config.name}_{report_timestamp}.txt", "w+") as file:
+        file.write(report_text)
@@ -0,0 +1,249 @@
+from math import log, sqrt
+from random import Random
+from typing import Any, Dict, List
+
+
+# NOTE: every random stream is derived from the simulation seed + a stable key (e.g. model + pod number),
+#       so samples do not depend on the order in which threads draw them
+def seeded_random(seed: int, *keys: Any) -> Random:
+    return Random(":".join(map(str, (seed,) + keys)))
+
+
+class Distribution:
+    """
+    Random durations / sizes, configured as e.g. `{"distribution": "lognormal", "mean": 30, "stddev": 10}`
+
+    supported: constant (value), uniform (min, max), normal (mean, stddev), lognormal (mean, stddev), exponential (mean)
+    """
+
+    distribution: str
+    params: Dict[str, float]
+
+    def __init__(self, distribution: str, params: Dict[str, float]):
+        self.distribution = distribution
+        self.params = params
+
+        if distribution not in [
+            "constant",
+            "uniform",
+            "normal",
+            "lognormal",
+            "exponential",
+        ]:
+            raise Exception("Unsupported distribution [%s]" % distribution)
+
+    @staticmethod
+    def constant(value: float) -> "Distribution":
+        return Distribution("constant", {"value": value})
+
+    @staticmethod
+    def from_json(obj: Dict[str, Any] | float | int) -> "Distribution":
+        if isinstance(obj, (int, float)):
+            return Distribution.constant(float(obj))
+
+        return Distribution(
+            obj["distribution"],
+            dict(
+                map(
+                    lambda item: (item[0], float(item[1])),
+                    filter(lambda item: item[0] != "distribution", obj.items()),
+                )
+            ),
+        )
+
+    def sample(self, rng: Random) -> float:
+        if self.distribution == "constant":
+            return self.params["value"]
+
+        if self.distribution == "uniform":
+            return rng.uniform(self.params["min"], self.params["max"])
+
+        if self.distribution == "normal":
+            return max(0, rng.gauss(self.params["mean"], self.params["stddev"]))
+
+        if self.distribution == "lognormal":
+            # NOTE: mean + stddev of the samples, not of the underlying normal distribution
+            mean = self.params["mean"]
+            variance = self.params["stddev"] ** 2
+            sigma = sqrt(log(1 + variance / mean**2))
+
+            return rng.lognormvariate(log(mean) - sigma**2 / 2, sigma)
+
+        return rng.expovariate(1 / self.params["mean"])
+
+    def mean(self) -> float:
+        if self.distribution == "constant":
+            return self.params["value"]
+
+        if self.distribution == "uniform":
+            return (self.params["min"] + self.params["max"]) / 2
+
+        return self.params["mean"]
+
+    def __str__(self) -> str:
+        return "%s(%s)" % (
+            self.distribution,
+            ", ".join(map(lambda item: "%s=%s" % item, self.params.items())),
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class SimulationModelConfig:
+    model_id: str
+    execution_mode: str
+    max_instances: int
+    max_shards: int
+    instance_idle_timeout: int
+    cache_enabled: bool
+
+    arrival_rate: float  # WorkRequests per second (poisson)
+    request_size: Distribution  # entries per WorkRequest
+    input_pool_size: int | None  # None = every entry is unique
+    pod_startup: Distribution  # seconds from pod creation to ready
+    job_overhead: Distribution  # seconds per job
+    entry_runtime: Distribution  # seconds per entry
+    job_failure_rate: float
+
+    def __init__(
+        self,
+        model_id: str,
+        arrival_rate: float,
+        request_size: Distribution,
+        pod_startup: Distribution,
+        job_overhead: Distribution,
+        entry_runtime: Distribution,
+        execution_mode: str = "ASYNC",
+        max_instances: int = -1,
+        max_shards: int = 1,
+        instance_idle_timeout: int = 0,
+        cache_enabled: bool = False,
+        input_pool_size: int | None = None,
+        job_failure_rate: float = 0,
+    ):
+        self.model_id = model_id
+        self.arrival_rate = arrival_rate
+        self.request_size = request_size
+        self.pod_startup = pod_startup
+        self.job_overhead = job_overhead
+        self.entry_runtime = entry_runtime
+        self.execution_mode = execution_mode
+        self.max_instances = max_instances
+        self.max_shards = max_shards
+        self.instance_idle_timeout = instance_idle_timeout
+        self.cache_enabled = cache_enabled
+        self.input_pool_size = input_pool_size
+        self.job_failure_rate = job_failure_rate
+
+    @staticmethod
+    def from_json(obj: Dict[str, Any]) -> "SimulationModelConfig":
+        return SimulationModelConfig(
+            obj["modelId"],
+            float(obj["arrivalRate"]),
+            Distribution.from_json(obj["requestSize"]),
+            Distribution.from_json(obj["podStartup"]),
+            Distribution.from_json(obj.get("jobOverhead", 0)),
+            Distribution.from_json(obj["entryRuntime"]),
+            execution_mode=obj.get("executionMode", "ASYNC"),
+            max_instances=int(obj.get("maxInstances", -1)),
+            max_shards=int(obj.get("maxShards", 1)),
+            instance_idle_timeout=int(obj.get("instanceIdleTimeout", 0)),
+            cache_enabled=bool(obj.get("cacheEnabled", False)),
+            input_pool_size=(
+                None if obj.get("inputPoolSize") is None else int(obj["inputPoolSize"])
+            ),
+            job_failure_rate=float(obj.get("jobFailureRate", 0)),
+        )
+
+    def __str__(self) -> str:
+        return (
+            "(model_id = '%s', arrival_rate = %s, request_size = %s, pod_startup = %s, entry_runtime = %s)"
+            % (
+                self.model_id,
+                self.arrival_rate,
+                self.request_size,
+                self.pod_startup,
+                self.entry_runtime,
+            )
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class SimulationConfig:
+    name: str
+    seed: int
+    duration: float  # seconds during which WorkRequests are submitted
+    drain_timeout: float  # seconds to wait for in-flight WorkRequests after the last submission
+    users: int  # distinct (anonymous) users submitting WorkRequests
+    cache_opt_in: bool
+    upload_time: Distribution  # seconds per S3 upload
+    env: Dict[str, str]  # server env vars, e.g. WORK_REQUEST_WORKERS_MAX
+    model_configs: List[SimulationModelConfig]
+
+    def __init__(
+        self,
+        name: str,
+        model_configs: List[SimulationModelConfig],
+        seed: int = 0,
+        duration: float = 600,
+        drain_timeout: float = 1800,
+        users: int = 10,
+        cache_opt_in: bool = False,
+        upload_time: Distribution | None = None,
+        env: Dict[str, str] | None = None,
+    ):
+        self.name = name
+        self.model_configs = model_configs
+        self.seed = seed
+        self.duration = duration
+        self.drain_timeout = drain_timeout
+        self.users = users
+        self.cache_opt_in = cache_opt_in
+        self.upload_time = (
+            Distribution.constant(0) if upload_time is None else upload_time
+        )
+        self.env = {} if env is None else env
+
+        if users < 1 or users > 101:
+            # NOTE: WorkRequests are submitted as the (pre-seeded) anonymous users
+            raise Exception("'users' should be between 1 and 101")
+
+    @staticmethod
+    def from_json(obj: Dict[str, Any]) -> "SimulationConfig":
+        return SimulationConfig(
+            obj.get("name", "simulation"),
+            list(map(SimulationModelConfig.from_json, obj["modelConfigs"])),
+            seed=int(obj.get("seed", 0)),
+            duration=float(obj.get("duration", 600)),
+            drain_timeout=float(obj.get("drainTimeout", 1800)),
+            users=int(obj.get("users", 10)),
+            cache_opt_in=bool(obj.get("cacheOptIn", False)),
+            upload_time=(
+                None
+                if "uploadTime" not in obj
+                else Distribution.from_json(obj["uploadTime"])
+            ),
+            env=dict(map(lambda item: (item[0], str(item[1])), obj.get("env", {}).items())),
+        )
+
+    def model_config(self, model_id: str) -> SimulationModelConfig | None:
+        for model_config in self.model_configs:
+            if model_config.model_id == model_id:
+                return model_config
+
+        return None
+
+    def __str__(self) -> str:
+        return "(name = '%s', seed = %d, duration = %s, env = %s, model_configs = [%s])" % (
+            self.name,
+            self.seed,
+            self.duration,
+            self.env,
+            ", ".join(map(str, self.model_configs)),
+        )
+
+    def __repr__(self) -> str:
+        return self.__str__()
@@ -0,0 +1,268 @@
+from threading import Lock
+from time import time
+from typing import Dict, List, Union
+
+from objects.k8s import (
+    ErsiliaAnnotations,
+    ErsiliaLabels,
+    K8sNode,
+    K8sPod,
+    K8sPodContainerState,
+    K8sPodResources,
+    K8sPodState,
+)
+from python_framework.config_utils import load_environment_variable
+from python_framework.logger import ContextLogger, LogLevel
+from python_framework.time import utc_now
+from simulation.config import SimulationConfig, seeded_random
+
+###
+# In-process replacement of the K8sController (see controllers/k8s.py), installed as its singleton.
+#
+# Pods are created instantly, and become ready after a startup time sampled from the model's `podStartup`.
+###
+
+
+class FakeK8sPod:
+    name: str
+    model_id: str
+    annotations: Dict[str, str]
+    resources: K8sPodResources
+    ip: str
+    created_at: float
+    ready_at: float
+    start_time: str
+
+    def __init__(
+        self,
+        name: str,
+        model_id: str,
+        annotations: Dict[str, str],
+        resources: K8sPodResources,
+        ip: str,
+        startup_time: float,
+    ):
+        self.name = name
+        self.model_id = model_id
+        self.annotations = annotations
+        self.resources = resources
+        self.ip = ip
+        self.created_at = time()
+        self.ready_at = self.created_at + startup_time
+        self.start_time = utc_now()
+
+    def to_k8s_pod(self, namespace: str) -> K8sPod:
+        ready = time() >= self.ready_at
+
+        return K8sPod(
+            self.name,
+            K8sPodContainerState(
+                "Running" if ready else "Pending",
+                ready,
+                ready,
+                0,
+                {"running": None, "terminated": None, "waiting": None},
+                {"running": None, "terminated": None, "waiting": None},
+            ),
+            self.ip,
+            {
+                ErsiliaLabels.MODEL_ID.value: self.model_id,
+                ErsiliaLabels.K8S_COMPONENT.value: "model",
+            },
+            dict(self.annotations),
+            K8sPodState([], None, None, self.start_time),
+            "simulation-node",
+            self.resources,
+            namespace,
+        )
+
+
+class FakeK8sController:
+    _logger_key: str = None
+    _lock: Lock
+    _namespace: str
+    _config: SimulationConfig
+    _pods: Dict[str, FakeK8sPod]
+    _pod_count: int
+    _model_pod_counts: Dict[str, int]
+
+    peak_pods: int
+    startup_times: List[float]
+
+    def __init__(self, config: SimulationConfig, namespace: str = "eos-models"):
+        self._logger_key = "FakeK8sController"
+        self._lock = Lock()
+        self._namespace = namespace
+        self._config = config
+        self._pods = {}
+        self._pod_count = 0
+        self._model_pod_counts = {}
+
+        self.peak_pods = 0
+        self.startup_times = []
+
+        ContextLogger.instance().create_logger_for_context(
+            self._logger_key,
+            LogLevel.from_string(
+                load_environment_variable(
+                    f"LOG_LEVEL_{self._logger_key}", default=LogLevel.INFO.name
+                )
+            ),
+        )
+
+    def kill(self):
+        pass
+
+    def _find_pod(
+        self, model_id: str, annotations_filter: Dict[str, str]
+    ) -> FakeK8sPod | None:
+        for pod in self._pods.values():
+            if pod.model_id != model_id:
+                continue
+
+            if all(
+                pod.annotations.get(key) == str(value)
+                for key, value in annotations_filter.items()
+            ):
+                return pod
+
+        return None
+
+    def deploy_new_pod(
+        self,
+        model_id: str,
+        k8s_resources: K8sPodResources,
+        disable_memory_limit: bool = False,
+        annotations: Dict[str, str] = None,
+        model_template_version: str = "0.0.0",
+    ) -> Union[None, K8sPod]:
+        model_config = self._config.model_config(model_id)
+
+        if model_config is None:
+            raise Exception("Model [%s] is not simulated" % model_id)
+
+        with self._lock:
+            self._pod_count += 1
+            model_pod_number = self._model_pod_counts.get(model_id, 0) + 1
+            self._model_pod_counts[model_id] = model_pod_number
+
+            startup_time = model_config.pod_startup.sample(
+                seeded_random(self._config.seed, "pod", model_id, model_pod_number)
+            )
+            pod = FakeK8sPod(
+                "model-%s-%d" % (model_id, model_pod_number),
+                model_id,
+                dict(
+                    map(
+                        lambda item: (item[0], str(item[1])),
+                        ({} if annotations is None else annotations).items(),
+                    )
+                ),
+                k8s_resources,
+                "10.%d.%d.%d"
+                % (
+                    (self._pod_count >> 16) & 255,
+                    (self._pod_count >> 8) & 255,
+                    self._pod_count & 255,
+                ),
+                startup_time,
+            )
+            self._pods[pod.name] = pod
+            self.startup_times.append(startup_time)
+            self.peak_pods = max(self.peak_pods, len(self._pods))
+
+        ContextLogger.debug(
+            self._logger_key,
+            "Pod [%s] created, ready in [%.1f]s" % (pod.name, startup_time),
+        )
+
+        return pod.to_k8s_pod(self._namespace)
+
+    def load_model_pods(self, model_id: str = None) -> List[K8sPod]:
+        with self._lock:
+            return list(
+                map(
+                    lambda pod: pod.to_k8s_pod(self._namespace),
+                    filter(
+                        lambda pod: model_id is None or pod.model_id == model_id,
+                        self._pods.values(),
+                    ),
+                )
+            )
+
+    def get_pod(self, pod_name: str) -> K8sPod:
+        with self._lock:
+            pod = self._pods.get(pod_name)
+
+            return None if pod is None else pod.to_k8s_pod(self._namespace)
+
+    def get_pod_by_request(self, model_id: str, request_id: str) -> Union[K8sPod, None]:
+        with self._lock:
+            pod = self._find_pod(
+                model_id, {ErsiliaAnnotations.REQUEST_ID.value: str(request_id)}
+            )
+
+            return None if pod is None else pod.to_k8s_pod(self._namespace)
+
+    def attach_work_request(
+        self, model_id: str, pod_name: str, request_id: str
+    ) -> Union[K8sPod, None]:
+        with self._lock:
+            pod = self._pods.get(pod_name)
+
+            if pod is None:
+                return None
+
+            pod.annotations[ErsiliaAnnotations.REQUEST_ID.value] = str(request_id)
+
+            return pod.to_k8s_pod(self._namespace)
+
+    def clear_work_request(self, model_id: str, pod_name: str) -> Union[K8sPod, None]:
+        with self._lock:
+            pod = self._pods.get(pod_name)
+
+            if pod is None:
+                return None
+
+            pod.annotations.pop(ErsiliaAnnotations.REQUEST_ID.value, None)
+
+            return pod.to_k8s_pod(self._namespace)
+
+    def delete_pod(
+        self,
+        model_id: str,
+        annotations_filter: Dict[str, str] = None,
+        target_pod_name: str = None,
+        force: bool = False,
+    ) -> bool:
+        with self._lock:
+            if target_pod_name is None:
+                if annotations_filter is None or len(annotations_filter) == 0:
+                    return False
+
+                pod = self._find_pod(model_id, annotations_filter)
+
+                if pod is None:
+                    return True
+
+                target_pod_name = pod.name
+
+            return self._pods.pop(target_pod_name, None) is not None
+
+    def download_pod_logs(
+        self,
+        model_id: str,
+        annotations_filter: Dict[str, str] | None = None,
+        target_pod_name: str | None = None,
+    ) -> str | None:
+        return "simulated pod logs"
+
+    def list_nodes(self) -> List[K8sNode]:
+        return []
+
+    def scrape_node_metrics(self, node_name: str) -> List[str]:
+        return []
+
+    def active_pod_count(self) -> int:
+        with self._lock:
+            return len(self._pods)
@@ -0,0 +1,215 @@
+from asyncio import sleep
+from hashlib import md5
+from threading import Event, Lock
+from time import time
+from typing import Dict, List, Tuple
+from uuid import uuid4
+
+from objects.model_integration import (
+    JobResult,
+    JobStatus,
+    JobStatusResponse,
+    JobSubmissionResponse,
+)
+from python_framework.config_utils import load_environment_variable
+from python_framework.logger import ContextLogger, LogLevel
+from simulation.config import SimulationConfig, seeded_random
+
+###
+# In-process replacement of the ModelIntegrationController (see controllers/model_integration.py),
+#   installed as its singleton.
+#
+# A job takes the model's `jobOverhead` + `entryRuntime` per entry, and fails with `jobFailureRate`.
+#   Both are sampled per (model, job entries), so the same job always takes the same time.
+#
+# NOTE: async, like the ModelIntegrationController, a SYNC job sleeps on the ModelInstanceSupervisor's event loop.
+###
+
+
+class FakeJob:
+    job_id: str
+    model_id: str
+    entries: List[str]
+    completes_at: float
+    failed: bool
+
+    def __init__(
+        self,
+        job_id: str,
+        model_id: str,
+        entries: List[str],
+        runtime: float,
+        failed: bool,
+    ):
+        self.job_id = job_id
+        self.model_id = model_id
+        self.entries = entries
+        self.completes_at = time() + runtime
+        self.failed = failed
+
+
+class FakeModelIntegrationController:
+    _logger_key: str = None
+    _kill_event: Event
+    _lock: Lock
+    _config: SimulationConfig
+    _jobs: Dict[str, FakeJob]
+
+    jobs_submitted: int
+    jobs_failed: int
+    entries_processed: int
+    busy_time: float  # sum of job runtimes, in seconds
+
+    def __init__(self, config: SimulationConfig):
+        self._logger_key = "FakeModelIntegrationController"
+        self._kill_event = Event()
+        self._lock = Lock()
+        self._config = config
+        self._jobs = {}
+
+        self.jobs_submitted = 0
+        self.jobs_failed = 0
+        self.entries_processed = 0
+        self.busy_time = 0
+
+        ContextLogger.instance().create_logger_for_context(
+            self._logger_key,
+            LogLevel.from_string(
+                load_environment_variable(
+                    f"LOG_LEVEL_{self._logger_key}", default=LogLevel.INFO.name
+                )
+            ),
+        )
+
+    def kill(self):
+        self._kill_event.set()
+
+    def _sample_job(self, model_id: str, entries: List[str]) -> Tuple[float, bool]:
+        model_config = self._config.model_config(model_id)
+
+        if model_config is None:
+            raise Exception("Model [%s] is not simulated" % model_id)
+
+        rng = seeded_random(
+            self._config.seed,
+            "job",
+            model_id,
+            md5("\n".join(entries).encode()).hexdigest(),
+        )
+        runtime = model_config.job_overhead.sample(rng)
+
+        for _ in entries:
+            runtime += model_config.entry_runtime.sample(rng)
+
+        failed = rng.random() < model_config.job_failure_rate
+
+        with self._lock:
+            self.jobs_submitted += 1
+            self.busy_time += runtime
+
+            if failed:
+                self.jobs_failed += 1
+            else:
+                self.entries_processed += len(entries)
+
+        return runtime, failed
+
+    @staticmethod
+    def _job_result(entries: List[str]) -> JobResult:
+        return list(
+            map(
+                lambda entry: {
+                    "input": {"key": md5(entry.encode()).hexdigest(), "input": entry},
+                    "output": {"value": int(md5(entry.encode()).hexdigest()[:8], 16)},
+                },
+                entries,
+            )
+        )
+
+    async def healthz(self, model_id: str, request_id: str, host: str) -> bool:
+        return True
+
+    async def get_model_version(
+        self, model_id: str, request_id: str, host: str
+    ) -> str | None:
+        return "simulation"
+
+    async def wait_for_model_readiness(
+        self, model_id: str, request_id: str, host: str
+    ) -> bool:
+        return True
+
+    async def submit_job(
+        self,
+        model_id: str,
+        request_id: str,
+        host: str,
+        entries: List[str],
+        wait_for_readiness: bool = True,
+    ) -> JobSubmissionResponse:
+        runtime, failed = self._sample_job(model_id, entries)
+        job = FakeJob(str(uuid4()), model_id, list(entries), runtime, failed)
+
+        with self._lock:
+            self._jobs[job.job_id] = job
+
+        ContextLogger.debug(
+            self._logger_key,
+            "Job [%s] submitted for request [%s], runtime = [%.1f]s"
+            % (job.job_id, request_id, runtime),
+        )
+
+        return JobSubmissionResponse(job.job_id, "Job submitted")
+
+    async def submit_job_sync(
+        self,
+        model_id: str,
+        request_id: str,
+        host: str,
+        entries: List[str],
+        wait_for_readiness: bool = True,
+    ) -> Tuple[JobStatus, str, JobResult]:
+        runtime, failed = self._sample_job(model_id, entries)
+        completes_at = time() + runtime
+
+        while time() < completes_at:
+            if self._kill_event.is_set():
+                return JobStatus.FAILED, "Simulation stopped", None
+
+            await sleep(min(1, completes_at - time()))
+
+        if failed:
+            return JobStatus.FAILED, "Simulated job failure", None
+
+        return JobStatus.COMPLETED, "Job completed", self._job_result(entries)
+
+    async def get_job_status(
+        self, model_id: str, request_id: str, host: str, job_id: str
+    ) -> JobStatusResponse:
+        with self._lock:
+            job = self._jobs.get(job_id)
+
+        if job is None:
+            raise Exception("Unknown job [%s]" % job_id)
+
+        if time() < job.completes_at:
+            return JobStatusResponse(job_id, JobStatus.PENDING)
+
+        if job.failed:
+            with self._lock:
+                self._jobs.pop(job_id, None)
+
+            return JobStatusResponse(job_id, JobStatus.FAILED)
+
+        return JobStatusResponse(job_id, JobStatus.COMPLETED)
+
+    async def get_job_result(
+        self, model_id: str, request_id: str, host: str, job_id: str
+    ) -> JobResult:
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+
+        if job is None:
+            raise Exception("Unknown job [%s]" % job_id)
+
+        return self._job_result(job.entries)
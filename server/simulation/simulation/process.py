@@ -0,0 +1,385 @@
+###
+# Runs the real WorkRequestController, WorkRequestWorkers and ModelInstanceHandlers in-process,
+#   against a local Postgres, with fake K8s, model servers and S3 (see k8s.py, model_integration.py, s3_integration.py).
+#
+# 1. apply the configured server env vars (e.g. WORK_REQUEST_WORKERS_MAX, MAX_CONCURRENT_MODEL_INSTANCES)
+# 2. initialize the server controllers, with the fakes installed as the K8s / ModelIntegration / S3 singletons
+# 3. persist the simulated models
+# 4. submit the (seeded) workload, as the WorkRequest API would
+# 5. track the WorkRequest events until all WorkRequests finished, or the drain timeout is reached
+# 6. report throughput, queue wait and end-to-end latency
+#
+# NOTE: the server threads run in real time (poll intervals, handler steps), only the workload and the
+#       fake durations are seeded. Runs are repeatable, but thread interleavings might differ slightly.
+###
+
+import traceback
+from os import environ
+from sys import exc_info, stdout
+from threading import Event, Lock
+from time import time
+from typing import Dict, List
+
+from app import init_configs, init_database
+from controllers.failed_server_handler import FailedServerHandler
+from controllers.instance_metrics import InstanceMetricsController
+from controllers.k8s import K8sController
+from controllers.model import ModelController
+from controllers.model_input_cache import ModelInputCache
+from controllers.model_input_cache_filter import ModelInputCacheFilter
+from controllers.model_input_cache_writer import ModelInputCacheWriter
+from controllers.model_instance_handler import ModelInstanceController
+from controllers.model_instance_log import ModelInstanceLogController
+from controllers.model_instance_supervisor import ModelInstanceSupervisor
+from controllers.model_integration import ModelIntegrationController
+from controllers.model_prewarmer import ModelPrewarmer
+from controllers.result_upload_queue import ResultUploadQueue
+from controllers.s3_integration import S3IntegrationController
+from controllers.server import ServerController
+from controllers.single_flight import SingleFlightRegistry
+from controllers.work_request import WorkRequestController
+from controllers.work_request_notifier import WorkRequestEvent, WorkRequestNotifier
+from objects.model import Model, ModelDetails, ModelExecutionMode, ModelUpdate
+from objects.work_request import (
+    TrackingData,
+    WorkRequest,
+    WorkRequestMetadata,
+    WorkRequestPayload,
+    WorkRequestStatus,
+)
+from python_framework.graceful_killer import GracefulKiller, KillInstance
+from python_framework.logger import ContextLogger, LogLevel
+from python_framework.time import utc_now
+from simulation.config import SimulationConfig
+from simulation.k8s import FakeK8sController
+from simulation.model_integration import FakeModelIntegrationController
+from simulation.report import SimulatedRequest, SimulationReport
+from simulation.s3_integration import FakeS3IntegrationController
+from simulation.workload import SimulatedArrival, generate_arrivals
+
+
+class SimulationProcessKillInstance(KillInstance):
+    _process: "SimulationProcess"
+
+    def __init__(self, process: "SimulationProcess"):
+        self._process = process
+
+    def kill(self):
+        self._process.kill()
+
+
+class SimulationProcess:
+    # missed WorkRequest events are recovered from the database
+    SYNC_INTERVAL = 10
+
+    _logger_key: str = None
+    _kill_event: Event
+    _lock: Lock
+
+    config: SimulationConfig
+    k8s: FakeK8sController
+    model_integration: FakeModelIntegrationController
+    s3_integration: FakeS3IntegrationController
+
+    _start_time: float | None
+    _start_date: str | None
+    _requests: Dict[int, SimulatedRequest]
+    # events of WorkRequests that are not registered yet (published before create_request returned)
+    _early_events: Dict[int, List[tuple[str, float]]]
+
+    def __init__(self, config: SimulationConfig):
+        self._logger_key = "Simulation"
+        self._kill_event = Event()
+        self._lock = Lock()
+
+        self.config = config
+        self._start_time = None
+        self._start_date = None
+        self._requests = {}
+        self._early_events = {}
+
+    def _elapsed(self) -> float:
+        return time() - self._start_time
+
+    def _init_server(self):
+        for key, value in self.config.env.items():
+            environ[key] = value
+
+        ContextLogger.initialize()
+        ContextLogger.instance().create_logger_for_context(
+            self._logger_key, LogLevel.INFO
+        )
+
+        init_configs()
+        init_database()
+
+        GracefulKiller.initialize()
+        GracefulKiller.instance().register_kill_instance(
+            SimulationProcessKillInstance(self)
+        )
+
+        # NOTE: the fakes replace the singletons, before any controller uses them
+        self.k8s = FakeK8sController(self.config)
+        self.model_integration = FakeModelIntegrationController(self.config)
+        self.s3_integration = FakeS3IntegrationController(self.config)
+        K8sController._instance = self.k8s
+        ModelIntegrationController._instance = self.model_integration
+        S3IntegrationController._instance = self.s3_integration
+
+        # same order as app.init, without the API + unrelated controllers
+        ModelController.initialize()
+        ModelInputCacheWriter.initialize()
+        ModelInputCacheFilter.initialize()
+        ModelInputCache.initialize()
+        SingleFlightRegistry.initialize()
+        ModelInstanceLogController.initialize()
+        InstanceMetricsController.initialize()
+        ModelInstanceController.initialize()
+        ModelInstanceSupervisor.initialize()
+        ServerController.initialize()
+        FailedServerHandler.initialize()
+        WorkRequestNotifier.initialize()
+        WorkRequestController.initialize()
+        ModelPrewarmer.initialize()
+        ResultUploadQueue.initialize()
+
+    def _persist_models(self):
+        # NOTE: loads the persisted models into the cache, before the ModelController thread is started
+        ModelController.instance()._update_models_state()
+
+        for model_config in self.config.model_configs:
+            details = ModelDetails(
+                "0.0.0",
+                "Simulated model",
+                512,
+                False,
+                model_config.max_instances,
+                ModelExecutionMode(model_config.execution_mode),
+                cache_enabled=model_config.cache_enabled,
+                instance_idle_timeout=model_config.instance_idle_timeout,
+                max_shards=model_config.max_shards,
+            )
+
+            if ModelController.instance().model_exists(model_config.model_id):
+                model = ModelController.instance().update_model(
+                    ModelUpdate(model_config.model_id, details, True)
+                )
+            else:
+                model = ModelController.instance().create_model(
+                    Model(model_config.model_id, True, details)
+                )
+
+            if model is None:
+                raise Exception(
+                    "Failed to persist simulated model [%s]" % model_config.model_id
+                )
+
+    def _start_server(self):
+        ModelInstanceSupervisor.instance().start()
+        ModelController.instance().start()
+        ServerController.instance().start()
+        FailedServerHandler.instance().start()
+        WorkRequestNotifier.instance().start()
+        ResultUploadQueue.instance().start()
+        ModelInputCacheWriter.instance().start()
+        ModelInputCacheFilter.instance().start()
+        WorkRequestController.instance().start()
+        ModelPrewarmer.instance().start()
+
+    def on_work_request_event(self, event: WorkRequestEvent):
+        if self._start_time is None:
+            return
+
+        timestamp = self._elapsed()
+
+        with self._lock:
+            request = self._requests.get(event.work_request_id)
+
+            if request is None:
+                self._early_events.setdefault(event.work_request_id, []).append(
+                    (event.request_status, timestamp)
+                )
+
+                return
+
+            request.record_status(event.request_status, timestamp)
+
+    def _register_request(self, request: SimulatedRequest):
+        with self._lock:
+            self._requests[request.work_request_id] = request
+
+            for status, timestamp in self._early_events.pop(
+                request.work_request_id, []
+            ):
+                request.record_status(status, timestamp)
+
+    def _submit(self, arrival: SimulatedArrival):
+        work_request = WorkRequest(
+            None,
+            arrival.model_id,
+            arrival.user_id,
+            WorkRequestPayload(
+                arrival.entries,
+                cache_opt_in=self.config.cache_opt_in,
+                has_header=False,
+            ),
+            None,
+            WorkRequestMetadata(
+                TrackingData("simulation", arrival.session_id), None
+            ),
+            WorkRequestStatus.QUEUED,
+            input_size=len(arrival.entries),
+        )
+        submitted_at = self._elapsed()
+        persisted_request = WorkRequestController.instance().create_request(
+            work_request
+        )
+
+        if persisted_request is None:
+            ContextLogger.warn(
+                self._logger_key,
+                "Failed to submit WorkRequest for model [%s]" % arrival.model_id,
+            )
+
+            return
+
+        self._register_request(
+            SimulatedRequest(
+                persisted_request.id,
+                arrival.model_id,
+                len(arrival.entries),
+                submitted_at,
+            )
+        )
+
+    def _unfinished_count(self) -> int:
+        with self._lock:
+            return len(
+                list(filter(lambda r: not r.is_finished(), self._requests.values()))
+            )
+
+    def _sync_finished_requests(self):
+        work_requests = WorkRequestController.instance().get_requests(
+            model_ids=list(map(lambda c: c.model_id, self.config.model_configs)),
+            request_date_from=self._start_date,
+            request_statuses=[
+                WorkRequestStatus.COMPLETED.value,
+                WorkRequestStatus.FAILED.value,
+            ],
+            limit=100000,
+            include_payload=False,
+        )
+        timestamp = self._elapsed()
+
+        with self._lock:
+            for work_request in work_requests:
+                request = self._requests.get(work_request.id)
+
+                if request is None or request.is_finished():
+                    continue
+
+                request.record_status(str(work_request.request_status), timestamp)
+
+    def _submit_workload(self, arrivals: List[SimulatedArrival]):
+        ContextLogger.info(
+            self._logger_key,
+            "Submitting [%d] WorkRequests over [%.0f]s..."
+            % (len(arrivals), self.config.duration),
+        )
+
+        for arrival in arrivals:
+            wait_time = arrival.offset - self._elapsed()
+
+            if wait_time > 0 and self._kill_event.wait(wait_time):
+                return
+
+            try:
+                self._submit(arrival)
+            except:
+                ContextLogger.error(
+                    self._logger_key,
+                    "Failed to submit WorkRequest, error = [%s]" % repr(exc_info()),
+                )
+                traceback.print_exc(file=stdout)
+
+    def _drain(self) -> float:
+        drain_deadline = self._elapsed() + self.config.drain_timeout
+        last_sync = self._elapsed()
+
+        while self._unfinished_count() > 0:
+            if self._elapsed() >= drain_deadline:
+                ContextLogger.warn(
+                    self._logger_key,
+                    "Drain timeout reached, [%d] WorkRequests unfinished"
+                    % self._unfinished_count(),
+                )
+
+                return self._elapsed()
+
+            if self._elapsed() - last_sync >= SimulationProcess.SYNC_INTERVAL:
+                try:
+                    self._sync_finished_requests()
+                except:
+                    ContextLogger.warn(
+                        self._logger_key,
+                        "Failed to sync finished WorkRequests, error = [%s]"
+                        % repr(exc_info()),
+                    )
+
+                last_sync = self._elapsed()
+
+            if self._kill_event.wait(1):
+                break
+
+        with self._lock:
+            finish_times = list(
+                map(
+                    lambda r: r.status_times[r.final_status],
+                    filter(lambda r: r.is_finished(), self._requests.values()),
+                )
+            )
+
+        return self._elapsed() if len(finish_times) == 0 else max(finish_times)
+
+    def kill(self):
+        self._kill_event.set()
+
+    def run(self) -> SimulationReport:
+        arrivals = generate_arrivals(self.config)
+
+        self._init_server()
+        self._persist_models()
+
+        WorkRequestNotifier.instance().register_listener(self.on_work_request_event)
+
+        try:
+            self._start_server()
+
+            self._start_time = time()
+            self._start_date = utc_now()
+
+            self._submit_workload(arrivals)
+            elapsed = self._drain()
+        finally:
+            self.model_integration.kill()
+            self.s3_integration.kill()
+            GracefulKiller.instance().exit_gracefully()
+
+        with self._lock:
+            requests = sorted(self._requests.values(), key=lambda r: r.submitted_at)
+
+        return SimulationReport(
+            self.config,
+            requests,
+            elapsed,
+            len(self.k8s.startup_times),
+            self.k8s.peak_pods,
+            (
+                None
+                if len(self.k8s.startup_times) == 0
+                else sum(self.k8s.startup_times) / len(self.k8s.startup_times)
+            ),
+            self.model_integration.jobs_submitted,
+            self.model_integration.jobs_failed,
+            self.model_integration.entries_processed,
+        )
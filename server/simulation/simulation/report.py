@@ -0,0 +1,174 @@
+from math import ceil
+from typing import Dict, List
+
+from simulation.config import SimulationConfig
+
+PERCENTILES = [50, 90, 95, 99]
+
+
+class SimulatedRequest:
+    """
+    Timeline of a submitted WorkRequest, in seconds since the start of the simulation
+    """
+
+    work_request_id: int
+    model_id: str
+    input_size: int
+    submitted_at: float
+    # first time the WorkRequest was seen in a status, see WorkRequestStatus
+    status_times: Dict[str, float]
+    final_status: str | None
+
+    def __init__(
+        self, work_request_id: int, model_id: str, input_size: int, submitted_at: float
+    ):
+        self.work_request_id = work_request_id
+        self.model_id = model_id
+        self.input_size = input_size
+        self.submitted_at = submitted_at
+        self.status_times = {}
+        self.final_status = None
+
+    def record_status(self, status: str, timestamp: float):
+        if status not in self.status_times:
+            self.status_times[status] = timestamp
+
+        if status in ["COMPLETED", "FAILED"]:
+            self.final_status = status
+
+    def is_finished(self) -> bool:
+        return self.final_status is not None
+
+    # time spent QUEUED, until claimed (SCHEDULING) by a worker
+    def queue_wait(self) -> float | None:
+        claimed_at = self.status_times.get(
+            "SCHEDULING", self.status_times.get("PROCESSING")
+        )
+
+        return None if claimed_at is None else max(0, claimed_at - self.submitted_at)
+
+    def end_to_end(self) -> float | None:
+        if self.final_status != "COMPLETED":
+            return None
+
+        return max(0, self.status_times["COMPLETED"] - self.submitted_at)
+
+
+def percentile(values: List[float], p: float) -> float | None:
+    if len(values) == 0:
+        return None
+
+    ordered = sorted(values)
+
+    # nearest-rank
+    return ordered[max(0, ceil(p / 100 * len(ordered)) - 1)]
+
+
+def _format_distribution(values: List[float]) -> str:
+    if len(values) == 0:
+        return "n/a"
+
+    return ", ".join(
+        ["p%d = %.1fs" % (p, percentile(values, p)) for p in PERCENTILES]
+        + ["max = %.1fs" % max(values), "mean = %.1fs" % (sum(values) / len(values))]
+    )
+
+
+class SimulationReport:
+    config: SimulationConfig
+    requests: List[SimulatedRequest]
+    elapsed: float  # seconds, from start to the last finished WorkRequest (or the drain timeout)
+    pods_created: int
+    peak_pods: int
+    mean_pod_startup: float | None
+    jobs_submitted: int
+    jobs_failed: int
+    entries_processed: int
+
+    def __init__(
+        self,
+        config: SimulationConfig,
+        requests: List[SimulatedRequest],
+        elapsed: float,
+        pods_created: int,
+        peak_pods: int,
+        mean_pod_startup: float | None,
+        jobs_submitted: int,
+        jobs_failed: int,
+        entries_processed: int,
+    ):
+        self.config = config
+        self.requests = requests
+        self.elapsed = elapsed
+        self.pods_created = pods_created
+        self.peak_pods = peak_pods
+        self.mean_pod_startup = mean_pod_startup
+        self.jobs_submitted = jobs_submitted
+        self.jobs_failed = jobs_failed
+        self.entries_processed = entries_processed
+
+    def _requests_summary(self, requests: List[SimulatedRequest]) -> List[str]:
+        completed = list(filter(lambda r: r.final_status == "COMPLETED", requests))
+        failed = list(filter(lambda r: r.final_status == "FAILED", requests))
+        unfinished = list(filter(lambda r: not r.is_finished(), requests))
+        elapsed = max(self.elapsed, 1e-9)
+
+        return [
+            "requests: submitted = %d, completed = %d, failed = %d, unfinished = %d"
+            % (len(requests), len(completed), len(failed), len(unfinished)),
+            "throughput: %.3f requests/s, %.2f entries/s"
+            % (
+                len(completed) / elapsed,
+                sum(map(lambda r: r.input_size, completed)) / elapsed,
+            ),
+            "queue wait: %s"
+            % _format_distribution(
+                list(
+                    filter(
+                        lambda v: v is not None, map(lambda r: r.queue_wait(), requests)
+                    )
+                )
+            ),
+            "end-to-end latency: %s"
+            % _format_distribution(list(map(lambda r: r.end_to_end(), completed))),
+        ]
+
+    def to_text(self) -> str:
+        lines = [
+            "simulation [%s] - seed = %d, duration = %.0fs, elapsed = %.0fs"
+            % (self.config.name, self.config.seed, self.config.duration, self.elapsed),
+            "env: %s" % self.config.env,
+            "",
+            *self._requests_summary(self.requests),
+            "pods: created = %d, peak = %d, mean startup = %s"
+            % (
+                self.pods_created,
+                self.peak_pods,
+                (
+                    "n/a"
+                    if self.mean_pod_startup is None
+                    else "%.1fs" % self.mean_pod_startup
+                ),
+            ),
+            "jobs: submitted = %d, failed = %d, entries processed = %d"
+            % (self.jobs_submitted, self.jobs_failed, self.entries_processed),
+        ]
+
+        for model_config in self.config.model_configs:
+            lines.append("")
+            lines.append("model [%s]" % model_config.model_id)
+            lines.extend(
+                map(
+                    lambda line: "  " + line,
+                    self._requests_summary(
+                        list(
+                            filter(
+                                lambda r: r.model_id == model_config.model_id,
+                                self.requests,
+                            )
+                        )
+                    ),
+                )
+            )
+
+        return "\n".join(lines) + "\n"
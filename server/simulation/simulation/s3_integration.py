@@ -0,0 +1,88 @@
+from threading import Event, Lock
+from typing import Dict
+
+from objects.s3_integration import S3ResultObject
+from python_framework.config_utils import load_environment_variable
+from python_framework.logger import ContextLogger, LogLevel
+from simulation.config import SimulationConfig, seeded_random
+
+###
+# In-process replacement of the S3IntegrationController (see controllers/s3_integration.py),
+#   installed as its singleton. Objects are kept in memory, uploads take the configured `uploadTime`.
+###
+
+
+class FakeS3IntegrationController:
+    _logger_key: str = None
+    _kill_event: Event
+    _lock: Lock
+    _config: SimulationConfig
+    _results: Dict[str, S3ResultObject]
+    _logs: Dict[str, str]
+
+    uploaded_results: int
+
+    def __init__(self, config: SimulationConfig):
+        self._logger_key = "FakeS3IntegrationController"
+        self._kill_event = Event()
+        self._lock = Lock()
+        self._config = config
+        self._results = {}
+        self._logs = {}
+
+        self.uploaded_results = 0
+
+        ContextLogger.instance().create_logger_for_context(
+            self._logger_key,
+            LogLevel.from_string(
+                load_environment_variable(
+                    f"LOG_LEVEL_{self._logger_key}", default=LogLevel.INFO.name
+                )
+            ),
+        )
+
+    def kill(self):
+        self._kill_event.set()
+
+    @staticmethod
+    def _key(model_id: str, request_id: str) -> str:
+        return f"{model_id}/{request_id}"
+
+    def upload_result(self, result_obj: S3ResultObject) -> bool:
+        upload_time = self._config.upload_time.sample(
+            seeded_random(
+                self._config.seed, "upload", result_obj.model_id, result_obj.request_id
+            )
+        )
+
+        if self._kill_event.wait(upload_time):
+            return False
+
+        with self._lock:
+            self._results[self._key(result_obj.model_id, result_obj.request_id)] = (
+                result_obj
+            )
+            self.uploaded_results += 1
+
+        return True
+
+    def download_result(self, model_id: str, request_id: str) -> S3ResultObject | None:
+        with self._lock:
+            return self._results.get(self._key(model_id, request_id))
+
+    def upload_instance_logs(self, model_id: str, request_id: str, logs: str) -> bool:
+        with self._lock:
+            self._logs[self._key(model_id, request_id)] = logs
+
+        return True
+
+    def download_instance_logs(self, model_id: str, request_id: str) -> str | None:
+        with self._lock:
+            return self._logs.get(self._key(model_id, request_id))
+
+    def delete_request_data(self, model_id: str, request_id: str) -> bool:
+        with self._lock:
+            self._results.pop(self._key(model_id, request_id), None)
+            self._logs.pop(self._key(model_id, request_id), None)
+
+        return True
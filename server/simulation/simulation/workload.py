@@ -0,0 +1,90 @@
+from hashlib import md5
+from typing import List
+
+from simulation.config import SimulationConfig, SimulationModelConfig, seeded_random
+
+# anonymous users, see db/migrations/V1_3__InsertAnonUser.sql
+ANONYMOUS_USER_ID_TEMPLATE = "%03d00000-0000-0000-0000-000000000000"
+
+
+class SimulatedArrival:
+    offset: float  # seconds since the start of the simulation
+    model_id: str
+    user_index: int
+    entries: List[str]
+
+    def __init__(
+        self, offset: float, model_id: str, user_index: int, entries: List[str]
+    ):
+        self.offset = offset
+        self.model_id = model_id
+        self.user_index = user_index
+        self.entries = entries
+
+    @property
+    def user_id(self) -> str:
+        return ANONYMOUS_USER_ID_TEMPLATE % self.user_index
+
+    @property
+    def session_id(self) -> str:
+        return "simulation-session-%d" % self.user_index
+
+
+def simulated_entry(model_id: str, index: int) -> str:
+    # NOTE: opaque, but stable inputs - the fake models do not parse them
+    return "SIM%s" % md5(f"{model_id}:{index}".encode()).hexdigest()
+
+
+def _model_arrivals(
+    config: SimulationConfig, model_config: SimulationModelConfig
+) -> List[SimulatedArrival]:
+    rng = seeded_random(config.seed, "arrivals", model_config.model_id)
+    arrivals: List[SimulatedArrival] = []
+
+    if model_config.arrival_rate <= 0:
+        return arrivals
+
+    offset = 0
+    entry_index = 0
+
+    while True:
+        # poisson arrivals
+        offset += rng.expovariate(model_config.arrival_rate)
+
+        if offset >= config.duration:
+            break
+
+        size = max(1, round(model_config.request_size.sample(rng)))
+        entries: List[str] = []
+
+        for _ in range(size):
+            if model_config.input_pool_size is None:
+                entries.append(simulated_entry(model_config.model_id, entry_index))
+                entry_index += 1
+            else:
+                entries.append(
+                    simulated_entry(
+                        model_config.model_id,
+                        rng.randrange(model_config.input_pool_size),
+                    )
+                )
+
+        arrivals.append(
+            SimulatedArrival(
+                offset, model_config.model_id, rng.randrange(config.users), entries
+            )
+        )
+
+    return arrivals
+
+
+# the full workload, ordered by arrival
+def generate_arrivals(config: SimulationConfig) -> List[SimulatedArrival]:
+    arrivals: List[SimulatedArrival] = []
+
+    for model_config in config.model_configs:
+        arrivals.extend(_model_arrivals(config, model_config))
+
+    arrivals.sort(key=lambda arrival: (arrival.offset, arrival.model_id))
+
+    return arrivals
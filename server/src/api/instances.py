@@ -4,6 +4,7 @@ from typing import Annotated, List
 
 from controllers.model_instance_handler import ModelInstanceController
 from controllers.model_instance_log import ModelInstanceLogController
+from controllers.model_prewarmer import ModelPrewarmer
 from controllers.recommendation_engine import RecommendationEngine
 from controllers.s3_integration import S3IntegrationController
 from fastapi import APIRouter, HTTPException, Query, Request
@@ -12,10 +13,12 @@ from library.fastapi_root import FastAPIRoot
 from objects.instance import (
     ExtendedModelInstance,
     ExtendedModelInstanceModel,
+    InstanceCapacityModel,
     InstanceAction,
     InstanceActionModel,
     InstanceLogsFilters,
     InstancesLoadFilters,
+    ModelPrewarmStatsModel,
 )
 from objects.k8s import ErsiliaLabels
 from objects.rbac import Permission
@@ -101,6 +104,26 @@ def load_instances(
     return {"items": list(map(ExtendedModelInstanceModel.from_object, instances))}
 
 
+@router.get("/capacity")
+def load_instances_capacity(api_request: Request):
+    auth_details, tracking_details = api_handler(
+        api_request, required_permissions=[Permission.ADMIN]
+    )
+
+    return InstanceCapacityModel.from_object(
+        ModelInstanceController.instance().capacity()
+    )
+
+
+@router.get("/prewarm")
+def load_instances_prewarm_stats(api_request: Request):
+    auth_details, tracking_details = api_handler(
+        api_request, required_permissions=[Permission.ADMIN]
+    )
+
+    return ModelPrewarmStatsModel.from_object(ModelPrewarmer.instance().stats())
+
+
 @router.get("/job-logs")
 def load_instance_job_logs(
     filters: Annotated[InstanceLogsFilters, Query()],
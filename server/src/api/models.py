@@ -3,12 +3,18 @@ from sys import exc_info, stdout
 
 from controllers.model import ModelController
 from controllers.model_input_cache import ModelInputCache
+from controllers.model_input_cache_filter import ModelInputCacheFilter
+from controllers.work_request import WorkRequestController
 from fastapi import APIRouter, HTTPException, Request
 from library.api_utils import api_handler
 from library.fastapi_root import FastAPIRoot
 from objects.model import (
     ModelApiModel,
+    ModelCachedResultsModel,
+    ModelCachedResultsRequestModel,
     ModelIdentificationDetailsModel,
+    ModelInputCacheFilterStatsModel,
+    ModelInputCacheStatsModel,
     ModelScalingInfoModel,
     ModelUpdateApiModel,
 )
@@ -47,6 +53,31 @@ def load_models(
     }
 
 
+@router.get("/input-cache/stats")
+def load_input_cache_stats(api_request: Request):
+    auth_details, tracking_details = api_handler(
+        api_request, required_permissions=[Permission.ADMIN]
+    )
+
+    return ModelInputCacheStatsModel.from_object(ModelInputCache.instance().stats())
+
+
+@router.get("/input-cache/filters")
+def load_input_cache_filter_stats(api_request: Request):
+    auth_details, tracking_details = api_handler(
+        api_request, required_permissions=[Permission.ADMIN]
+    )
+
+    return {
+        "items": list(
+            map(
+                ModelInputCacheFilterStatsModel.from_object,
+                ModelInputCacheFilter.instance().stats(),
+            )
+        )
+    }
+
+
 @router.get("/{model_id}")
 def load_model(
     model_id: str,
@@ -255,3 +286,50 @@ def delete_model_cache(model_id: str, api_request: Request):
             status_code=500,
             detail="Failed to clear model cache, err = [%s]" % repr(exc_info()),
         )
+
+
+# cache-only lookup, no WorkRequest is created. Clients can submit a WorkRequest for the misses only
+@router.post("/{model_id}/cached-results")
+def lookup_cached_results(
+    model_id: str,
+    lookup_request: ModelCachedResultsRequestModel,
+    api_request: Request,
+) -> ModelCachedResultsModel:
+    auth_details, tracking_details = api_handler(api_request)
+
+    if lookup_request is None or len(lookup_request.inputs) == 0:
+        raise HTTPException(status_code=400, detail="Missing request body")
+
+    if (
+        len(lookup_request.inputs)
+        > WorkRequestController.instance().max_work_request_input_size
+    ):
+        raise HTTPException(
+            status_code=400, detail="Invalid request body - Input Size Too Large"
+        )
+
+    model = ModelController.instance().get_model(model_id)
+
+    if model is None:
+        raise HTTPException(
+            status_code=404, detail="Model with id [%s] not found" % model_id
+        )
+
+    if not model.details.cache_enabled:
+        return ModelCachedResultsModel.from_object(
+            [], list(dict.fromkeys(lookup_request.inputs))
+        )
+
+    try:
+        hits, misses = ModelInputCache.instance().lookup_cached_inputs(
+            model_id, lookup_request.inputs
+        )
+
+        return ModelCachedResultsModel.from_object(hits, misses)
+    except:
+        traceback.print_exc(file=stdout)
+
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to lookup cached results, err = [%s]" % repr(exc_info()),
+        )
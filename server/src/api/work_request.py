@@ -4,6 +4,7 @@ from typing import Annotated
 from controllers.auth import AuthController
 from controllers.s3_integration import S3IntegrationController
 from controllers.work_request import WorkRequestController
+from controllers.work_request_admission import WorkRequestAdmissionController
 from fastapi import APIRouter, HTTPException, Query, Request
 from library.api_utils import api_handler
 from library.fastapi_root import FastAPIRoot
@@ -12,6 +13,8 @@ from objects.rbac import Permission
 from objects.work_request import (
     TrackingData,
     WorkRequest,
+    WorkRequestBulkCreateModel,
+    WorkRequestBulkCreateResultModel,
     WorkRequestCreateModel,
     WorkRequestListModel,
     WorkRequestLoadAllFilters,
@@ -78,10 +81,34 @@ def create_request(
     if not valid:
         raise HTTPException(status_code=400, detail=reason)
 
-    persisted_request = WorkRequestController.instance().create_request(
-        new_work_request
+    admission_ticket = WorkRequestAdmissionController.instance().admit(
+        new_work_request.model_id,
+        new_work_request.user_id,
+        tracking_data.session_id,
+        bypass=auth_details.auth_type == AuthType.ErsiliaUser
+        and AuthController.instance().user_has_permission(
+            auth_details.user_session.userid, [Permission.ADMIN]
+        ),
     )
 
+    if not admission_ticket.admitted:
+        raise HTTPException(
+            status_code=429,
+            detail=admission_ticket.reason,
+            headers={"Retry-After": str(admission_ticket.retry_after)},
+        )
+
+    persisted_request = None
+
+    try:
+        persisted_request = WorkRequestController.instance().create_request(
+            new_work_request
+        )
+    finally:
+        WorkRequestAdmissionController.instance().complete_admission(
+            admission_ticket, persisted_request
+        )
+
     if persisted_request is None:
         raise HTTPException(
             status_code=500,
@@ -91,6 +118,122 @@ def create_request(
     return WorkRequestModel.from_workrequest(persisted_request)
 
 
+@router.post("/bulk")
+def create_requests(
+    bulk_request: WorkRequestBulkCreateModel,
+    api_request: Request,
+) -> WorkRequestBulkCreateResultModel:
+    auth_details, tracking_details = api_handler(api_request)
+
+    if bulk_request is None or len(bulk_request.items) == 0:
+        raise HTTPException(status_code=400, detail="Missing request body")
+
+    is_admin = (
+        auth_details.auth_type == AuthType.ErsiliaUser
+        and AuthController.instance().user_has_permission(
+            auth_details.user_session.userid, [Permission.ADMIN]
+        )
+    )
+    # NOTE: a bulk larger than the user's active requests limit would never be admitted
+    max_bulk_size = WorkRequestController.instance().max_work_request_bulk_size
+    max_owner_bulk_size = WorkRequestAdmissionController.instance().max_bulk_size(
+        auth_details.user_session.userid,
+        auth_details.user_session.session_id,
+        bypass=is_admin,
+    )
+
+    if max_owner_bulk_size > 0:
+        max_bulk_size = min(max_bulk_size, max_owner_bulk_size)
+
+    if len(bulk_request.items) > max_bulk_size:
+        raise HTTPException(
+            status_code=413,
+            detail="Invalid request body - Too many items, max = [%d]" % max_bulk_size,
+        )
+
+    tracking_data = TrackingData(
+        tracking_details.user_agent,
+        session_id=auth_details.user_session.session_id,
+        host=tracking_details.host,
+    )
+    new_work_requests: list[WorkRequest] = []
+
+    for index, item in enumerate(bulk_request.items):
+        try:
+            new_work_request = WorkRequest.from_object(item.to_object())
+
+            if new_work_request is None:
+                raise Exception("Failed to parse work request")
+        except:
+            raise HTTPException(
+                status_code=400, detail="Item [%d] - %s" % (index, repr(exc_info()))
+            )
+
+        new_work_request.user_id = auth_details.user_session.userid
+        new_work_request.metadata = WorkRequestMetadata(tracking_data, None)
+
+        if auth_details.auth_type != AuthType.ErsiliaUser:
+            # cannot cache inputs if not a registered user
+            new_work_request.request_payload.cache_opt_in = False
+
+        valid, reason = WorkRequestController.instance().validate_request(
+            new_work_request
+        )
+
+        if not valid:
+            raise HTTPException(
+                status_code=400, detail="Item [%d] - %s" % (index, reason)
+            )
+
+        new_work_requests.append(new_work_request)
+
+    model_ids = list(map(lambda x: x.model_id, new_work_requests))
+    rejection_reason = WorkRequestAdmissionController.instance().bulk_rejection_reason(
+        model_ids, bypass=is_admin
+    )
+
+    if rejection_reason is not None:
+        raise HTTPException(status_code=413, detail=rejection_reason)
+
+    # all or nothing
+    admission_tickets = WorkRequestAdmissionController.instance().admit_bulk(
+        model_ids,
+        auth_details.user_session.userid,
+        tracking_data.session_id,
+        bypass=is_admin,
+    )
+
+    if not admission_tickets[0].admitted:
+        raise HTTPException(
+            status_code=429,
+            detail=admission_tickets[0].reason,
+            headers={"Retry-After": str(admission_tickets[0].retry_after)},
+        )
+
+    persisted_requests = None
+
+    try:
+        persisted_requests = WorkRequestController.instance().create_requests(
+            new_work_requests
+        )
+    finally:
+        for index, ticket in enumerate(admission_tickets):
+            WorkRequestAdmissionController.instance().complete_admission(
+                ticket,
+                None if persisted_requests is None else persisted_requests[index],
+            )
+
+    if persisted_requests is None:
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to persist requests, see server logs",
+        )
+
+    return WorkRequestBulkCreateResultModel(
+        ids=list(map(lambda x: x.id, persisted_requests))
+    )
+
+
 @router.put("/{request_id}")
 def update_request(
     request_id: str,
@@ -12,16 +12,24 @@ from controllers.k8s import K8sController
 from controllers.k8s_proxy import K8sProxyController
 from controllers.model import ModelController
 from controllers.model_input_cache import ModelInputCache
+from controllers.model_input_cache_filter import ModelInputCacheFilter
+from controllers.model_input_cache_writer import ModelInputCacheWriter
 from controllers.model_instance_handler import ModelInstanceController
 from controllers.model_instance_log import ModelInstanceLogController
+from controllers.model_instance_supervisor import ModelInstanceSupervisor
 from controllers.model_integration import ModelIntegrationController
+from controllers.model_prewarmer import ModelPrewarmer
 from controllers.node_monitor import NodeMonitorController
 from controllers.recommendation_engine import RecommendationEngine
+from controllers.result_upload_queue import ResultUploadQueue
 from controllers.s3_integration import S3IntegrationController
 from controllers.server import ServerController
+from controllers.single_flight import SingleFlightRegistry
 from controllers.slack_integration import SlackIntegration
 from controllers.user_admin import UserAdminController
 from controllers.work_request import WorkRequestController
+from controllers.work_request_admission import WorkRequestAdmissionController
+from controllers.work_request_notifier import WorkRequestNotifier
 from library.fastapi_root import FastAPIRoot
 from python_framework.config_utils import load_environment_variable
 from python_framework.db.connection_pool import ConnectionPool
@@ -80,16 +88,25 @@ def init():
     # controllers
     K8sController.initialize()
     ModelController.initialize()
+    ModelInputCacheWriter.initialize()
+    ModelInputCacheFilter.initialize()
     ModelInputCache.initialize()
+    SingleFlightRegistry.initialize()
     ModelInstanceLogController.initialize()
     ModelIntegrationController.initialize()
     InstanceMetricsController.initialize()
     NodeMonitorController.initialize()
     ModelInstanceController.initialize()
+    # NOTE: after the ModelInstanceController, so it is killed after all handlers terminated
+    ModelInstanceSupervisor.initialize()
     ServerController.initialize()
     FailedServerHandler.initialize()
+    WorkRequestNotifier.initialize()
     WorkRequestController.initialize()
+    WorkRequestAdmissionController.initialize()
+    ModelPrewarmer.initialize()
     S3IntegrationController.initialize()
+    ResultUploadQueue.initialize()
     K8sProxyController.initialize()
     UserAdminController.initialize()
     AuthController.initialize()
@@ -107,11 +124,18 @@ def init():
 def run():
     try:
         K8sController.instance().start()
+        ModelInstanceSupervisor.instance().start()
         ModelController.instance().start()
         NodeMonitorController.instance().start()
         ServerController.instance().start()
         FailedServerHandler.instance().start()
+        WorkRequestNotifier.instance().start()
+        ResultUploadQueue.instance().start()
+        ModelInputCacheWriter.instance().start()
+        ModelInputCacheFilter.instance().start()
         WorkRequestController.instance().start()
+        WorkRequestAdmissionController.instance().start()
+        ModelPrewarmer.instance().start()
         AuthController.instance().start()
         RecommendationEngine.instance().start()
 
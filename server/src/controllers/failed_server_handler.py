@@ -22,6 +22,7 @@ class FailedServerHandlerKillInstance(KillInstance):
         FailedServerHandler.instance().kill()
 
 class FailedServerHandler(Thread):
+    REQUEUE_BATCH_SIZE = 500
 
     _instance: "FailedServerHandler" = None
 
@@ -85,31 +86,44 @@ class FailedServerHandler(Thread):
         return not has_error
 
     def _requeue_work_requests(self, server_id: str) -> tuple[bool, List[WorkRequest]]:
-        work_requests = WorkRequestController.instance().get_requests(
-            server_ids=[server_id], 
-            request_statuses=[WorkRequestStatus.QUEUED.value, WorkRequestStatus.SCHEDULING.value, WorkRequestStatus.PROCESSING.value]
-        )
-        
+        requeued_work_requests: List[WorkRequest] = []
         has_error = False
 
-        if len(work_requests) == 0:
-            return (True, work_requests)
+        # NOTE: paged, requeued requests no longer match the server_id filter
+        while not has_error:
+            work_requests = WorkRequestController.instance().get_requests(
+                server_ids=[server_id], 
+                request_statuses=[WorkRequestStatus.QUEUED.value, WorkRequestStatus.SCHEDULING.value, WorkRequestStatus.PROCESSING.value, WorkRequestStatus.UPLOADING.value],
+                limit=FailedServerHandler.REQUEUE_BATCH_SIZE,
+                include_payload=False,
+            )
 
-        for work_request in work_requests:
-            work_request.server_id = None
-            work_request.request_status = WorkRequestStatus.QUEUED
-            work_request.request_status_reason = "REQUEUED"
-            work_request.job_submission_timestamp = None
-            work_request.pod_ready_timestamp = None
-            work_request.processed_timestamp = None
-            
-            if WorkRequestController.instance().update_request(work_request, enforce_same_server_id=False) is None:
-                has_error = True
-                ContextLogger.error(self._logger_key, f"Failed to requeue work_request [{work_request.id}]")
-            else:
-                ContextLogger.debug(self._logger_key, f"Requeued work_request [{work_request.id}]")
+            if len(work_requests) == 0:
+                break
+
+            for work_request in work_requests:
+                work_request.server_id = None
+                work_request.request_status = WorkRequestStatus.QUEUED
+                work_request.request_status_reason = "REQUEUED"
+                work_request.job_submission_timestamp = None
+                work_request.pod_ready_timestamp = None
+                work_request.processed_timestamp = None
+
+            updated_work_requests = WorkRequestController.instance().update_requests(work_requests, enforce_same_server_id=False)
+
+            for work_request, updated_work_request in zip(work_requests, updated_work_requests):
+                if updated_work_request is None:
+                    has_error = True
+                    ContextLogger.error(self._logger_key, f"Failed to requeue work_request [{work_request.id}]")
+                else:
+                    ContextLogger.debug(self._logger_key, f"Requeued work_request [{work_request.id}]")
+
+            requeued_work_requests.extend(work_requests)
+
+            if len(work_requests) < FailedServerHandler.REQUEUE_BATCH_SIZE:
+                break
 
-        return (not has_error, work_requests)
+        return (not has_error, requeued_work_requests)
 
     def _delete_server_entry(self, server_id: str):
         if ServerController.instance().delete_server(server_id) is None:
@@ -1,10 +1,11 @@
 import traceback
+from asyncio import CancelledError
+from concurrent.futures import Future
 from sys import exc_info, stdout
-from threading import Event, Thread
-from time import sleep
 from typing import Any
 
 from controllers.model import ModelController
+from controllers.model_instance_supervisor import ModelInstanceSupervisor
 from controllers.model_integration import ModelIntegrationController
 from objects.k8s import K8sPod
 from objects.model import ModelExecutionMode
@@ -14,9 +15,12 @@ from python_framework.logger import ContextLogger, LogLevel
 from python_framework.time import utc_now
 
 
-class JobSubmissionProcess(Thread):
+# NOTE: SYNC jobs run as a task on the ModelInstanceSupervisor's event loop, ASYNC jobs are polled by the handler.
+#       All model calls are async (see ModelIntegrationController), to be awaited on the supervisor's event loop.
+#       Errors are caught as Exception, so a cancelled job (asyncio.CancelledError, see kill) is not swallowed.
+class JobSubmissionProcess:
     _logger_key: str
-    _kill_event: Event
+    _future: Future | None
 
     model_id: str
     work_request_id: str
@@ -40,7 +44,7 @@ class JobSubmissionProcess(Thread):
         pod: K8sPod,
         retry_count: int = 1,
     ):
-        Thread.__init__(self)
+        self._future = None
 
         self.model_id = model_id
         self.work_request_id = work_request_id
@@ -50,7 +54,6 @@ class JobSubmissionProcess(Thread):
         self.retry_count = retry_count
 
         self._logger_key = "JobSubmissionProcess[%s]" % self.id
-        self._kill_event = Event()
 
         self.model_execution_mode = (
             ModelController.instance().get_model(model_id).details.execution_mode
@@ -71,13 +74,27 @@ class JobSubmissionProcess(Thread):
             ),
         )
 
-    def _wait_or_kill(self, timeout: float) -> bool:
-        return self._kill_event.wait(timeout)
-
+    # cancels a running SYNC job
     def kill(self):
-        self._kill_event.set()
+        if self._future is not None:
+            self._future.cancel()
+
+    def start(self):
+        self._future = ModelInstanceSupervisor.instance().supervise(self.run())
+
+    def is_alive(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def join(self, timeout: float | None = None):
+        if self._future is None:
+            return
+
+        try:
+            self._future.result(timeout=timeout)
+        except:
+            pass
 
-    def _submit_job(self) -> bool:
+    async def _submit_job(self) -> bool:
         ContextLogger.debug(
             self._logger_key,
             "Submitting job to model [%s] for workrequest [%s] with inputs [%d]..."
@@ -91,7 +108,7 @@ class JobSubmissionProcess(Thread):
             try:
                 self.job_submission_timestamp = utc_now()
                 job_submission_response = (
-                    ModelIntegrationController.instance().submit_job(
+                    await ModelIntegrationController.instance().submit_job(
                         self.model_id,
                         str(self.work_request_id),
                         self.pod.ip,
@@ -100,7 +117,7 @@ class JobSubmissionProcess(Thread):
                 )
 
                 break
-            except:
+            except Exception:
                 error_str = (
                     "Failed to submit job for instance [%s], workrequest [%s], error [%s]"
                     % (self.pod.name, self.work_request_id, repr(exc_info()))
@@ -127,7 +144,7 @@ class JobSubmissionProcess(Thread):
 
         return True
 
-    def handle_job_completion(self) -> bool:
+    async def handle_job_completion(self) -> bool:
         if self.job_status in [JobStatus.COMPLETED, JobStatus.FAILED]:
             return True
 
@@ -138,13 +155,15 @@ class JobSubmissionProcess(Thread):
         status_response: JobStatusResponse | None = None
 
         try:
-            status_response = ModelIntegrationController.instance().get_job_status(
-                self.model_id,
-                str(self.work_request_id),
-                self.pod.ip,
-                self.job_id,
+            status_response = (
+                await ModelIntegrationController.instance().get_job_status(
+                    self.model_id,
+                    str(self.work_request_id),
+                    self.pod.ip,
+                    self.job_id,
+                )
             )
-        except:
+        except Exception:
             ContextLogger.error(
                 self._logger_key,
                 "Failed to get job status, error = [%s]" % (repr(exc_info())),
@@ -166,11 +185,13 @@ class JobSubmissionProcess(Thread):
         if status_response.status == JobStatus.COMPLETED:
             ContextLogger.debug(self._logger_key, "Job COMPLETED")
 
-            self.job_result = ModelIntegrationController.instance().get_job_result(
-                self.model_id,
-                str(self.work_request_id),
-                self.pod.ip,
-                self.job_id,
+            self.job_result = (
+                await ModelIntegrationController.instance().get_job_result(
+                    self.model_id,
+                    str(self.work_request_id),
+                    self.pod.ip,
+                    self.job_id,
+                )
             )
         elif status_response.status == JobStatus.FAILED:
             ContextLogger.debug(self._logger_key, "Job FAILED")
@@ -179,17 +200,7 @@ class JobSubmissionProcess(Thread):
 
         return True
 
-    def _monitor_async_job(self):
-        if self.model_execution_mode == ModelExecutionMode.SYNC:
-            return
-
-        while True:
-            if self.handle_job_completion():
-                break
-
-            sleep(15)
-
-    def _submit_job_sync(self) -> bool:
+    async def _submit_job_sync(self) -> bool:
         ContextLogger.debug(
             self._logger_key,
             "Submitting SYNC job to model [%s] for workrequest [%s] with inputs [%d] ..."
@@ -205,7 +216,7 @@ class JobSubmissionProcess(Thread):
                     self.job_status,
                     self.job_status_reason,
                     self.job_result,
-                ) = ModelIntegrationController.instance().submit_job_sync(
+                ) = await ModelIntegrationController.instance().submit_job_sync(
                     self.model_id,
                     str(self.work_request_id),
                     self.pod.ip,
@@ -214,7 +225,7 @@ class JobSubmissionProcess(Thread):
                 self.job_completion_timestamp = utc_now()
 
                 break
-            except:
+            except Exception:
                 error_str = (
                     "Failed to submit SYNC job for instance [%s], workrequest [%s], error [%s]"
                     % (self.pod.name, self.work_request_id, repr(exc_info()))
@@ -239,15 +250,15 @@ class JobSubmissionProcess(Thread):
 
         return True
 
-    def submit_job(self) -> bool:
+    async def submit_job(self) -> bool:
         try:
             if self.model_execution_mode == ModelExecutionMode.ASYNC:
-                return self._submit_job()
+                return await self._submit_job()
             else:
                 self.start()
 
                 return True
-        except:
+        except Exception:
             ContextLogger.error(
                 self._logger_key,
                 "Job submision failed for workrequest [%s] on pod [%s], error = [%s]"
@@ -260,16 +271,21 @@ class JobSubmissionProcess(Thread):
     def finalize(self):
         del ContextLogger.instance().context_logger_map[self._logger_key]
 
-    def run(self):
+    # NOTE: SYNC jobs only, see start
+    async def run(self):
         ContextLogger.debug(self._logger_key, "Process started")
 
         try:
-            if self.model_execution_mode == ModelExecutionMode.ASYNC:
-                if self._submit_job():
-                    self._monitor_async_job()
-            else:
-                self._submit_job_sync()
-        except:
+            await self._submit_job_sync()
+        except CancelledError:
+            ContextLogger.warn(
+                self._logger_key,
+                "Job cancelled for workrequest [%s] on pod [%s]"
+                % (self.work_request_id, self.pod.name),
+            )
+
+            raise
+        except Exception:
             ContextLogger.error(
                 self._logger_key,
                 "Job submision failed for workrequest [%s] on pod [%s], error = [%s]"
@@ -1,32 +1,64 @@
 import traceback
-from hashlib import md5
 from json import dumps, loads
 from sys import exc_info, stdout
 from typing import Any
 
 from config.application_config import ApplicationConfig
+from controllers.model_input_cache_filter import ModelInputCacheFilter
+from controllers.model_input_cache_writer import (
+    ModelInputCacheEntry,
+    ModelInputCacheWriter,
+)
 from db.daos.model_input_cache import (
     ModelInputCacheDAO,
     ModelInputCacheQuery,
     ModelInputCacheRecord,
 )
-from db.daos.work_request_result_cache_temp import (
-    WorkRequestResultCacheTempDAO,
-    WorkRequestResultCacheTempRecord,
+from db.daos.work_request_partial_result import (
+    WorkRequestPartialResultDAO,
+    WorkRequestPartialResultRecord,
 )
+from library.cache_reconciliation import CacheReconciliation, hash_input
+from library.lru_cache import LRUCache
+from objects.model import ModelInputCacheStats
 from python_framework.config_utils import load_environment_variable
-from python_framework.db.transaction_manager import TransactionManager
 from python_framework.logger import ContextLogger, LogLevel
 
 
+###
+# In-memory LRU tier in front of the ModelInputCache table, keyed by (model_id, input hash).
+#   Populated by lookups and by newly cached results, evicted by (estimated) size in bytes.
+#
+# NOTE: the LRU is per server. A model cache clear on another server is only picked up once the entries
+#       expire (MODEL_INPUT_CACHE_LRU_TTL)
+###
+
+# fixed per-entry overhead (key, tuple, dict slot), on top of the input, hash and result sizes
+LRU_ENTRY_OVERHEAD = 200
+
+
 class ModelInputCache:
     _instance: "ModelInputCache" = None
 
     _logger_key: str = None
 
+    _lru: LRUCache
+
     def __init__(self) -> None:
         self._logger_key = "ModelInputCache"
 
+        lru_ttl = float(
+            load_environment_variable("MODEL_INPUT_CACHE_LRU_TTL", default="3600")
+        )
+        self._lru = LRUCache(
+            int(
+                load_environment_variable(
+                    "MODEL_INPUT_CACHE_LRU_MAX_BYTES", default=str(64 * 1024 * 1024)
+                )
+            ),
+            ttl=lru_ttl if lru_ttl > 0 else None,
+        )
+
         ContextLogger.instance().create_logger_for_context(
             self._logger_key,
             LogLevel.from_string(
@@ -49,7 +81,8 @@ class ModelInputCache:
     def instance() -> "ModelInputCache":
         return ModelInputCache._instance
 
-    # TODO: eventually improve the caching process by adding to a queue and/or batching the inserts
+    # NOTE: the entries are persisted in the background (and added to the ModelInputCacheFilter),
+    #       see ModelInputCacheWriter
     def cache_model_results(
         self,
         model_id: str,
@@ -58,25 +91,21 @@ class ModelInputCache:
         user_id: str | None = None,
     ) -> bool:
         try:
-            with TransactionManager(
-                ApplicationConfig.instance().database_config
-            ) as conn:
-                for i in range(len(inputs)):
-                    try:
-                        _ = ModelInputCacheDAO.execute_insert(
-                            connection=conn,
-                            model_id=model_id,
-                            input_hash=md5(inputs[i].encode()).hexdigest(),
-                            result=dumps(results[i]),
-                            input=inputs[i],
-                            user_id=user_id,
-                        )
-                    except:
-                        # NOTE: allow single failures
-                        ContextLogger.warn(
-                            self._logger_key,
-                            f"Failed to persist modelcacherecord for model_id = [{model_id}], reason = {exc_info()!r}",
-                        )
+            entries: list[ModelInputCacheEntry] = []
+
+            for i in range(len(inputs)):
+                entry = ModelInputCacheEntry(
+                    model_id,
+                    hash_input(inputs[i]),
+                    inputs[i],
+                    dumps(results[i]),
+                    user_id,
+                )
+                entries.append(entry)
+
+                self._lru_put(model_id, entry.input_hash, entry.input, entry.result)
+
+            return ModelInputCacheWriter.instance().submit(entries)
         except:
             ContextLogger.error(
                 self._logger_key,
@@ -85,82 +114,136 @@ class ModelInputCache:
 
             return False
 
-        return True
+    def _lru_put(self, model_id: str, input_hash: str, input: str, result: str):
+        self._lru.put(
+            (model_id, input_hash),
+            (input, result),
+            len(input) + len(input_hash) + len(result) + LRU_ENTRY_OVERHEAD,
+        )
 
-    def lookup_model_results(
+    # hashes every input once, looks up the unique hashes in the LRU, then (skipping the definite misses of
+    #   the ModelInputCacheFilter) in the database in batches of max_batch_size.
+    #   See CacheReconciliation for the hit / miss partitioning
+    def reconcile_model_results(
         self,
         model_id: str,
         inputs: list[str],
         result_only: bool = True,
         max_batch_size: int = 1000,
-    ) -> list[ModelInputCacheRecord]:
-        records: list[ModelInputCacheRecord] = []
-        batch_count = 0
-        current_batch_index = 0
-
-        while True:
-            batch_size = min(
-                (batch_count + 1) * max_batch_size, len(inputs) - current_batch_index
-            )
-            inputs_map: dict[str, str] = dict(
-                list(
-                    map(
-                        lambda input: (md5(input.encode()).hexdigest(), input),
-                        inputs[current_batch_index : current_batch_index + batch_size],
+    ) -> CacheReconciliation[ModelInputCacheRecord]:
+        reconciliation: CacheReconciliation[ModelInputCacheRecord] = (
+            CacheReconciliation(inputs)
+        )
+        # the LRU only holds the input + result, full records are always loaded from the database
+        use_lru = result_only and self._lru.enabled()
+
+        if use_lru:
+            for input_hash, input in reconciliation.unique_inputs.items():
+                entry = self._lru.get((model_id, input_hash))
+
+                if entry is not None:
+                    reconciliation.add_records(
+                        [
+                            ModelInputCacheRecord.init(
+                                modelid=model_id,
+                                inputhash=input_hash,
+                                input=entry[0],
+                                result=entry[1],
+                            )
+                        ]
                     )
-                )
+
+        reconciliation.add_known_misses(
+            ModelInputCacheFilter.instance().definite_misses(
+                model_id, reconciliation.pending_hashes()
             )
+        )
+        false_positive_count = 0
 
+        for input_hashes in reconciliation.lookup_batches(max_batch_size):
             batch_records: list[ModelInputCacheRecord] = (
                 ModelInputCacheDAO.execute_select_all(
                     ApplicationConfig.instance().database_config,
                     model_id=model_id,
-                    input_hashes=list(inputs_map.keys()),
+                    input_hashes=input_hashes,
                     result_only=result_only,
                 )
             )
+            false_positive_count += len(input_hashes) - len(batch_records)
 
-            if result_only:
-                # hydrate the "input" field, using the matching hash
-                for record in batch_records:
-                    record.input = inputs_map.get(record.input_hash)
+            for record in batch_records:
+                if result_only:
+                    # hydrate the "input" field, using the matching hash
+                    record.input = reconciliation.input_for_hash(record.input_hash)
 
-            records.extend(batch_records)
+                if use_lru:
+                    self._lru_put(
+                        model_id, record.input_hash, record.input, record.result
+                    )
 
-            if batch_size < max_batch_size:
-                break
+            reconciliation.add_records(batch_records)
 
-            batch_count += 1
-            current_batch_index += batch_size
+        ModelInputCacheFilter.instance().record_false_positives(
+            model_id, false_positive_count
+        )
 
-        return records
+        return reconciliation
 
+    # NOTE: duplicate inputs are looked up (and returned) once
+    def lookup_model_results(
+        self,
+        model_id: str,
+        inputs: list[str],
+        result_only: bool = True,
+        max_batch_size: int = 1000,
+    ) -> list[ModelInputCacheRecord]:
+        return self.reconcile_model_results(
+            model_id, inputs, result_only, max_batch_size
+        ).cached_records()
+
+    # returns (cached records, non-cached inputs), both in order of first occurrence of the input.
+    #   Duplicate inputs are looked up (and returned) once
+    def lookup_cached_inputs(
+        self, model_id: str, inputs: list[str]
+    ) -> tuple[list[ModelInputCacheRecord], list[str]]:
+        reconciliation = self.reconcile_model_results(model_id, inputs)
+
+        return (
+            reconciliation.cached_records(),
+            reconciliation.unique_non_cached_inputs(),
+        )
+
+    # The cached results of a partially cached WorkRequest are persisted as a single blob (WorkRequestPartialResult):
+    #   {"result_indexes": [...], "results": [...]}
+    #   - results: the cached results, once per unique input
+    #   - result_indexes: per WorkRequest input (in order), the index of its result in results, null if not cached
     def persist_cached_workrequest_results(
         self,
         work_request_id: int,
+        ordered_inputs: list[str],
         cached_results: list[ModelInputCacheRecord],
     ) -> bool:
         try:
-            with TransactionManager(
-                ApplicationConfig.instance().database_config
-            ) as conn:
-                for record in cached_results:
-                    try:
-                        _ = WorkRequestResultCacheTempDAO.execute_insert(
-                            connection=conn,
-                            work_request_id=work_request_id,
-                            input_hash=record.input_hash,
-                            result=record.result,
-                            input=record.input,
-                        )
-                    except:
-                        raise Exception(
-                            f"Failed to persist WorkRequestResultCacheTemp record for request_id = [{work_request_id}], reason = {exc_info()!r}"
-                        )
+            result_positions: dict[str, int] = {}
+
+            for position, record in enumerate(cached_results):
+                result_positions.setdefault(record.input, position)
+
+            # NOTE: the results are already serialized, they are not parsed again
+            results = '{"result_indexes": %s, "results": [%s]}' % (
+                dumps(list(map(result_positions.get, ordered_inputs))),
+                ",".join(map(lambda record: record.result, cached_results)),
+            )
+
+            _ = WorkRequestPartialResultDAO.execute_insert(
+                ApplicationConfig.instance().database_config,
+                work_request_id=work_request_id,
+                results=results,
+            )
         except:
             ContextLogger.error(
                 self._logger_key,
-                f"Failed to persist WorkRequestResultCacheTemp record for request_id = [{work_request_id}], reason = {exc_info()!r}",
+                f"Failed to persist WorkRequestPartialResult for request_id = [{work_request_id}], reason = {exc_info()!r}",
             )
             traceback.print_exc(file=stdout)
 
@@ -168,41 +251,29 @@ class ModelInputCache:
 
         return True
 
-    def load_work_request_cached_results(
-        self, work_request_id: int
-    ) -> list[WorkRequestResultCacheTempRecord]:
+    def load_work_request_cached_results(self, work_request_id: int) -> dict[str, Any]:
         try:
-            records: list[WorkRequestResultCacheTempRecord] = []
-            batch_size = 1000
-            batch_offset = 0
-
-            while True:
-                batch_records = WorkRequestResultCacheTempDAO.execute_select_all(
+            records: list[WorkRequestPartialResultRecord] = (
+                WorkRequestPartialResultDAO.execute_select(
                     ApplicationConfig.instance().database_config,
                     work_request_id=work_request_id,
-                    batch_size=batch_size,
-                    batch_offset=batch_offset,
                 )
-
-                if batch_records is None or len(batch_records) == 0:
-                    break
-
-                records.extend(batch_records)
-
-                if len(batch_records) < batch_size:
-                    break
-
-                batch_offset += batch_size
-
-            return records
+            )
         except:
             raise Exception(
                 f"Failed to load persisted workrequest results cache for [{work_request_id}], error = [{exc_info()!r}]"
             )
 
+        if records is None or len(records) == 0:
+            raise Exception(
+                f"No persisted workrequest results cache found for [{work_request_id}]"
+            )
+
+        return loads(records[0].results)
+
     def clear_work_request_cached_results(self, work_request_id: int):
         try:
-            deleted = WorkRequestResultCacheTempDAO.execute_delete(
+            deleted = WorkRequestPartialResultDAO.execute_delete(
                 ApplicationConfig.instance().database_config,
                 work_request_id=work_request_id,
             )
@@ -211,35 +282,46 @@ class ModelInputCache:
                 f"Failed to clear persisted workrequest results cache for [{work_request_id}], error = [{exc_info()!r}]"
             )
 
+    # NOTE: duplicate ordered_inputs are fanned out from the first matching job input (or cached result)
     def consolidate_results(
         self,
         ordered_inputs: list[str],
         job_inputs: list[str],
         job_results: list[dict[str, Any]],
-        cached_results: list[WorkRequestResultCacheTempRecord]
-        | list[ModelInputCacheRecord],
+        cached_results: list[ModelInputCacheRecord],
     ) -> list[dict[str, Any] | None]:
-        consolidated_results: dict[str, dict[str, Any] | None] = dict(
-            map(lambda input: (input, None), ordered_inputs)
-        )
-
         ContextLogger.debug(
             self._logger_key,
             "Consolidating [%d] cached results with [%d] processed results..."
             % (len(cached_results), len(job_results)),
         )
 
-        # set job results in final_results map
+        job_result_indexes: dict[str, int] = {}
+
         for i in range(len(job_inputs)):
-            if job_inputs[i] in consolidated_results:
-                consolidated_results[job_inputs[i]] = job_results[i]
+            job_result_indexes.setdefault(job_inputs[i], i)
+
+        cached_result_indexes: dict[str, int] = {}
+
+        for i in range(len(cached_results)):
+            cached_result_indexes.setdefault(cached_results[i].input, i)
 
-        for result in cached_results:
-            if result.input in consolidated_results:
-                consolidated_results[result.input] = loads(result.result)
+        consolidated_results: list[dict[str, Any] | None] = []
+
+        for input in ordered_inputs:
+            if input in cached_result_indexes:
+                consolidated_results.append(
+                    loads(cached_results[cached_result_indexes[input]].result)
+                )
+            elif input in job_result_indexes:
+                consolidated_results.append(job_results[job_result_indexes[input]])
+            else:
+                consolidated_results.append(None)
 
-        return list(map(lambda input: consolidated_results[input], ordered_inputs))
+        return consolidated_results
 
+    # merges the job results with the persisted cached results, by WorkRequest input index
+    #   NOTE: duplicate job inputs are fanned out from the first matching job input
     def hydrate_job_result_with_cached_results(
         self,
         work_request_id: int,
@@ -247,7 +329,19 @@ class ModelInputCache:
         job_inputs: list[str],
         job_results: list[dict[str, Any]],
     ) -> list[dict[str, Any] | None]:
-        cached_results = self.load_work_request_cached_results(work_request_id)
+        partial_result = self.load_work_request_cached_results(work_request_id)
+        result_indexes: list[int | None] = partial_result["result_indexes"]
+        cached_results: list[dict[str, Any]] = partial_result["results"]
+
+        if len(result_indexes) != len(work_request_ordered_inputs):
+            raise Exception(
+                "Persisted workrequest results cache for [%d] has [%d] inputs, expected [%d]"
+                % (
+                    work_request_id,
+                    len(result_indexes),
+                    len(work_request_ordered_inputs),
+                )
+            )
 
         ContextLogger.debug(
             self._logger_key,
@@ -255,12 +349,27 @@ class ModelInputCache:
             % (len(cached_results), work_request_id),
         )
 
-        return self.consolidate_results(
-            work_request_ordered_inputs, job_inputs, job_results, cached_results
-        )
+        job_result_indexes: dict[str, int] = {}
+
+        for i in range(len(job_inputs)):
+            job_result_indexes.setdefault(job_inputs[i], i)
+
+        consolidated_results: list[dict[str, Any] | None] = []
+
+        for input, result_index in zip(work_request_ordered_inputs, result_indexes):
+            if result_index is not None:
+                consolidated_results.append(cached_results[result_index])
+            elif input in job_result_indexes:
+                consolidated_results.append(job_results[job_result_indexes[input]])
+            else:
+                consolidated_results.append(None)
+
+        return consolidated_results
 
     def clear_model_cached_results(self, model_id: str) -> bool:
         try:
+            ModelInputCacheWriter.instance().flush()
+
             deleted = ModelInputCacheDAO.execute_query(
                 ModelInputCacheQuery.DELETE_BY_MODEL_ID,
                 ApplicationConfig.instance().database_config,
@@ -268,6 +377,9 @@ class ModelInputCache:
                 query_kwargs={"model_id": model_id},
             )
 
+            self._lru.invalidate(lambda key: key[0] == model_id)
+            ModelInputCacheFilter.instance().reset(model_id)
+
             return True
         except:
             raise Exception(
@@ -275,3 +387,18 @@ class ModelInputCache:
             )
 
             return False
+
+    # NOTE: the LRU does not track the contributing user, so a user's contributions can only be
+    #       invalidated by clearing all entries
+    def clear_memory_cache(self):
+        self._lru.clear()
+
+    def stats(self) -> ModelInputCacheStats:
+        return ModelInputCacheStats(
+            self._lru.hits,
+            self._lru.misses,
+            self._lru.evictions,
+            self._lru.count(),
+            self._lru.size(),
+            self._lru.max_bytes,
+        )
@@ -0,0 +1,457 @@
+import traceback
+from datetime import datetime
+from sys import exc_info, stdout
+from threading import Event, Lock, Thread
+from typing import Dict, List
+
+from config.application_config import ApplicationConfig
+from controllers.model import ModelController
+from db.daos.model_input_cache import (
+    ModelInputCacheDAO,
+    ModelInputCacheHashRecord,
+    ModelInputCacheQuery,
+)
+from db.daos.shared_record import CountRecord
+from library.bloom_filter import BloomFilter
+from objects.model import ModelInputCacheFilterStats
+from python_framework.config_utils import load_environment_variable
+from python_framework.graceful_killer import GracefulKiller, KillInstance
+from python_framework.logger import ContextLogger, LogLevel
+from python_framework.time import (
+    datetime_delta,
+    string_from_date,
+    utc_now,
+    utc_now_datetime,
+)
+
+###
+# The ModelInputCacheFilter keeps a Bloom filter of the cached input hashes per (cache enabled) model,
+#   so lookups of inputs that are definitely not cached skip the database.
+#
+# - the filters are built from the ModelInputCache table at startup, and rebuilt every
+#   MODEL_INPUT_CACHE_FILTER_REFRESH_INTERVAL seconds, or once more entries were added than the filter was sized for
+# - new cache entries of this server are added as they are submitted to, and persisted by, the ModelInputCacheWriter
+# - entries cached by other servers are added every MODEL_INPUT_CACHE_FILTER_CATCH_UP_INTERVAL seconds (see _catch_up),
+#   from the entries cached since the filter's checkpoint
+# - a model's filter is reset when its cache is cleared
+#
+# Until a model's filter is built, all its lookups go to the database. Lookups never query the database for the filter.
+#
+# NOTE: the filters are per server. An entry cached by another server less than the catch up interval ago can be
+#       reported as a definite miss, its input is then computed (and cached) again.
+#       The checkpoint overlaps by CHECKPOINT_OVERLAP, for entries committed after their LastUpdated timestamp.
+###
+
+
+class ModelInputCacheFilterKillInstance(KillInstance):
+    def kill(self):
+        ModelInputCacheFilter.instance().kill()
+
+
+class ModelInputCacheFilterState:
+    filter: BloomFilter
+    built_at: float
+    built_date: str
+    # entries cached before this (utc) time are in the filter
+    checkpoint: datetime
+    skipped_lookups: int  # definite misses, not looked up in the database
+    false_positives: int  # looked up in the database, but not cached
+
+    def __init__(self, filter: BloomFilter, built_at: float, checkpoint: datetime):
+        self.filter = filter
+        self.built_at = built_at
+        self.built_date = utc_now()
+        self.checkpoint = checkpoint
+        self.skipped_lookups = 0
+        self.false_positives = 0
+
+
+class ModelInputCacheFilter(Thread):
+    DEFAULT_FALSE_POSITIVE_RATE = 0.01
+    DEFAULT_REFRESH_INTERVAL = 900
+    DEFAULT_CATCH_UP_INTERVAL = 10
+    DEFAULT_MIN_CAPACITY = 10000
+    # the filters are sized for this many times the current entries, to allow for new entries until the next rebuild
+    CAPACITY_HEADROOM = 2
+    CHECK_INTERVAL = 60
+    PAGE_SIZE = 10000
+    CHECKPOINT_OVERLAP = "1m"
+
+    _instance: "ModelInputCacheFilter" = None
+
+    _logger_key: str = None
+    _kill_event: Event
+
+    _lock: Lock
+    _states: Dict[str, ModelInputCacheFilterState]
+    # hashes added while the model's filter is being rebuilt, applied to the new filter
+    _rebuild_additions: Dict[str, List[str]]
+
+    enabled: bool
+    false_positive_rate: float
+    refresh_interval: float
+    catch_up_interval: float
+    min_capacity: int
+
+    def __init__(self):
+        Thread.__init__(self)
+
+        self._logger_key = "ModelInputCacheFilter"
+        self._kill_event = Event()
+
+        self._lock = Lock()
+        self._states = {}
+        self._rebuild_additions = {}
+
+        self.enabled = (
+            load_environment_variable(
+                "MODEL_INPUT_CACHE_FILTER_ENABLED", default="TRUE"
+            ).upper()
+            == "TRUE"
+        )
+        self.false_positive_rate = float(
+            load_environment_variable(
+                "MODEL_INPUT_CACHE_FILTER_FALSE_POSITIVE_RATE",
+                default=ModelInputCacheFilter.DEFAULT_FALSE_POSITIVE_RATE,
+            )
+        )
+        self.refresh_interval = float(
+            load_environment_variable(
+                "MODEL_INPUT_CACHE_FILTER_REFRESH_INTERVAL",
+                default=ModelInputCacheFilter.DEFAULT_REFRESH_INTERVAL,
+            )
+        )
+        self.catch_up_interval = float(
+            load_environment_variable(
+                "MODEL_INPUT_CACHE_FILTER_CATCH_UP_INTERVAL",
+                default=ModelInputCacheFilter.DEFAULT_CATCH_UP_INTERVAL,
+            )
+        )
+        self.min_capacity = int(
+            load_environment_variable(
+                "MODEL_INPUT_CACHE_FILTER_MIN_CAPACITY",
+                default=ModelInputCacheFilter.DEFAULT_MIN_CAPACITY,
+            )
+        )
+
+        ContextLogger.instance().create_logger_for_context(
+            self._logger_key,
+            LogLevel.from_string(
+                load_environment_variable(
+                    f"LOG_LEVEL_{self._logger_key}", default=LogLevel.INFO.name
+                )
+            ),
+        )
+
+    @staticmethod
+    def initialize() -> "ModelInputCacheFilter":
+        if ModelInputCacheFilter._instance is not None:
+            return ModelInputCacheFilter._instance
+
+        ModelInputCacheFilter._instance = ModelInputCacheFilter()
+        GracefulKiller.instance().register_kill_instance(
+            ModelInputCacheFilterKillInstance()
+        )
+
+        return ModelInputCacheFilter._instance
+
+    @staticmethod
+    def instance() -> "ModelInputCacheFilter":
+        return ModelInputCacheFilter._instance
+
+    def _wait_or_kill(self, timeout: float) -> bool:
+        return self._kill_event.wait(timeout)
+
+    def kill(self):
+        self._kill_event.set()
+
+    def _new_filter(self, entry_count: int) -> BloomFilter:
+        return BloomFilter(
+            max(
+                self.min_capacity,
+                entry_count * ModelInputCacheFilter.CAPACITY_HEADROOM,
+            ),
+            self.false_positive_rate,
+        )
+
+    # adds the entries cached since the state's checkpoint, returns False if they could not be loaded
+    def _catch_up(self, model_id: str, state: ModelInputCacheFilterState) -> bool:
+        checkpoint = utc_now_datetime()
+
+        try:
+            records: List[ModelInputCacheHashRecord] = ModelInputCacheDAO.execute_query(
+                ModelInputCacheQuery.SELECT_INPUT_HASHES_SINCE,
+                ApplicationConfig.instance().database_config,
+                query_kwargs={
+                    "model_id": model_id,
+                    "since": string_from_date(
+                        datetime_delta(
+                            state.checkpoint,
+                            f"-{ModelInputCacheFilter.CHECKPOINT_OVERLAP}",
+                        )
+                    ),
+                },
+            )
+        except:
+            ContextLogger.warn(
+                self._logger_key,
+                "Failed to load new entries for model [%s], error = [%s]"
+                % (model_id, repr(exc_info())),
+            )
+
+            return False
+
+        with self._lock:
+            # NOTE: reset or rebuilt in the meantime, the new state has its own checkpoint
+            if self._states.get(model_id) is not state:
+                return True
+
+            for record in [] if records is None else records:
+                # NOTE: the overlap loads entries again, they are not counted twice
+                if not state.filter.might_contain(record.input_hash):
+                    state.filter.add(record.input_hash)
+
+            state.checkpoint = max(state.checkpoint, checkpoint)
+
+        return True
+
+    def _catch_up_all(self):
+        with self._lock:
+            states = list(self._states.items())
+
+        for model_id, state in states:
+            if self._kill_event.is_set():
+                return
+
+            self._catch_up(model_id, state)
+
+    # returns the input hashes that are definitely not cached. None are returned if the model's filter is not built
+    #   NOTE: in-memory only, see _catch_up_all for the entries cached by other servers
+    def definite_misses(self, model_id: str, input_hashes: List[str]) -> List[str]:
+        if not self.enabled or len(input_hashes) == 0:
+            return []
+
+        with self._lock:
+            state = self._states.get(model_id)
+
+            if state is None:
+                return []
+
+            misses = list(
+                filter(
+                    lambda input_hash: not state.filter.might_contain(input_hash),
+                    input_hashes,
+                )
+            )
+            state.skipped_lookups += len(misses)
+
+            return misses
+
+    def record_false_positives(self, model_id: str, count: int):
+        if not self.enabled or count == 0:
+            return
+
+        with self._lock:
+            state = self._states.get(model_id)
+
+            if state is not None:
+                state.false_positives += count
+
+    def add(self, model_id: str, input_hashes: List[str]):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if model_id in self._rebuild_additions:
+                self._rebuild_additions[model_id].extend(input_hashes)
+
+            state = self._states.get(model_id)
+
+            if state is None:
+                return
+
+            for input_hash in input_hashes:
+                # NOTE: entries are added on submit and again once persisted, they are not counted twice
+                if not state.filter.might_contain(input_hash):
+                    state.filter.add(input_hash)
+
+    # the model's cache was cleared
+    def reset(self, model_id: str):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            if model_id in self._rebuild_additions:
+                self._rebuild_additions[model_id] = []
+
+            if model_id in self._states:
+                self._states[model_id] = ModelInputCacheFilterState(
+                    self._new_filter(0),
+                    datetime.now().timestamp(),
+                    utc_now_datetime(),
+                )
+
+    def _count_entries(self, model_id: str) -> int:
+        results: List[CountRecord] = ModelInputCacheDAO.execute_query(
+            ModelInputCacheQuery.COUNT_BY_MODEL_ID,
+            ApplicationConfig.instance().database_config,
+            query_kwargs={"model_id": model_id},
+        )
+
+        return 0 if results is None or len(results) == 0 else results[0].count
+
+    def _build(self, model_id: str):
+        with self._lock:
+            self._rebuild_additions[model_id] = []
+
+        try:
+            # NOTE: entries persisted after their page was loaded are added once persisted (see ModelInputCacheWriter),
+            #       i.e. to the rebuild additions below
+            start_time = datetime.now().timestamp()
+            checkpoint = utc_now_datetime()
+            bloom_filter = self._new_filter(self._count_entries(model_id))
+            after_input_hash: str | None = None
+
+            while not self._kill_event.is_set():
+                records: List[ModelInputCacheHashRecord] = (
+                    ModelInputCacheDAO.execute_query(
+                        ModelInputCacheQuery.SELECT_INPUT_HASHES,
+                        ApplicationConfig.instance().database_config,
+                        query_kwargs={
+                            "model_id": model_id,
+                            "after_input_hash": after_input_hash,
+                            "limit": ModelInputCacheFilter.PAGE_SIZE,
+                        },
+                    )
+                )
+
+                if records is None or len(records) == 0:
+                    break
+
+                for record in records:
+                    bloom_filter.add(record.input_hash)
+
+                if len(records) < ModelInputCacheFilter.PAGE_SIZE:
+                    break
+
+                after_input_hash = records[-1].input_hash
+
+            if self._kill_event.is_set():
+                return
+
+            with self._lock:
+                for input_hash in self._rebuild_additions.get(model_id, []):
+                    bloom_filter.add(input_hash)
+
+                self._states[model_id] = ModelInputCacheFilterState(
+                    bloom_filter, datetime.now().timestamp(), checkpoint
+                )
+
+            ContextLogger.debug(
+                self._logger_key,
+                "Built filter for model [%s], entries = [%d], memory = [%d] bytes, took [%.1f]s"
+                % (
+                    model_id,
+                    bloom_filter.count,
+                    bloom_filter.memory_bytes(),
+                    datetime.now().timestamp() - start_time,
+                ),
+            )
+        finally:
+            with self._lock:
+                self._rebuild_additions.pop(model_id, None)
+
+    def _refresh(self):
+        now = datetime.now().timestamp()
+        model_ids = set(
+            map(
+                lambda model: model.id,
+                filter(
+                    lambda model: model.details.cache_enabled,
+                    ModelController.instance().get_models(),
+                ),
+            )
+        )
+
+        with self._lock:
+            for model_id in list(self._states.keys()):
+                if model_id not in model_ids:
+                    del self._states[model_id]
+
+            stale_model_ids = list(
+                filter(
+                    lambda model_id: model_id not in self._states
+                    or now - self._states[model_id].built_at >= self.refresh_interval
+                    or self._states[model_id].filter.is_over_capacity(),
+                    model_ids,
+                )
+            )
+
+        for model_id in stale_model_ids:
+            if self._kill_event.is_set():
+                return
+
+            try:
+                self._build(model_id)
+            except:
+                ContextLogger.error(
+                    self._logger_key,
+                    "Failed to build filter for model [%s], error = [%s]"
+                    % (model_id, repr(exc_info())),
+                )
+                traceback.print_exc(file=stdout)
+
+    def stats(self) -> List[ModelInputCacheFilterStats]:
+        with self._lock:
+            states = list(self._states.items())
+
+        return list(
+            map(
+                lambda item: ModelInputCacheFilterStats(
+                    item[0],
+                    item[1].filter.count,
+                    item[1].filter.capacity,
+                    item[1].filter.memory_bytes(),
+                    item[1].filter.hash_count,
+                    item[1].filter.false_positive_rate(),
+                    item[1].skipped_lookups,
+                    item[1].false_positives,
+                    item[1].built_date,
+                ),
+                sorted(states, key=lambda item: item[0]),
+            )
+        )
+
+    def run(self):
+        if not self.enabled:
+            ContextLogger.info(self._logger_key, "Filter disabled")
+
+            return
+
+        ContextLogger.info(self._logger_key, "Controller started")
+
+        last_refresh = 0.0
+
+        while True:
+            try:
+                self._catch_up_all()
+
+                if (
+                    datetime.now().timestamp() - last_refresh
+                    >= ModelInputCacheFilter.CHECK_INTERVAL
+                ):
+                    last_refresh = datetime.now().timestamp()
+                    self._refresh()
+            except:
+                ContextLogger.error(
+                    self._logger_key,
+                    "Failed to refresh filters, error = [%s]" % repr(exc_info()),
+                )
+                traceback.print_exc(file=stdout)
+
+            if self._wait_or_kill(
+                min(self.catch_up_interval, ModelInputCacheFilter.CHECK_INTERVAL)
+            ):
+                break
+
+        ContextLogger.info(self._logger_key, "Controller stopped")
@@ -0,0 +1,299 @@
+import traceback
+from queue import Empty, Full, Queue
+from sys import exc_info, stdout
+from threading import Event, Thread
+from time import time
+from typing import Any, Dict, List
+
+from config.application_config import ApplicationConfig
+from controllers.model_input_cache_filter import ModelInputCacheFilter
+from db.daos.model_input_cache import ModelInputCacheDAO, ModelInputCacheQuery
+from python_framework.config_utils import load_environment_variable
+from python_framework.db.transaction_manager import TransactionManager
+from python_framework.graceful_killer import GracefulKiller, KillInstance
+from python_framework.logger import ContextLogger, LogLevel
+
+###
+# The ModelInputCacheWriter persists new ModelInputCache entries in the background (write-behind),
+#   so the WorkRequestWorkers never block on the cache inserts.
+#
+# Entries are inserted in multi-row batches of up to MODEL_INPUT_CACHE_WRITER_BATCH_SIZE entries, at least
+#   every MODEL_INPUT_CACHE_WRITER_FLUSH_INTERVAL seconds. If a batch fails, its entries are inserted one by one
+#   (single failures are ignored, as before).
+#
+# The entries are added to the ModelInputCacheFilter when submitted, and again once persisted (for filters rebuilt
+#   in the meantime).
+#
+# NOTE: the queue is in-memory. It is flushed on shutdown (see GracefulKiller), entries are only lost if the
+#       server is killed. When the queue is full, entries are persisted synchronously by the caller.
+###
+
+
+class ModelInputCacheEntry:
+    model_id: str
+    input_hash: str
+    input: str
+    result: str  # serialized json
+    user_id: str | None
+
+    def __init__(
+        self,
+        model_id: str,
+        input_hash: str,
+        input: str,
+        result: str,
+        user_id: str | None,
+    ):
+        self.model_id = model_id
+        self.input_hash = input_hash
+        self.input = input
+        self.result = result
+        self.user_id = user_id
+
+    def to_query_args(self) -> Dict[str, Any]:
+        return {
+            "model_id": self.model_id,
+            "input_hash": self.input_hash,
+            "input": self.input,
+            "result": self.result,
+            "user_id": self.user_id,
+        }
+
+
+class ModelInputCacheWriterKillInstance(KillInstance):
+    def kill(self):
+        ModelInputCacheWriter.instance().kill()
+
+
+class ModelInputCacheWriter(Thread):
+    DEFAULT_QUEUE_SIZE = 100000
+    DEFAULT_BATCH_SIZE = 1000
+    DEFAULT_FLUSH_INTERVAL = 2
+
+    _instance: "ModelInputCacheWriter" = None
+
+    _logger_key: str = None
+    _kill_event: Event
+
+    _queue: Queue[ModelInputCacheEntry]
+
+    batch_size: int
+    flush_interval: float
+
+    def __init__(self):
+        Thread.__init__(self)
+
+        self._logger_key = "ModelInputCacheWriter"
+        self._kill_event = Event()
+
+        self._queue = Queue(
+            maxsize=int(
+                load_environment_variable(
+                    "MODEL_INPUT_CACHE_WRITER_QUEUE_SIZE",
+                    default=ModelInputCacheWriter.DEFAULT_QUEUE_SIZE,
+                )
+            )
+        )
+
+        self.batch_size = int(
+            load_environment_variable(
+                "MODEL_INPUT_CACHE_WRITER_BATCH_SIZE",
+                default=ModelInputCacheWriter.DEFAULT_BATCH_SIZE,
+            )
+        )
+        self.flush_interval = float(
+            load_environment_variable(
+                "MODEL_INPUT_CACHE_WRITER_FLUSH_INTERVAL",
+                default=ModelInputCacheWriter.DEFAULT_FLUSH_INTERVAL,
+            )
+        )
+
+        ContextLogger.instance().create_logger_for_context(
+            self._logger_key,
+            LogLevel.from_string(
+                load_environment_variable(
+                    f"LOG_LEVEL_{self._logger_key}", default=LogLevel.INFO.name
+                )
+            ),
+        )
+
+    @staticmethod
+    def initialize() -> "ModelInputCacheWriter":
+        if ModelInputCacheWriter._instance is not None:
+            return ModelInputCacheWriter._instance
+
+        ModelInputCacheWriter._instance = ModelInputCacheWriter()
+        GracefulKiller.instance().register_kill_instance(
+            ModelInputCacheWriterKillInstance()
+        )
+
+        return ModelInputCacheWriter._instance
+
+    @staticmethod
+    def instance() -> "ModelInputCacheWriter":
+        return ModelInputCacheWriter._instance
+
+    def kill(self):
+        self._kill_event.set()
+
+    def pending_count(self) -> int:
+        return self._queue.qsize()
+
+    def _add_to_filter(self, entries: List[ModelInputCacheEntry]):
+        input_hashes_by_model_id: Dict[str, List[str]] = {}
+
+        for entry in entries:
+            input_hashes_by_model_id.setdefault(entry.model_id, []).append(
+                entry.input_hash
+            )
+
+        for model_id, input_hashes in input_hashes_by_model_id.items():
+            ModelInputCacheFilter.instance().add(model_id, input_hashes)
+
+    # NOTE: entries are persisted synchronously if the writer is not running or the queue is full
+    def submit(self, entries: List[ModelInputCacheEntry]) -> bool:
+        self._add_to_filter(entries)
+
+        if not self.is_alive() or self._kill_event.is_set():
+            return self.persist(entries)
+
+        for index, entry in enumerate(entries):
+            try:
+                self._queue.put_nowait(entry)
+            except Full:
+                ContextLogger.warn(
+                    self._logger_key,
+                    "Queue full, persisting [%d] entries synchronously"
+                    % (len(entries) - index),
+                )
+
+                return self.persist(entries[index:])
+
+        return True
+
+    def _persist_single(self, entry: ModelInputCacheEntry) -> bool:
+        try:
+            _ = ModelInputCacheDAO.execute_insert(
+                ApplicationConfig.instance().database_config,
+                **entry.to_query_args(),
+            )
+
+            return True
+        except:
+            ContextLogger.warn(
+                self._logger_key,
+                f"Failed to persist modelcacherecord for model_id = [{entry.model_id}], reason = {exc_info()!r}",
+            )
+
+            return False
+
+    # inserts the entries in multi-row batches, in a single transaction
+    def persist(self, entries: List[ModelInputCacheEntry]) -> bool:
+        if len(entries) == 0:
+            return True
+
+        try:
+            with TransactionManager(
+                ApplicationConfig.instance().database_config
+            ) as conn:
+                for i in range(0, len(entries), self.batch_size):
+                    _ = ModelInputCacheDAO.execute_query(
+                        ModelInputCacheQuery.BULK_INSERT,
+                        connection=conn,
+                        query_kwargs={
+                            "entries": list(
+                                map(
+                                    lambda entry: entry.to_query_args(),
+                                    entries[i : i + self.batch_size],
+                                )
+                            ),
+                        },
+                    )
+
+            self._add_to_filter(entries)
+
+            return True
+        except:
+            ContextLogger.warn(
+                self._logger_key,
+                f"Failed to persist [{len(entries)}] modelcacherecords in batch, persisting one by one, reason = {exc_info()!r}",
+            )
+
+        # NOTE: allow single failures (e.g. a model deleted in the meantime)
+        persisted_entries = list(filter(self._persist_single, entries))
+        self._add_to_filter(persisted_entries)
+        persisted_count = len(persisted_entries)
+
+        return persisted_count == len(entries)
+
+    # collects up to batch_size entries, waiting at most flush_interval for the batch to fill up
+    def _next_batch(self) -> List[ModelInputCacheEntry]:
+        batch: List[ModelInputCacheEntry] = []
+        flush_time = time() + self.flush_interval
+
+        while len(batch) < self.batch_size:
+            timeout = flush_time - time()
+
+            if timeout <= 0 or self._kill_event.is_set():
+                break
+
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except Empty:
+                break
+
+        return batch
+
+    def _drain(self) -> List[ModelInputCacheEntry]:
+        entries: List[ModelInputCacheEntry] = []
+
+        while True:
+            try:
+                entries.append(self._queue.get_nowait())
+            except Empty:
+                return entries
+
+    # persists the pending entries in the calling thread, e.g. before the cache is cleared
+    #   NOTE: a batch in progress by the writer thread is not waited for
+    def flush(self) -> bool:
+        return self.persist(self._drain())
+
+    def run(self):
+        ContextLogger.info(self._logger_key, "Controller started")
+
+        while not self._kill_event.is_set():
+            try:
+                batch = self._next_batch()
+
+                if len(batch) == 0:
+                    continue
+
+                ContextLogger.debug(
+                    self._logger_key, "Persisting [%d] entries..." % len(batch)
+                )
+                self.persist(batch)
+            except:
+                ContextLogger.error(
+                    self._logger_key,
+                    "Failed to persist cache entries, error = [%s]" % repr(exc_info()),
+                )
+                traceback.print_exc(file=stdout)
+
+        remaining_entries = self._drain()
+
+        if len(remaining_entries) > 0:
+            ContextLogger.info(
+                self._logger_key,
+                "Flushing [%d] pending entries..." % len(remaining_entries),
+            )
+
+            try:
+                self.persist(remaining_entries)
+            except:
+                ContextLogger.error(
+                    self._logger_key,
+                    "Failed to flush pending entries, error = [%s]" % repr(exc_info()),
+                )
+                traceback.print_exc(file=stdout)
+
+        ContextLogger.info(self._logger_key, "Controller stopped")
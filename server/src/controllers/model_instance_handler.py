@@ -1,10 +1,14 @@
 import traceback
+from asyncio import Event as AsyncEvent
+from asyncio import TimeoutError as AsyncTimeoutError
+from asyncio import wait_for
 from datetime import datetime
 from enum import Enum
+from functools import partial
 from json import dumps
 from math import floor
 from sys import exc_info, stdout
-from threading import Event, Thread
+from threading import Event, Lock
 from time import sleep
 from typing import Union
 
@@ -13,6 +17,7 @@ from controllers.instance_metrics import InstanceMetricsController
 from controllers.job_submission_process import JobSubmissionProcess
 from controllers.k8s import K8sController
 from controllers.model import ModelController
+from controllers.model_instance_supervisor import ModelInstanceSupervisor
 from controllers.model_instance_log import (
     ModelInstanceLogController,
     ModelInstanceLogEvent,
@@ -26,10 +31,11 @@ from db.daos.model_instance import (
     ModelInstanceExtendedRecord,
     ModelInstanceRecord,
 )
-from objects.instance import ExtendedModelInstance
+from objects.instance import ExtendedModelInstance, InstanceCapacity, JobBatchEntry
 from objects.k8s import ErsiliaAnnotations, K8sPod
+from objects.k8s_generator import generate_memory_class
 from objects.model import ModelUpdate
-from objects.model_integration import JobStatus
+from objects.model_integration import JobResult, JobStatus
 from python_framework.advanced_threading import synchronized_method
 from python_framework.config_utils import load_environment_variable
 from python_framework.graceful_killer import GracefulKiller, KillInstance
@@ -45,14 +51,34 @@ from python_framework.time import utc_now
 #   - pod termination
 #   - monitoring
 #
+# Models with a non-zero ModelDetails.instance_idle_timeout keep their pod warm after a COMPLETED job:
+#   the instance is released by the WorkRequestWorker (ACTIVE -> IDLE) and can be re-assigned to the
+#   next WorkRequest of the same model (IDLE -> ACTIVE), until the idle timeout is reached.
+#
+# A single job can be (micro-)batched for multiple WorkRequests (see job_batch), in which case the
+#   ModelInstanceController maps every batched WorkRequest to the same handler.
+#
+# A single (large) WorkRequest can be sharded across multiple handlers (see shard_index), each
+#   processing a contiguous slice of the WorkRequest entries.
+#
+# An instance can be provisioned eagerly, when its WorkRequest is submitted (see provision_instance):
+#   the pod boots while the WorkRequest is QUEUED, and the job is assigned once it is claimed
+#   (see assign_job). Unassigned instances are terminated after the provision timeout.
+#   The ModelPrewarmer provisions (prewarmed) instances the same way, ahead of predicted WorkRequests.
 ###
 
 
+# raised by request_instance when the global, per-model or memory limits are reached
+class ModelInstanceCapacityException(Exception):
+    pass
+
+
 class ModelInstanceState(Enum):
     REQUESTED = "REQUESTED"
     INITIALIZING = "INITIALIZING"
     WAITING_FOR_READINESS = "WAITING_FOR_READINESS"
     ACTIVE = "ACTIVE"
+    IDLE = "IDLE"
     SHOULD_TERMINATE = "SHOULD_TERMINATE"
     TERMINATING = "TERMINATING"
     TERMINATED = "TERMINATED"
@@ -98,16 +124,26 @@ class ModelInstanceControllerStub:
     ):
         pass
 
+    def remove_handler(self, handler: "ModelInstanceHandler"):
+        pass
+
 
-class ModelInstanceHandler(Thread):
+# NOTE: handlers are driven by the ModelInstanceSupervisor's event loop (see _supervise),
+#       start / join / is_alive mirror the Thread API
+class ModelInstanceHandler:
     _logger_key: str
     _kill_event: Event
+    _async_kill_event: AsyncEvent | None
+    _started: bool
+    _finished_event: Event
 
     _controller: ModelInstanceControllerStub
     _work_request_controller: WorkRequestControllerStub | None
 
     model_id: str
     work_request_id: str
+    shard_index: int | None
+    shard_attempt: int
     pod_name: str | None
     k8s_pod: K8sPod | None
     pod_exists: bool
@@ -120,6 +156,16 @@ class ModelInstanceHandler(Thread):
 
     job_submission_process: JobSubmissionProcess | None
     job_submission_entries: list[str] | None
+    job_batch: list[JobBatchEntry] | None
+    _processed_batch_ids: set[str]
+
+    idle_timeout: int
+    _idle_since: float | None
+    _released_job: tuple[str, str | None] | None
+    provision_timeout: int
+    _provisioned_since: float | None
+    prewarmed: bool
+    _state_lock: Lock
 
     def __init__(
         self,
@@ -128,16 +174,25 @@ class ModelInstanceHandler(Thread):
         controller: ModelInstanceControllerStub,
         job_submission_entries: list[str] | None = None,
         work_request_controller: WorkRequestControllerStub | None = None,
+        job_batch: list[JobBatchEntry] | None = None,
+        shard_index: int | None = None,
+        shard_attempt: int = 0,
+        provisioned: bool = False,
+        provision_timeout: int = 0,
+        prewarmed: bool = False,
     ):
-        Thread.__init__(self)
-
-        self._logger_key = f"ModelInstanceHandler[{model_id}@{work_request_id}]"
+        self._logger_key = f"ModelInstanceHandler[{model_id}@{work_request_id}{'' if shard_index is None else f'#{shard_index}'}]"
         self._kill_event = Event()
+        self._async_kill_event = None
+        self._started = False
+        self._finished_event = Event()
         self._controller = controller
         self._work_request_controller = work_request_controller
 
         self.model_id = model_id
         self.work_request_id = str(work_request_id)
+        self.shard_index = shard_index
+        self.shard_attempt = shard_attempt
         self.pod_name = None
         self.k8s_pod = None
         self.pod_exists = False
@@ -149,7 +204,21 @@ class ModelInstanceHandler(Thread):
         self.last_persisted_timestamp = None
 
         self.job_submission_process = None
-        self.job_submission_entries = job_submission_entries
+        self.job_submission_entries = (
+            job_submission_entries
+            if job_batch is None
+            else JobBatchEntry.batch_entries(job_batch)
+        )
+        self.job_batch = job_batch
+        self._processed_batch_ids = set()
+
+        self.idle_timeout = 0
+        self._idle_since = None
+        self._released_job = None
+        self.provision_timeout = provision_timeout
+        self._provisioned_since = datetime.now().timestamp() if provisioned else None
+        self.prewarmed = prewarmed
+        self._state_lock = Lock()
 
         ContextLogger.instance().create_logger_for_context(
             self._logger_key,
@@ -160,13 +229,40 @@ class ModelInstanceHandler(Thread):
             ),
         )
 
-    def _wait_or_kill(self, timeout: float) -> bool:
-        return self._kill_event.wait(timeout)
+    async def _wait_or_kill(self, timeout: float | None = None) -> bool:
+        if self._kill_event.is_set():
+            return True
 
-    def kill(self):
+        try:
+            await wait_for(self._async_kill_event.wait(), timeout)
+        except AsyncTimeoutError:
+            pass
+
+        return self._kill_event.is_set()
+
+    def _set_kill_event(self):
         self._kill_event.set()
+
+        if self._async_kill_event is not None:
+            ModelInstanceSupervisor.instance().call_soon(self._async_kill_event.set)
+
+    def kill(self):
+        self._set_kill_event()
         self.state = ModelInstanceState.SHOULD_TERMINATE
 
+    def start(self):
+        self._started = True
+        ModelInstanceSupervisor.instance().supervise(self._supervise())
+
+    def is_alive(self) -> bool:
+        return self._started and not self._finished_event.is_set()
+
+    def join(self, timeout: float | None = None):
+        if not self._started:
+            return
+
+        self._finished_event.wait(timeout)
+
     def is_active(self) -> bool:
         return self.state not in [
             ModelInstanceState.SHOULD_TERMINATE,
@@ -174,6 +270,276 @@ class ModelInstanceHandler(Thread):
             ModelInstanceState.TERMINATED,
         ]
 
+    def is_reusable(self) -> bool:
+        return self.idle_timeout > 0
+
+    def is_idle(self) -> bool:
+        return self.state == ModelInstanceState.IDLE
+
+    def idle_since(self) -> float | None:
+        return self._idle_since
+
+    # eagerly provisioned, no job assigned yet
+    def is_provisioned(self) -> bool:
+        return self._provisioned_since is not None
+
+    # idle and provisioned instances are not processing any job, they can be (re-)assigned or evicted
+    def is_unassigned(self) -> bool:
+        return self.is_idle() or self.is_provisioned()
+
+    def work_request_ids(self) -> list[str]:
+        if self.job_batch is None:
+            return [self.work_request_id]
+
+        return list(map(lambda b: b.work_request_id, self.job_batch))
+
+    # keys used by the ModelInstanceController
+    def instance_keys(self) -> list[str]:
+        return list(
+            map(
+                lambda work_request_id: ModelInstanceController.instance_key(
+                    self.model_id, work_request_id, self.shard_index
+                ),
+                self.work_request_ids(),
+            )
+        )
+
+    def _get_batch_entry(self, work_request_id: int | str) -> JobBatchEntry | None:
+        for batch_entry in self.job_batch:
+            if batch_entry.work_request_id == str(work_request_id):
+                return batch_entry
+
+        return None
+
+    def get_job_entries(self, work_request_id: int | str) -> list[str] | None:
+        if self.job_batch is None:
+            return self.job_submission_entries
+
+        batch_entry = self._get_batch_entry(work_request_id)
+
+        return None if batch_entry is None else batch_entry.entries
+
+    # the WorkRequest's slice of the job result
+    def get_job_result(self, work_request_id: int | str) -> JobResult | None:
+        if self.job_submission_process is None:
+            return None
+
+        job_result = self.job_submission_process.job_result
+
+        if self.job_batch is None or job_result is None:
+            return job_result
+
+        batch_entry = self._get_batch_entry(work_request_id)
+
+        if batch_entry is None:
+            return None
+
+        return job_result[
+            batch_entry.offset : batch_entry.offset + len(batch_entry.entries)
+        ]
+
+    # returns True once all WorkRequests of the job have been processed
+    def mark_work_request_processed(self, work_request_id: int | str) -> bool:
+        with self._state_lock:
+            if self.job_batch is None:
+                return True
+
+            self._processed_batch_ids.add(str(work_request_id))
+
+            return all(
+                map(
+                    lambda b: b.work_request_id in self._processed_batch_ids,
+                    self.job_batch,
+                )
+            )
+
+    # called by the WorkRequestWorker once the job result has been processed
+    def release(self):
+        with self._state_lock:
+            if (
+                self.is_reusable()
+                and self.state == ModelInstanceState.ACTIVE
+                and self.is_job_completed()
+                and self.job_submission_process.job_status == JobStatus.COMPLETED
+                and not self._kill_event.is_set()
+            ):
+                self._released_job = (
+                    self.work_request_id,
+                    self.last_persisted_timestamp,
+                )
+                self._idle_since = datetime.now().timestamp()
+                self.state = ModelInstanceState.IDLE
+                # NOTE: re-using the idle instance is not a prewarm hit
+                self.prewarmed = False
+
+                ContextLogger.info(
+                    self._logger_key,
+                    "Instance released, keeping pod warm for [%d]s"
+                    % self.idle_timeout,
+                )
+
+                return
+
+        self.kill()
+
+    def assign_job(
+        self,
+        work_request_id: int | str,
+        job_submission_entries: list[str],
+        work_request_controller: WorkRequestControllerStub | None = None,
+        job_batch: list[JobBatchEntry] | None = None,
+    ) -> bool:
+        previous_job_submission_process: JobSubmissionProcess | None = None
+
+        with self._state_lock:
+            if not self.is_unassigned() or self._kill_event.is_set():
+                return False
+
+            was_provisioned = self.is_provisioned()
+            previous_job_submission_process = self.job_submission_process
+
+            self.work_request_id = str(work_request_id)
+            self.shard_index = None
+            self.shard_attempt = 0
+            self.job_submission_entries = (
+                job_submission_entries
+                if job_batch is None
+                else JobBatchEntry.batch_entries(job_batch)
+            )
+            self.job_batch = job_batch
+            self._processed_batch_ids = set()
+            self.job_submission_process = None
+            self.termination_reason = None
+            self.last_persisted_timestamp = None
+            self._idle_since = None
+            self._provisioned_since = None
+
+            # NOTE: a provisioned pod might still be booting, its state is updated by _check_pod_state
+            if not was_provisioned:
+                self.pod_ready_timestamp = utc_now()
+                self.state = ModelInstanceState.ACTIVE
+
+            if work_request_controller is not None:
+                self._work_request_controller = work_request_controller
+
+        if previous_job_submission_process is not None:
+            try:
+                previous_job_submission_process.finalize()
+            except:
+                pass
+
+        # NOTE: a provisioned pod might not be created yet, it is created with the new WorkRequest id
+        if self.pod_name is not None:
+            try:
+                k8s_pod = K8sController.instance().attach_work_request(
+                    self.model_id, self.pod_name, self.work_request_id
+                )
+
+                if k8s_pod is not None:
+                    self.k8s_pod = k8s_pod
+            except:
+                ContextLogger.warn(
+                    self._logger_key,
+                    "Failed to update pod request annotation, error = [%s]"
+                    % repr(exc_info()),
+                )
+
+        if was_provisioned:
+            ContextLogger.info(
+                self._logger_key,
+                "Provisioned instance assigned to WorkRequest [%s]"
+                % self.work_request_id,
+            )
+
+            return True
+
+        ContextLogger.info(
+            self._logger_key,
+            "Instance re-used for WorkRequest [%s]" % self.work_request_id,
+        )
+        ModelInstanceLogController.instance().log_instance(
+            ModelInstanceLogEvent.INSTANCE_REUSED,
+            k8s_pod=self.k8s_pod,
+            model_id=self.model_id,
+            work_request_id=self.work_request_id,
+        )
+
+        return True
+
+    def _handle_released_job(self):
+        with self._state_lock:
+            released_job = self._released_job
+            self._released_job = None
+
+        if released_job is None:
+            return
+
+        released_work_request_id, expected_last_updated = released_job
+
+        self._cache_pod_logs()
+
+        if self._pod_logs is not None:
+            S3IntegrationController.instance().upload_instance_logs(
+                self.model_id, released_work_request_id, self._pod_logs
+            )
+
+        ModelInstanceLogController.instance().log_instance(
+            ModelInstanceLogEvent.INSTANCE_IDLE,
+            k8s_pod=self.k8s_pod,
+            model_id=self.model_id,
+            work_request_id=released_work_request_id,
+        )
+
+        # the instance is done with the released WorkRequest, even though the pod stays warm
+        last_persisted_timestamp = self._persist_state(
+            released_work_request_id,
+            ModelInstanceState.TERMINATED,
+            ModelInstanceTerminationReason.COMPLETED,
+            expected_last_updated,
+        )
+
+        with self._state_lock:
+            if self.work_request_id == released_work_request_id:
+                self.last_persisted_timestamp = last_persisted_timestamp
+
+    def _idle_timeout_reached(self) -> bool:
+        with self._state_lock:
+            if (
+                self.state != ModelInstanceState.IDLE
+                or self._idle_since is None
+                or datetime.now().timestamp() - self._idle_since < self.idle_timeout
+            ):
+                return False
+
+            ContextLogger.info(self._logger_key, "Idle timeout reached")
+
+            self.state = ModelInstanceState.SHOULD_TERMINATE
+            self.termination_reason = ModelInstanceTerminationReason.COMPLETED
+            # NOTE: idle instances are not tracked by any WorkRequest, so nobody else will kill it
+            self._set_kill_event()
+
+            return True
+
+    def _provision_timeout_reached(self) -> bool:
+        with self._state_lock:
+            if (
+                self._provisioned_since is None
+                or datetime.now().timestamp() - self._provisioned_since
+                < self.provision_timeout
+            ):
+                return False
+
+            ContextLogger.info(
+                self._logger_key, "Provision timeout reached, no job assigned"
+            )
+
+            self.state = ModelInstanceState.SHOULD_TERMINATE
+            self.termination_reason = ModelInstanceTerminationReason.COMPLETED
+            # NOTE: the WorkRequest was not claimed by this server, so nobody else will kill it
+            self._set_kill_event()
+
+            return True
+
     def _autoheal_oomkill(self):
         model = ModelController.instance().get_model(self.model_id)
 
@@ -249,9 +615,16 @@ class ModelInstanceHandler(Thread):
         if self.pod_exists:
             self._cache_pod_logs()
 
-            if self._pod_logs is not None:
+            # NOTE: an unassigned pod did not process the WorkRequest, so its logs are not kept
+            if self._pod_logs is not None and not self.is_provisioned():
                 S3IntegrationController.instance().upload_instance_logs(
-                    self.model_id, self.work_request_id, self._pod_logs
+                    self.model_id,
+                    (
+                        self.work_request_id
+                        if self.shard_index is None
+                        else f"{self.work_request_id}/shard-{self.shard_index}"
+                    ),
+                    self._pod_logs,
                 )
 
             self._terminate_pod()
@@ -280,7 +653,7 @@ class ModelInstanceHandler(Thread):
             except:
                 pass
 
-        self._controller.remove_instance(self.model_id, self.work_request_id)
+        self._controller.remove_handler(self)
 
     def _create_pod(self) -> bool:
         try:
@@ -292,6 +665,8 @@ class ModelInstanceHandler(Thread):
             if not model.enabled:
                 raise Exception("model [%s] is disabled" % self.model_id)
 
+            self.idle_timeout = max(0, model.details.instance_idle_timeout)
+
             new_pod = K8sController.instance().deploy_new_pod(
                 self.model_id,
                 model.details.k8s_resources,
@@ -638,7 +1013,7 @@ class ModelInstanceHandler(Thread):
             ):
                 self._infer_termination_reason(_initial_k8s_pod, _k8s_pod)
                 self.state = ModelInstanceState.SHOULD_TERMINATE
-            elif self.k8s_pod.state.ready:
+            elif self.k8s_pod.state.ready and self.state != ModelInstanceState.IDLE:
                 self.state = ModelInstanceState.ACTIVE
 
             return True
@@ -653,7 +1028,7 @@ class ModelInstanceHandler(Thread):
 
             return False
 
-    def _submit_job(self) -> bool:
+    async def _submit_job(self) -> bool:
         # NOTE: we only allow job submission ONCE per model instance (for now)
         #       if submission failed for any reason, we need to restart the instance
         if self.job_submission_process is not None:
@@ -677,18 +1052,21 @@ class ModelInstanceHandler(Thread):
                 self.k8s_pod,
             )
 
-            if not self.job_submission_process.submit_job():
+            if not await self.job_submission_process.submit_job():
                 ContextLogger.warn(self._logger_key, "Failed to submit job")
 
                 return False
 
-            ModelInstanceLogController.instance().log_instance(
-                log_event=ModelInstanceLogEvent.INSTANCE_JOB_SUBMITTED,
-                k8s_pod=self.k8s_pod,
-                model_id=self.model_id,
-                work_request_id=self.work_request_id,
+            await ModelInstanceSupervisor.instance().run_blocking(
+                partial(
+                    ModelInstanceLogController.instance().log_instance,
+                    log_event=ModelInstanceLogEvent.INSTANCE_JOB_SUBMITTED,
+                    k8s_pod=self.k8s_pod,
+                    model_id=self.model_id,
+                    work_request_id=self.work_request_id,
+                )
             )
-        except:
+        except Exception:
             ContextLogger.error(
                 self._logger_key,
                 "Failed to submit job, error = [%s]" % repr(exc_info()),
@@ -698,17 +1076,24 @@ class ModelInstanceHandler(Thread):
 
         return True
 
-    def _handle_job_submission_process(self):
+    async def _handle_job_submission_process(self):
         ContextLogger.trace(self._logger_key, "_handle_job_submission_process...")
 
         if self.job_submission_process is None:
             return
 
         try:
-            if self.job_submission_process.handle_job_completion():
+            if await self.job_submission_process.handle_job_completion():
+                # NOTE: reusable instances are kept alive, see release
+                if (
+                    self.is_reusable()
+                    and self.job_submission_process.job_status == JobStatus.COMPLETED
+                ):
+                    return
+
                 self.state = ModelInstanceState.SHOULD_TERMINATE
                 self.termination_reason = ModelInstanceTerminationReason.COMPLETED
-        except:
+        except Exception:
             self.state = ModelInstanceState.SHOULD_TERMINATE
             self.termination_reason = ModelInstanceTerminationReason.FAILED
             ContextLogger.error(
@@ -722,7 +1107,9 @@ class ModelInstanceHandler(Thread):
             self.state == ModelInstanceState.SHOULD_TERMINATE
             and self.job_submission_process.job_status not in [JobStatus.COMPLETED]
         ):
-            _ = self._infer_termination_reason(None, None)
+            _ = await ModelInstanceSupervisor.instance().run_blocking(
+                self._infer_termination_reason, None, None
+            )
 
     def is_job_completed(self) -> bool:
         return (
@@ -731,30 +1118,37 @@ class ModelInstanceHandler(Thread):
             in [JobStatus.COMPLETED, JobStatus.FAILED]
         )
 
-    def persist_state(self):
+    def _persist_state(
+        self,
+        work_request_id: str,
+        state: ModelInstanceState,
+        termination_reason: ModelInstanceTerminationReason | None,
+        expected_last_updated: str | None,
+    ) -> str | None:
         try:
             results: list[ModelInstanceRecord] = ModelInstanceDAO.execute_upsert(
                 ApplicationConfig.instance().database_config,
                 model_id=self.model_id,
-                work_request_id=self.work_request_id,
+                work_request_id=work_request_id,
                 instance_id=self.pod_name,
                 instance_details=(
                     None if self.k8s_pod is None else dumps(self.k8s_pod.to_object())
                 ),
-                state=str(self.state),
-                termination_reason=str(self.termination_reason),
+                state=str(state),
+                termination_reason=str(termination_reason),
                 job_submission_process=(
                     None
                     if self.job_submission_process is None
                     else dumps(self.job_submission_process.to_object())
                 ),
-                expected_last_updated=self.last_persisted_timestamp,
+                expected_last_updated=expected_last_updated,
+                shard_index=0 if self.shard_index is None else self.shard_index,
             )
 
             if results is None or len(results) == 0:
                 raise Exception("Upsert returned zero records")
 
-            self.last_persisted_timestamp = results[0].last_updated
+            return results[0].last_updated
         except:
             ContextLogger.error(
                 self._logger_key,
@@ -762,7 +1156,21 @@ class ModelInstanceHandler(Thread):
             )
             traceback.print_exc(file=stdout)
 
-    def update_work_request_job_metadata(self):
+        return expected_last_updated
+
+    def persist_state(self):
+        # NOTE: not persisted till a job is assigned, the WorkRequest might be claimed by another server
+        if self.is_provisioned():
+            return
+
+        self.last_persisted_timestamp = self._persist_state(
+            self.work_request_id,
+            self.state,
+            self.termination_reason,
+            self.last_persisted_timestamp,
+        )
+
+    async def update_work_request_job_metadata(self):
         if self._work_request_controller is None:
             return
 
@@ -777,18 +1185,24 @@ class ModelInstanceHandler(Thread):
         attempt_count = 0
 
         while attempt_count < 2:
-            model_version = ModelIntegrationController.instance().get_model_version(
-                self.model_id, self.work_request_id, self.k8s_pod.ip
+            model_version = (
+                await ModelIntegrationController.instance().get_model_version(
+                    self.model_id, self.work_request_id, self.k8s_pod.ip
+                )
             )
 
             if model_version is not None:
                 try:
-                    self._work_request_controller.update_work_request_metadata(
-                        int(self.work_request_id), job_model_version=model_version
+                    await ModelInstanceSupervisor.instance().run_blocking(
+                        partial(
+                            self._work_request_controller.update_work_request_metadata,
+                            int(self.work_request_id),
+                            job_model_version=model_version,
+                        )
                     )
 
                     break
-                except:
+                except Exception:
                     ContextLogger.error(
                         self._logger_key,
                         "Failed to update WorkRequest ModelVersion, exc = [%s]"
@@ -796,91 +1210,144 @@ class ModelInstanceHandler(Thread):
                     )
                     traceback.print_exc(file=stdout)
 
-            if self._wait_or_kill(5):
+            if await self._wait_or_kill(5):
                 break
 
             attempt_count += 1
 
-    def run(self):
-        ContextLogger.info(self._logger_key, "Starting handler")
+    def _on_started(self) -> bool:
+        if not self._on_start():
+            self.termination_reason = ModelInstanceTerminationReason.FAILED
+            ModelInstanceLogController.instance().log_instance(
+                ModelInstanceLogEvent.INSTANCE_CREATION_FAILED,
+                k8s_pod=self.k8s_pod,
+                model_id=self.model_id,
+                work_request_id=self.work_request_id,
+            )
 
-        try:
-            if self._on_start():
-                ModelInstanceLogController.instance().log_instance(
-                    ModelInstanceLogEvent.INSTANCE_CREATED,
-                    k8s_pod=self.k8s_pod,
-                    model_id=self.model_id,
-                    work_request_id=self.work_request_id,
-                )
-                self.persist_state()
+            return False
+
+        ModelInstanceLogController.instance().log_instance(
+            ModelInstanceLogEvent.INSTANCE_CREATED,
+            k8s_pod=self.k8s_pod,
+            model_id=self.model_id,
+            work_request_id=self.work_request_id,
+        )
+        self.persist_state()
+
+        return True
 
-                while True:
-                    if self._wait_or_kill(5):
-                        break
+    # the blocking (k8s + database) part of a step, returns None if the step continues with the job
+    def _check_step(self) -> bool | None:
+        _ = self._check_pod_state()
 
-                    _ = self._check_pod_state()
+        if self.state == ModelInstanceState.SHOULD_TERMINATE:
+            return False
 
-                    if self.state == ModelInstanceState.SHOULD_TERMINATE:
-                        break
+        self._handle_released_job()
 
-                    self.persist_state()
+        if self.state == ModelInstanceState.IDLE:
+            return not self._idle_timeout_reached()
 
-                    if self.job_submission_process is None:
-                        # only submit job once pod is created and in READY state
-                        if (
-                            not self.pod_exists
-                            or self.state != ModelInstanceState.ACTIVE
-                            or self.k8s_pod is None
-                            or not self.k8s_pod.state.ready
-                        ):
-                            continue
+        if self.is_provisioned():
+            return not self._provision_timeout_reached()
 
-                        ContextLogger.debug(
-                            self._logger_key,
-                            f"[pre-job submission] pod state.ready = {self.k8s_pod.state.ready}",
-                        )
-                        ContextLogger.debug(
-                            self._logger_key,
-                            f"[pre-job submission] pod state.phase = {self.k8s_pod.state.phase}",
-                        )
+        self.persist_state()
+
+        return None
+
+    # a single iteration of the handler's state machine, returns False once the instance should terminate
+    #   NOTE: the model calls are awaited on the event loop, only the k8s + database calls are offloaded
+    async def _step(self) -> bool:
+        supervisor = ModelInstanceSupervisor.instance()
+        step_result = await supervisor.run_blocking(self._check_step)
 
-                        self.update_work_request_job_metadata()
+        if step_result is not None:
+            return step_result
+
+        if self.job_submission_process is None:
+            # only submit job once pod is created and in READY state
+            if (
+                not self.pod_exists
+                or self.state != ModelInstanceState.ACTIVE
+                or self.k8s_pod is None
+                or not self.k8s_pod.state.ready
+            ):
+                return True
 
-                        if not self._submit_job():
-                            ModelInstanceLogController.instance().log_instance(
-                                ModelInstanceLogEvent.INSTANCE_JOB_SUBMISSION_FAILED,
-                                k8s_pod=self.k8s_pod,
-                                model_id=self.model_id,
-                                work_request_id=self.work_request_id,
-                            )
-                            self.termination_reason = (
-                                ModelInstanceTerminationReason.FAILED
-                            )
+            ContextLogger.debug(
+                self._logger_key,
+                f"[pre-job submission] pod state.ready = {self.k8s_pod.state.ready}",
+            )
+            ContextLogger.debug(
+                self._logger_key,
+                f"[pre-job submission] pod state.phase = {self.k8s_pod.state.phase}",
+            )
 
+            await self.update_work_request_job_metadata()
+
+            if not await self._submit_job():
+                await supervisor.run_blocking(
+                    partial(
+                        ModelInstanceLogController.instance().log_instance,
+                        ModelInstanceLogEvent.INSTANCE_JOB_SUBMISSION_FAILED,
+                        k8s_pod=self.k8s_pod,
+                        model_id=self.model_id,
+                        work_request_id=self.work_request_id,
+                    )
+                )
+                self.termination_reason = ModelInstanceTerminationReason.FAILED
+
+                return False
+        else:
+            await self._handle_job_submission_process()
+
+            if self.state == ModelInstanceState.SHOULD_TERMINATE:
+                return False
+
+        return True
+
+    async def _supervise(self):
+        ContextLogger.info(self._logger_key, "Starting handler")
+
+        supervisor = ModelInstanceSupervisor.instance()
+        self._async_kill_event = AsyncEvent()
+
+        # NOTE: kill might have been requested before the event loop picked up the handler
+        if self._kill_event.is_set():
+            self._async_kill_event.set()
+
+        try:
+            try:
+                if await supervisor.run_blocking(self._on_started):
+                    while True:
+                        if await self._wait_or_kill(5):
                             break
-                    else:
-                        self._handle_job_submission_process()
 
-                        if self.state == ModelInstanceState.SHOULD_TERMINATE:
+                        if not await self._step():
                             break
-            else:
-                self.termination_reason = ModelInstanceTerminationReason.FAILED
-                ModelInstanceLogController.instance().log_instance(
-                    ModelInstanceLogEvent.INSTANCE_CREATION_FAILED,
-                    k8s_pod=self.k8s_pod,
-                    model_id=self.model_id,
-                    work_request_id=self.work_request_id,
+            except:
+                ContextLogger.error(
+                    self._logger_key,
+                    "Handler failed, error = [%s]" % repr(exc_info()),
                 )
-        finally:
-            self._on_terminated()
+                traceback.print_exc(file=stdout)
+            finally:
+                await supervisor.run_blocking(self._on_terminated)
 
-        # NOTE: we only want to "finalize" once the instance is marked for "kill"
-        #       this happens after the WorkRequest has completed processing
-        while True:
-            if self._wait_or_kill(10):
-                break
+            # NOTE: we only want to "finalize" once the instance is marked for "kill"
+            #       this happens after the WorkRequest has completed processing
+            await self._wait_or_kill()
 
-        self._finalize()
+            await supervisor.run_blocking(self._finalize)
+        except:
+            ContextLogger.error(
+                self._logger_key,
+                "Failed to terminate handler, error = [%s]" % repr(exc_info()),
+            )
+            traceback.print_exc(file=stdout)
+        finally:
+            self._finished_event.set()
 
 
 class ModelInstanceControllerKillInstance(KillInstance):
@@ -893,16 +1360,27 @@ class ModelInstanceController:
     _logger_key: str = None
 
     model_instance_handlers: ThreadSafeCache[str, ModelInstanceHandler]
+    _handlers_lock: Lock
 
     max_instances_limit: int
+    memory_budget: int  # in megabytes, 0 = unlimited
+    provision_timeout: int  # in seconds, see provision_instance
 
     def __init__(self):
         self._logger_key = "ModelInstanceController"
 
         self.model_instance_handlers = ThreadSafeCache()
+        self._handlers_lock = Lock()
         self.max_instances_limit = int(
             load_environment_variable("MAX_CONCURRENT_MODEL_INSTANCES", default="25")
         )
+        # total memory of all (non-idle) model pods
+        self.memory_budget = int(
+            load_environment_variable("MODEL_INSTANCES_MEMORY_BUDGET", default="0")
+        )
+        self.provision_timeout = int(
+            load_environment_variable("MODEL_INSTANCE_PROVISION_TIMEOUT", default="300")
+        )
 
         ContextLogger.instance().create_logger_for_context(
             self._logger_key,
@@ -930,76 +1408,516 @@ class ModelInstanceController:
         return ModelInstanceController._instance
 
     def kill(self):
-        for handler in self.model_instance_handlers.values():
+        for handler in self.handlers():
             handler.kill()
 
-        for handler in self.model_instance_handlers.values():
+        for handler in self.handlers():
             handler.join()
 
+    # NOTE: batched jobs map multiple WorkRequests (keys) to the same handler
+    def handlers(self) -> list[ModelInstanceHandler]:
+        return list(
+            dict(
+                map(lambda h: (id(h), h), list(self.model_instance_handlers.values()))
+            ).values()
+        )
+
+    @staticmethod
+    def instance_key(
+        model_id: str, work_request_id: int | str, shard_index: int | None = None
+    ) -> str:
+        if shard_index is None:
+            return f"{model_id}_{work_request_id}"
+
+        return f"{model_id}_{work_request_id}#{shard_index}"
+
+    def _register_handler(self, handler: ModelInstanceHandler):
+        for key in handler.instance_keys():
+            self.model_instance_handlers[key] = handler
+
+    def _unregister_handler(self, handler: ModelInstanceHandler):
+        for key, _handler in list(self.model_instance_handlers.items()):
+            if _handler is handler:
+                del self.model_instance_handlers[key]
+
+    # idle (warm) and provisioned instances, see ModelInstanceHandler.is_unassigned
+    def idle_instances_count(self) -> int:
+        return len(list(filter(lambda h: h.is_unassigned(), self.handlers())))
+
+    # NOTE: idle (warm) and provisioned instances do not count towards the limit, they are evicted on demand
     def max_instances_limit_reached(self) -> bool:
+        instances_count = len(self.handlers())
+        idle_instances_count = self.idle_instances_count()
+
         ContextLogger.debug(
             self._logger_key,
-            f"curr instance = [{len(self.model_instance_handlers)}], max = [{self.max_instances_limit}]",
+            f"curr instance = [{instances_count}], idle = [{idle_instances_count}], max = [{self.max_instances_limit}]",
+        )
+        return instances_count - idle_instances_count >= self.max_instances_limit
+
+    def available_instances_count(self) -> int:
+        return max(
+            0,
+            self.max_instances_limit
+            - len(self.handlers())
+            + self.idle_instances_count(),
+        )
+
+    # NOTE: model pods request their memory limit, see K8sPodResources.to_k8s
+    def _model_memory(self, model_id: str) -> int:
+        model = ModelController.instance().get_model(model_id)
+
+        if model is None or model.details.k8s_resources is None:
+            return 0
+
+        resources = model.details.k8s_resources
+
+        return (
+            resources.memory_request
+            if resources.memory_limit is None
+            else resources.memory_limit
+        )
+
+    def _active_handlers(self) -> list[ModelInstanceHandler]:
+        return list(filter(lambda h: not h.is_unassigned(), self.handlers()))
+
+    def model_instances_count(self, model_id: str) -> int:
+        return len(
+            list(filter(lambda h: h.model_id == model_id, self._active_handlers()))
         )
-        return len(self.model_instance_handlers) >= self.max_instances_limit
 
+    def memory_in_use(self, include_idle: bool = False) -> int:
+        return sum(
+            map(
+                lambda h: self._model_memory(h.model_id),
+                self.handlers() if include_idle else self._active_handlers(),
+            )
+        )
+
+    # instances that can still be created for the model, given the global limit,
+    #   the model's max_instances (0 = no limit) and the memory budget
+    def available_model_instances_count(self, model_id: str) -> int:
+        available = self.available_instances_count()
+        model = ModelController.instance().get_model(model_id)
+
+        if model is not None and model.details.max_instances > 0:
+            available = min(
+                available,
+                model.details.max_instances - self.model_instances_count(model_id),
+            )
+
+        model_memory = self._model_memory(model_id)
+
+        if self.memory_budget > 0 and model_memory > 0:
+            available = min(
+                available,
+                (self.memory_budget - self.memory_in_use()) // model_memory,
+            )
+
+        return max(0, available)
+
+    def has_capacity(self, model_id: str) -> bool:
+        return self.available_model_instances_count(model_id) > 0
+
+    def capacity(self) -> InstanceCapacity:
+        active_handlers = self._active_handlers()
+        model_instances: dict[str, int] = {}
+        memory_class_instances: dict[str, int] = {}
+
+        for handler in active_handlers:
+            memory_class = generate_memory_class(self._model_memory(handler.model_id))
+
+            model_instances[handler.model_id] = (
+                model_instances.get(handler.model_id, 0) + 1
+            )
+            memory_class_instances[memory_class] = (
+                memory_class_instances.get(memory_class, 0) + 1
+            )
+
+        return InstanceCapacity(
+            self.max_instances_limit,
+            len(active_handlers),
+            self.idle_instances_count(),
+            self.memory_budget,
+            self.memory_in_use(),
+            model_instances,
+            memory_class_instances,
+        )
+
+    def has_idle_instance(self, model_id: str) -> bool:
+        return any(
+            map(
+                lambda h: h.model_id == model_id and h.is_idle(),
+                self.handlers(),
+            )
+        )
+
+    def acquire_idle_instance(
+        self,
+        model_id: str,
+        work_request_id: str,
+        job_submission_entries: list[str],
+        work_request_controller: WorkRequestControllerStub | None = None,
+        job_batch: list[JobBatchEntry] | None = None,
+    ) -> Union[ModelInstanceHandler, None]:
+        # prefer the instance provisioned for the WorkRequest, then warm (ready) instances
+        handlers = sorted(
+            filter(
+                lambda h: h.model_id == model_id and h.is_unassigned(),
+                self.handlers(),
+            ),
+            key=lambda h: (
+                h.work_request_id != str(work_request_id),
+                h.is_provisioned(),
+            ),
+        )
+
+        with self._handlers_lock:
+            for handler in handlers:
+
+                if not handler.assign_job(
+                    work_request_id,
+                    job_submission_entries,
+                    work_request_controller,
+                    job_batch=job_batch,
+                ):
+                    continue
+
+                self._unregister_handler(handler)
+                self._register_handler(handler)
+
+                return handler
+
+        return None
+
+    # evicts the longest idle instance(s), until at least count instances and memory_needed (megabytes) are freed
+    # NOTE: provisioned instances are evicted last, their WorkRequests are about to be claimed
+    #       the caller holds the _handlers_lock, evicted instances are unregistered so they are not counted anymore
+    def _evict_idle_instances(self, count: int = 0, memory_needed: int = 0):
+        idle_handlers = sorted(
+            filter(lambda h: h.is_unassigned(), self.handlers()),
+            key=lambda h: (h.is_provisioned(), h.idle_since() or 0),
+        )
+        evicted_count = 0
+        memory_freed = 0
+
+        for idle_handler in idle_handlers:
+            if evicted_count >= count and memory_freed >= memory_needed:
+                return
+
+            ContextLogger.info(
+                self._logger_key,
+                "Evicting idle instance [%s@%s]"
+                % (idle_handler.model_id, idle_handler.work_request_id),
+            )
+            idle_handler.kill()
+            self._unregister_handler(idle_handler)
+            evicted_count += 1
+            memory_freed += self._model_memory(idle_handler.model_id)
+
+    # checks the limits for count new instances of the model, and evicts idle instances to make room for them
+    # NOTE: the caller holds the _handlers_lock and registers the new handlers before releasing it,
+    #       so concurrent requests can not overshoot the limits
+    def _reserve_capacity(self, model_id: str, count: int = 1):
+        active_handlers = self._active_handlers()
+
+        if len(active_handlers) + count > self.max_instances_limit:
+            raise ModelInstanceCapacityException(
+                "Max Concurrent Model Instances reached"
+            )
+
+        model = ModelController.instance().get_model(model_id)
+
+        if (
+            model is not None
+            and model.details.max_instances > 0
+            and self.model_instances_count(model_id) + count
+            > model.details.max_instances
+        ):
+            raise ModelInstanceCapacityException(
+                "Model [%s] capacity reached" % model_id
+            )
+
+        model_memory = self._model_memory(model_id)
+
+        if (
+            self.memory_budget > 0
+            and model_memory > 0
+            and self.memory_in_use() + count * model_memory > self.memory_budget
+        ):
+            raise ModelInstanceCapacityException(
+                "Model [%s] memory budget reached" % model_id
+            )
+
+        # make room for the new pods by terminating the longest idle (warm) instance(s)
+        self._evict_idle_instances(
+            count=len(self.handlers()) + count - self.max_instances_limit,
+            memory_needed=(
+                0
+                if self.memory_budget <= 0
+                else self.memory_in_use(include_idle=True)
+                + count * model_memory
+                - self.memory_budget
+            ),
+        )
+
+    # NOTE: raises a ModelInstanceCapacityException if the limits are reached
     def request_instance(
         self,
         model_id: str,
         work_request_id: str,
-        ignore_max_concurrent_limit: bool = False,
         job_submission_entries: list[str] | None = None,
         work_request_controller: WorkRequestControllerStub | None = None,
+        job_batch: list[JobBatchEntry] | None = None,
+        shard_index: int | None = None,
+        shard_attempt: int = 0,
     ) -> ModelInstanceHandler:
-        if not ignore_max_concurrent_limit and self.max_instances_limit_reached():
-            raise Exception("Max Concurrent Model Instances reached")
+        key = ModelInstanceController.instance_key(
+            model_id, work_request_id, shard_index
+        )
+
+        with self._handlers_lock:
+            if key in self.model_instance_handlers:
+                if not self.model_instance_handlers[key].is_provisioned():
+                    return self.model_instance_handlers[key]
+
+                # NOTE: provisioned, but could not be assigned (e.g. provision timeout reached)
+                self.model_instance_handlers[key].kill()
+                self._unregister_handler(self.model_instance_handlers[key])
+
+            self._reserve_capacity(model_id)
+
+            handler = ModelInstanceHandler(
+                model_id,
+                work_request_id,
+                self,
+                job_submission_entries,
+                work_request_controller,
+                job_batch=job_batch,
+                shard_index=shard_index,
+                shard_attempt=shard_attempt,
+            )
+            self._register_handler(handler)
 
-        key = f"{model_id}_{work_request_id}"
+        self._start_handler(handler)
 
-        if key in self.model_instance_handlers:
-            return self.model_instance_handlers[key]
+        return handler
+
+    def _start_handler(self, handler: ModelInstanceHandler):
+        handler.start()
 
-        handler = ModelInstanceHandler(
-            model_id,
-            work_request_id,
-            self,
-            job_submission_entries,
-            work_request_controller,
+        ModelInstanceLogController.instance().log_instance(
+            ModelInstanceLogEvent.INSTANCE_REQUESTED,
+            model_id=handler.model_id,
+            work_request_id=handler.work_request_id,
         )
-        self.model_instance_handlers[key] = handler
+
+    # starts a pod for a QUEUED WorkRequest, before it is claimed, only within the free capacity
+    # NOTE: the pod is assigned to the first WorkRequest of the model claimed by this server,
+    #       see acquire_idle_instance
+    def provision_instance(
+        self,
+        model_id: str,
+        work_request_id: int | str,
+        provision_timeout: int | None = None,
+        prewarmed: bool = False,
+    ) -> Union[ModelInstanceHandler, None]:
+        if self.has_idle_instance(model_id):
+            return None
+
+        with self._handlers_lock:
+            handlers = self.handlers()
+
+            if len(handlers) >= self.max_instances_limit:
+                return None
+
+            model = ModelController.instance().get_model(model_id)
+
+            if (
+                model is None
+                or not model.enabled
+                or (
+                    model.details.max_instances > 0
+                    and len(list(filter(lambda h: h.model_id == model_id, handlers)))
+                    >= model.details.max_instances
+                )
+            ):
+                return None
+
+            if (
+                self.memory_budget > 0
+                and self.memory_in_use(include_idle=True) + self._model_memory(model_id)
+                > self.memory_budget
+            ):
+                return None
+
+            key = ModelInstanceController.instance_key(model_id, work_request_id)
+
+            if key in self.model_instance_handlers:
+                return None
+
+            handler = ModelInstanceHandler(
+                model_id,
+                work_request_id,
+                self,
+                provisioned=True,
+                provision_timeout=(
+                    self.provision_timeout
+                    if provision_timeout is None
+                    else provision_timeout
+                ),
+                prewarmed=prewarmed,
+            )
+            self._register_handler(handler)
+
         handler.start()
 
+        ContextLogger.info(
+            self._logger_key,
+            "Provisioning instance [%s@%s]%s"
+            % (model_id, work_request_id, " (prewarmed)" if prewarmed else ""),
+        )
         ModelInstanceLogController.instance().log_instance(
             ModelInstanceLogEvent.INSTANCE_REQUESTED,
             model_id=model_id,
-            work_request_id=work_request_id,
+            work_request_id=str(work_request_id),
         )
 
         return handler
 
+    # terminates the instance provisioned for the WorkRequest, if it was not assigned yet
+    def release_provisioned_instance(self, model_id: str, work_request_id: int | str):
+        handler = self.get_instance(model_id, work_request_id)
+
+        if handler is None or not handler.is_provisioned():
+            return
+
+        with self._handlers_lock:
+            # NOTE: might have been assigned in the meantime, assign_job holds the same lock
+            if handler.is_provisioned():
+                ContextLogger.info(
+                    self._logger_key,
+                    "Releasing instance provisioned for WorkRequest [%s@%s]"
+                    % (model_id, work_request_id),
+                )
+                handler.kill()
+                self._unregister_handler(handler)
+
+    # all shards are reserved at once, or none (ModelInstanceCapacityException)
+    def request_sharded_instances(
+        self,
+        model_id: str,
+        work_request_id: str,
+        shards: list[list[str]],
+        work_request_controller: WorkRequestControllerStub | None = None,
+    ) -> list[ModelInstanceHandler]:
+        with self._handlers_lock:
+            self._reserve_capacity(model_id, count=len(shards))
+
+            handlers = list(
+                map(
+                    lambda shard: ModelInstanceHandler(
+                        model_id,
+                        work_request_id,
+                        self,
+                        shard[1],
+                        work_request_controller,
+                        shard_index=shard[0],
+                    ),
+                    enumerate(shards),
+                )
+            )
+
+            for handler in handlers:
+                self._register_handler(handler)
+
+        for handler in handlers:
+            self._start_handler(handler)
+
+        return handlers
+
+    # replaces a failed shard with a new instance for the same entries
+    # NOTE: the failed shard's capacity is re-used, a ModelInstanceCapacityException is only raised
+    #       if the limits were lowered in the meantime
+    def retry_shard(self, handler: ModelInstanceHandler) -> ModelInstanceHandler:
+        with self._handlers_lock:
+            handler.kill()
+            self._unregister_handler(handler)
+
+            self._reserve_capacity(handler.model_id)
+
+            new_handler = ModelInstanceHandler(
+                handler.model_id,
+                handler.work_request_id,
+                self,
+                handler.job_submission_entries,
+                handler._work_request_controller,
+                shard_index=handler.shard_index,
+                shard_attempt=handler.shard_attempt + 1,
+            )
+            self._register_handler(new_handler)
+
+        self._start_handler(new_handler)
+
+        return new_handler
+
+    def remove_handler(self, handler: ModelInstanceHandler, terminate: bool = False):
+        with self._handlers_lock:
+            if terminate:
+                handler.kill()
+
+            self._unregister_handler(handler)
+
     def remove_instance(
         self, model_id: str, work_request_id: str, terminate: bool = False
     ):
-        key = f"{model_id}_{work_request_id}"
+        key = ModelInstanceController.instance_key(model_id, work_request_id)
 
-        if key not in self.model_instance_handlers:
-            return
+        with self._handlers_lock:
+            if key not in self.model_instance_handlers:
+                return
 
-        if terminate:
-            self.model_instance_handlers[key].kill()
+            handler = self.model_instance_handlers[key]
 
-        del self.model_instance_handlers[key]
+            if terminate:
+                handler.kill()
+
+            self._unregister_handler(handler)
 
     def get_instance(
         self, model_id: str, work_request_id: int | str
     ) -> Union[ModelInstanceHandler, None]:
-        key = f"{model_id}_{work_request_id}"
+        key = ModelInstanceController.instance_key(model_id, work_request_id)
 
         if key in self.model_instance_handlers:
             return self.model_instance_handlers[key]
 
         return None
 
+    # returns either the single instance, or all shards (ordered), of the WorkRequest
+    def get_instances(
+        self, model_id: str, work_request_id: int | str
+    ) -> list[ModelInstanceHandler]:
+        instance = self.get_instance(model_id, work_request_id)
+
+        if instance is not None:
+            return [instance]
+
+        shard_key_prefix = (
+            ModelInstanceController.instance_key(model_id, work_request_id) + "#"
+        )
+
+        return sorted(
+            map(
+                lambda item: item[1],
+                filter(
+                    lambda item: item[0].startswith(shard_key_prefix),
+                    list(self.model_instance_handlers.items()),
+                ),
+            ),
+            key=lambda h: h.shard_index,
+        )
+
     def load_instances(
         self,
         model_ids: list[str] | None = None,
@@ -1083,9 +2001,9 @@ class ModelInstanceController:
     def ensure_instance_terminated(
         self, model_id: str, work_request_id: int, wait: bool = False
     ):
-        instance = self.get_instance(model_id, work_request_id)
+        instances = self.get_instances(model_id, work_request_id)
 
-        if instance is None:
+        if len(instances) == 0:
             ContextLogger.debug(
                 self._logger_key,
                 "No instance found for model [%s], workrequest [%d]"
@@ -1093,7 +2011,9 @@ class ModelInstanceController:
             )
             return
 
-        instance.kill()
+        for instance in instances:
+            instance.kill()
 
         if wait:
-            instance.join()
+            for instance in instances:
+                instance.join()
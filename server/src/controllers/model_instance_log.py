@@ -33,6 +33,8 @@ class ModelInstanceLogEvent(Enum):
     INSTANCE_JOB_SUBMISSION_FAILED = "INSTANCE_JOB_SUBMISSION_FAILED"
     INSTANCE_JOB_COMPLETED = "INSTANCE_JOB_COMPLETED"
     INSTANCE_UPDATED = "INSTANCE_UPDATED"
+    INSTANCE_IDLE = "INSTANCE_IDLE"
+    INSTANCE_REUSED = "INSTANCE_REUSED"
 
     def __eq__(self, other):
         if isinstance(other, str):
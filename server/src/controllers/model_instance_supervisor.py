@@ -0,0 +1,124 @@
+import traceback
+from asyncio import (
+    AbstractEventLoop,
+    Future,
+    new_event_loop,
+    run_coroutine_threadsafe,
+    set_event_loop,
+)
+from concurrent.futures import Future as ConcurrentFuture
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from sys import exc_info, stdout
+from threading import Thread
+from typing import Any, Callable, Coroutine
+
+from python_framework.config_utils import load_environment_variable
+from python_framework.graceful_killer import GracefulKiller, KillInstance
+from python_framework.logger import ContextLogger, LogLevel
+
+###
+# The ModelInstanceSupervisor drives all ModelInstanceHandlers from a single asyncio event loop,
+#   instead of one (mostly sleeping) thread per instance.
+#
+# The model integration is async (see ModelIntegrationController), jobs (incl. SYNC jobs) and their status
+#   checks are awaited on the event loop, so running jobs do not hold a thread.
+#
+# NOTE: the k8s client and the database are blocking, these (short) calls are offloaded to a small, fixed executor
+#       (MODEL_INSTANCE_SUPERVISOR_MAX_BLOCKING_CALLS), independent of the number of instances.
+###
+
+
+class ModelInstanceSupervisorKillInstance(KillInstance):
+    def kill(self):
+        ModelInstanceSupervisor.instance().kill()
+
+
+class ModelInstanceSupervisor(Thread):
+    DEFAULT_MAX_BLOCKING_CALLS = 16
+
+    _instance: "ModelInstanceSupervisor" = None
+
+    _logger_key: str = None
+
+    _loop: AbstractEventLoop
+    _executor: ThreadPoolExecutor
+
+    max_blocking_calls: int
+
+    def __init__(self):
+        Thread.__init__(self)
+
+        self._logger_key = "ModelInstanceSupervisor"
+
+        self.max_blocking_calls = int(
+            load_environment_variable(
+                "MODEL_INSTANCE_SUPERVISOR_MAX_BLOCKING_CALLS",
+                default=ModelInstanceSupervisor.DEFAULT_MAX_BLOCKING_CALLS,
+            )
+        )
+
+        self._loop = new_event_loop()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_blocking_calls,
+            thread_name_prefix="ModelInstanceSupervisor",
+        )
+
+        ContextLogger.instance().create_logger_for_context(
+            self._logger_key,
+            LogLevel.from_string(
+                load_environment_variable(
+                    f"LOG_LEVEL_{self._logger_key}", default=LogLevel.INFO.name
+                )
+            ),
+        )
+
+    @staticmethod
+    def initialize() -> "ModelInstanceSupervisor":
+        if ModelInstanceSupervisor._instance is not None:
+            return ModelInstanceSupervisor._instance
+
+        ModelInstanceSupervisor._instance = ModelInstanceSupervisor()
+        GracefulKiller.instance().register_kill_instance(
+            ModelInstanceSupervisorKillInstance()
+        )
+
+        return ModelInstanceSupervisor._instance
+
+    @staticmethod
+    def instance() -> "ModelInstanceSupervisor":
+        return ModelInstanceSupervisor._instance
+
+    # NOTE: should be killed after the ModelInstanceController, which waits for its handlers
+    def kill(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # schedules the coroutine on the event loop, safe to call from any thread
+    def supervise(self, coroutine: Coroutine[Any, Any, Any]) -> ConcurrentFuture:
+        return run_coroutine_threadsafe(coroutine, self._loop)
+
+    # to be awaited from a supervised coroutine
+    def run_blocking(self, fn: Callable[..., Any], *args: Any) -> Future:
+        return self._loop.run_in_executor(self._executor, partial(fn, *args))
+
+    def call_soon(self, fn: Callable[..., Any], *args: Any):
+        self._loop.call_soon_threadsafe(fn, *args)
+
+    def run(self):
+        ContextLogger.info(self._logger_key, "Supervisor started")
+
+        set_event_loop(self._loop)
+
+        try:
+            self._loop.run_forever()
+        except:
+            ContextLogger.error(
+                self._logger_key,
+                "Supervisor event loop failed, error = [%s]" % repr(exc_info()),
+            )
+            traceback.print_exc(file=stdout)
+        finally:
+            self._loop.close()
+
+        ContextLogger.info(self._logger_key, "Supervisor stopped")
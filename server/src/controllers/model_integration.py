@@ -1,9 +1,12 @@
 import traceback
+from asyncio import get_running_loop, sleep
+from functools import partial
 from sys import exc_info, stdout
-from time import sleep, time
-from typing import List, Tuple, Union
+from time import time
+from typing import Any, List, Tuple, Union
 
 from controllers.k8s_proxy import K8sProxy, K8sProxyController
+from httpx import AsyncClient, Response
 from objects.model_integration import (
     JobResult,
     JobStatus,
@@ -13,7 +16,14 @@ from objects.model_integration import (
 )
 from python_framework.config_utils import load_environment_variable
 from python_framework.logger import ContextLogger, LogLevel
-from requests import get, post
+
+###
+# The ModelIntegrationController calls the model servers (running in the instance pods).
+#
+# NOTE: all calls are async (httpx), awaited on the ModelInstanceSupervisor's event loop,
+#       so a running job (e.g. a SYNC job, up to 20min) does not hold a thread.
+#       Errors are caught as Exception, so a cancelled call (asyncio.CancelledError) is not swallowed.
+###
 
 
 class ModelIntegrationController:
@@ -76,11 +86,14 @@ class ModelIntegrationController:
 
         return K8sProxyController.instance().start_proxy(model_id, request_id)
 
-    def _proxied_host_and_port(
+    async def _proxied_host_and_port(
         self, model_id: str, request_id: str, host: str, port: int
     ) -> Tuple[str, int]:
         if model_id in self._proxy_ids:
-            proxy = self._get_proxy(model_id, request_id)
+            # NOTE: proxies are for local development only, the port-forward is started on the loop's default executor
+            proxy = await get_running_loop().run_in_executor(
+                None, partial(self._get_proxy, model_id, request_id)
+            )
 
             if proxy is None:
                 raise Exception("Failed to proxy request")
@@ -89,19 +102,27 @@ class ModelIntegrationController:
         else:
             return host, port
 
-    def healthz(self, model_id: str, request_id: str, host: str) -> bool:
+    async def _get(self, url: str, timeout: float) -> Response:
+        async with AsyncClient(timeout=timeout) as client:
+            return await client.get(url)
+
+    async def _post(self, url: str, json: Any, params: Any, timeout: float) -> Response:
+        async with AsyncClient(timeout=timeout) as client:
+            return await client.post(url, json=json, params=params)
+
+    async def healthz(self, model_id: str, request_id: str, host: str) -> bool:
         ContextLogger.debug(
             self._logger_key,
             "Checking model health for model [%s], request_id [%s] using host = [%s]..."
             % (model_id, request_id, host),
         )
 
-        _host, _port = self._proxied_host_and_port(
+        _host, _port = await self._proxied_host_and_port(
             model_id, request_id, host, self._model_port
         )
 
         try:
-            response = get(
+            response = await self._get(
                 url=f"http://{_host}:{_port}/healthz",
                 timeout=self._request_timeout,
             )
@@ -115,7 +136,7 @@ class ModelIntegrationController:
                 return False
 
             return True
-        except:
+        except Exception:
             ContextLogger.error(
                 ModelIntegrationController.instance()._logger_key,
                 "Failed to retrieve instance health for model [%s], request_id [%s] using host = [%s], error = [%s]"
@@ -124,7 +145,7 @@ class ModelIntegrationController:
 
             return False
 
-    def get_model_version(
+    async def get_model_version(
         self, model_id: str, request_id: str, host: str
     ) -> str | None:
         ContextLogger.debug(
@@ -133,12 +154,12 @@ class ModelIntegrationController:
             % (model_id, request_id, host),
         )
 
-        _host, _port = self._proxied_host_and_port(
+        _host, _port = await self._proxied_host_and_port(
             model_id, request_id, host, self._model_port
         )
 
         try:
-            response = get(
+            response = await self._get(
                 url=f"http://{_host}:{_port}/models/status",
                 timeout=self._request_timeout,
             )
@@ -168,7 +189,7 @@ class ModelIntegrationController:
             )
 
             return None
-        except:
+        except Exception:
             ContextLogger.error(
                 ModelIntegrationController.instance()._logger_key,
                 "Failed to retrieve instance info for model [%s], request_id [%s] using host = [%s], error = [%s]"
@@ -177,7 +198,7 @@ class ModelIntegrationController:
 
             return None
 
-    def wait_for_model_readiness(
+    async def wait_for_model_readiness(
         self, model_id: str, request_id: str, host: str, timeout: float = 60
     ) -> bool:
         ContextLogger.debug(
@@ -189,14 +210,14 @@ class ModelIntegrationController:
 
         while True:
             try:
-                if self.healthz(model_id, request_id, host):
+                if await self.healthz(model_id, request_id, host):
                     ContextLogger.debug(
                         self._logger_key,
                         "model ready - model [%s], request_id [%s]"
                         % (model_id, request_id),
                     )
                     return True
-            except:
+            except Exception:
                 pass
 
             ContextLogger.trace(
@@ -204,7 +225,7 @@ class ModelIntegrationController:
                 "model not ready yet - model [%s], request_id [%s]"
                 % (model_id, request_id),
             )
-            sleep(5)
+            await sleep(5)
 
             if time() - start_time >= timeout:
                 ContextLogger.warn(
@@ -214,7 +235,7 @@ class ModelIntegrationController:
                 )
                 return False
 
-    def submit_job(
+    async def submit_job(
         self,
         model_id: str,
         request_id: str,
@@ -227,7 +248,7 @@ class ModelIntegrationController:
             "Submitting job using host = [%s]..." % host,
         )
 
-        if wait_for_readiness and not self.wait_for_model_readiness(
+        if wait_for_readiness and not await self.wait_for_model_readiness(
             model_id, request_id, host
         ):
             error_str = "model failed readiness - model [%s], request_id [%s]" % (
@@ -238,7 +259,7 @@ class ModelIntegrationController:
 
             raise Exception(error_str)
 
-        _host, _port = self._proxied_host_and_port(
+        _host, _port = await self._proxied_host_and_port(
             model_id, request_id, host, self._model_port
         )
 
@@ -254,7 +275,7 @@ class ModelIntegrationController:
                 % (_url, _json, _params),
             )
 
-            response = post(
+            response = await self._post(
                 url=_url,
                 json=_json,
                 params=_params,
@@ -268,7 +289,7 @@ class ModelIntegrationController:
             )
 
             return JobSubmissionResponse.from_object(response.json())
-        except:
+        except Exception:
             error_str = "Failed to submit job for host = [%s], error = [%s]" % (
                 _host,
                 repr(exc_info()),
@@ -280,7 +301,7 @@ class ModelIntegrationController:
 
             raise Exception(error_str)
 
-    def submit_job_sync(
+    async def submit_job_sync(
         self,
         model_id: str,
         request_id: str,
@@ -293,7 +314,7 @@ class ModelIntegrationController:
             "Submitting SYNC job using host = [%s]..." % host,
         )
 
-        if wait_for_readiness and not self.wait_for_model_readiness(
+        if wait_for_readiness and not await self.wait_for_model_readiness(
             model_id, request_id, host
         ):
             error_str = "model failed readiness - model [%s], request_id [%s]" % (
@@ -304,7 +325,7 @@ class ModelIntegrationController:
 
             raise Exception(error_str)
 
-        _host, _port = self._proxied_host_and_port(
+        _host, _port = await self._proxied_host_and_port(
             model_id, request_id, host, self._model_port
         )
 
@@ -320,7 +341,7 @@ class ModelIntegrationController:
                 % (_url, _json, _params),
             )
 
-            response = post(
+            response = await self._post(
                 url=_url,
                 json=_json,
                 params=_params,
@@ -338,7 +359,7 @@ class ModelIntegrationController:
                 "Job completed",
                 response.json(),
             )
-        except:
+        except Exception:
             error_str = "Failed to submit job for host = [%s], error = [%s]" % (
                 _host,
                 repr(exc_info()),
@@ -354,7 +375,7 @@ class ModelIntegrationController:
                 None,
             )
 
-    def get_job_status(
+    async def get_job_status(
         self, model_id: str, request_id: str, host: str, job_id: str
     ) -> JobStatusResponse:
         ContextLogger.debug(
@@ -362,19 +383,19 @@ class ModelIntegrationController:
             "Getting job status using host = [%s], job_id = [%s]..." % (host, job_id),
         )
 
-        _host, _port = self._proxied_host_and_port(
+        _host, _port = await self._proxied_host_and_port(
             model_id, request_id, host, self._model_port
         )
 
         try:
-            response = get(
+            response = await self._get(
                 url=f"http://{_host}:{_port}/job/status/{job_id}",
                 timeout=self._request_timeout,
             )
             response.raise_for_status()
 
             return JobStatusResponse.from_object(response.json())
-        except:
+        except Exception:
             error_str = (
                 "Failed to retrieve job status for host = [%s], job_id = [%s], error = [%s]"
                 % (_host, job_id, repr(exc_info()))
@@ -387,7 +408,7 @@ class ModelIntegrationController:
 
             raise Exception(error_str)
 
-    def get_job_result(
+    async def get_job_result(
         self, model_id: str, request_id: str, host: str, job_id: str
     ) -> JobResult:
         ContextLogger.debug(
@@ -395,19 +416,19 @@ class ModelIntegrationController:
             "Getting job result using host = [%s], job_id = [%s]..." % (host, job_id),
         )
 
-        _host, _port = self._proxied_host_and_port(
+        _host, _port = await self._proxied_host_and_port(
             model_id, request_id, host, self._model_port
         )
 
         try:
-            response = get(
+            response = await self._get(
                 url=f"http://{_host}:{_port}/job/result/{job_id}",
                 timeout=self._request_timeout,
             )
             response.raise_for_status()
 
             return response.json()
-        except:
+        except Exception:
             error_str = (
                 "Failed to retrieve job result for host = [%s], job_id = [%s], error = [%s]"
                 % (_host, job_id, repr(exc_info()))
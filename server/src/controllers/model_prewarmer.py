@@ -0,0 +1,317 @@
+import traceback
+from datetime import datetime, timedelta
+from sys import exc_info, stdout
+from threading import Event, Lock, Thread
+from typing import Dict, List, Tuple
+
+from config.application_config import ApplicationConfig
+from controllers.model import ModelController
+from controllers.model_instance_handler import ModelInstanceController
+from controllers.server import ServerController
+from db.daos.work_request_stats import (
+    WorkRequestArrivalCountRecord,
+    WorkRequestStatsDAO,
+    WorkRequestStatsQuery,
+)
+from objects.instance import ModelPrewarmStats
+from python_framework.config_utils import load_environment_variable
+from python_framework.graceful_killer import GracefulKiller, KillInstance
+from python_framework.logger import ContextLogger, LogLevel
+from python_framework.time import datetime_delta, string_from_date, utc_now_datetime
+
+###
+# The ModelPrewarmer keeps warm pods for the models that are likely to be requested soon.
+#
+# Arrival rates are learned per model, by weekday + hour of day (UTC), from the WorkRequest history.
+#   The models with the highest expected arrivals in the upcoming hour get a prewarmed instance
+#   (see ModelInstanceController.provision_instance), within MODEL_PREWARM_BUDGET pods for the cluster.
+#   The budget is split between the healthy servers (ordered by ServerId), every server prewarms its own, disjoint
+#   slice of the predicted models (see _server_share).
+#
+# A prewarmed instance is assigned to the first WorkRequest of its model claimed by this server,
+#   which counts as a hit. WorkRequests that need a new pod count as cold starts.
+###
+
+ArrivalSlot = Tuple[int, int]  # (ISO weekday, hour)
+
+
+class ModelPrewarmerKillInstance(KillInstance):
+    def kill(self):
+        ModelPrewarmer.instance().kill()
+
+
+class ModelPrewarmer(Thread):
+    PREWARM_WORK_REQUEST_ID = "prewarm"
+    DEFAULT_BUDGET = 0
+    DEFAULT_HISTORY_DAYS = 28
+    DEFAULT_LOOKAHEAD = 900
+    DEFAULT_MIN_ARRIVAL_RATE = 1
+    DEFAULT_CHECK_INTERVAL = 60
+    DEFAULT_REFRESH_INTERVAL = 3600
+    DEFAULT_INSTANCE_TTL = 1800
+
+    _instance: "ModelPrewarmer" = None
+
+    _logger_key: str = None
+    _kill_event: Event
+
+    # expected WorkRequests per hour, per model + slot
+    _arrival_rates: Dict[str, Dict[ArrivalSlot, float]]
+    _last_refresh: float | None
+    _predicted_model_ids: List[str]
+    _hits: Dict[str, int]
+    _cold_starts: Dict[str, int]
+    _lock: Lock
+
+    budget: int  # max prewarmed pods for the cluster, 0 = disabled
+    history_days: int
+    lookahead: int  # in seconds
+    min_arrival_rate: float
+    check_interval: float
+    refresh_interval: float
+    instance_ttl: int  # in seconds, unassigned prewarmed instances are terminated after
+
+    def __init__(self):
+        Thread.__init__(self)
+
+        self._logger_key = "ModelPrewarmer"
+        self._kill_event = Event()
+
+        self._arrival_rates = {}
+        self._last_refresh = None
+        self._predicted_model_ids = []
+        self._hits = {}
+        self._cold_starts = {}
+        self._lock = Lock()
+
+        self.budget = int(
+            load_environment_variable(
+                "MODEL_PREWARM_BUDGET", default=ModelPrewarmer.DEFAULT_BUDGET
+            )
+        )
+        self.history_days = int(
+            load_environment_variable(
+                "MODEL_PREWARM_HISTORY_DAYS",
+                default=ModelPrewarmer.DEFAULT_HISTORY_DAYS,
+            )
+        )
+        self.lookahead = int(
+            load_environment_variable(
+                "MODEL_PREWARM_LOOKAHEAD", default=ModelPrewarmer.DEFAULT_LOOKAHEAD
+            )
+        )
+        self.min_arrival_rate = float(
+            load_environment_variable(
+                "MODEL_PREWARM_MIN_ARRIVAL_RATE",
+                default=ModelPrewarmer.DEFAULT_MIN_ARRIVAL_RATE,
+            )
+        )
+        self.check_interval = float(
+            load_environment_variable(
+                "MODEL_PREWARM_CHECK_INTERVAL",
+                default=ModelPrewarmer.DEFAULT_CHECK_INTERVAL,
+            )
+        )
+        self.refresh_interval = float(
+            load_environment_variable(
+                "MODEL_PREWARM_REFRESH_INTERVAL",
+                default=ModelPrewarmer.DEFAULT_REFRESH_INTERVAL,
+            )
+        )
+        self.instance_ttl = int(
+            load_environment_variable(
+                "MODEL_PREWARM_INSTANCE_TTL",
+                default=ModelPrewarmer.DEFAULT_INSTANCE_TTL,
+            )
+        )
+
+        ContextLogger.instance().create_logger_for_context(
+            self._logger_key,
+            LogLevel.from_string(
+                load_environment_variable(
+                    f"LOG_LEVEL_{self._logger_key}", default=LogLevel.INFO.name
+                )
+            ),
+        )
+
+    @staticmethod
+    def initialize() -> "ModelPrewarmer":
+        if ModelPrewarmer._instance is not None:
+            return ModelPrewarmer._instance
+
+        ModelPrewarmer._instance = ModelPrewarmer()
+        GracefulKiller.instance().register_kill_instance(ModelPrewarmerKillInstance())
+
+        return ModelPrewarmer._instance
+
+    @staticmethod
+    def instance() -> "ModelPrewarmer":
+        return ModelPrewarmer._instance
+
+    def _wait_or_kill(self, timeout: float) -> bool:
+        return self._kill_event.wait(timeout)
+
+    def kill(self):
+        self._kill_event.set()
+
+    def record_hit(self, model_id: str):
+        with self._lock:
+            self._hits[model_id] = self._hits.get(model_id, 0) + 1
+
+    def record_cold_start(self, model_id: str):
+        with self._lock:
+            self._cold_starts[model_id] = self._cold_starts.get(model_id, 0) + 1
+
+    def stats(self) -> ModelPrewarmStats:
+        with self._lock:
+            hits = dict(self._hits)
+            cold_starts = dict(self._cold_starts)
+            predicted_model_ids = list(self._predicted_model_ids)
+
+        prewarmed_model_ids = list(
+            map(lambda h: h.model_id, self._prewarmed_instances())
+        )
+
+        return ModelPrewarmStats(
+            self.budget,
+            predicted_model_ids,
+            prewarmed_model_ids,
+            hits,
+            cold_starts,
+        )
+
+    def _load_arrival_rates(self) -> Dict[str, Dict[ArrivalSlot, float]]:
+        request_date_from = string_from_date(
+            datetime_delta(utc_now_datetime(), f"-{self.history_days}d")
+        )
+        records: List[WorkRequestArrivalCountRecord] = WorkRequestStatsDAO.execute_query(
+            WorkRequestStatsQuery.ARRIVAL_COUNTS,
+            ApplicationConfig.instance().database_config,
+            query_kwargs={"request_date_from": request_date_from},
+        )
+        # every slot occurs once a week
+        weeks = max(1, self.history_days / 7)
+        arrival_rates: Dict[str, Dict[ArrivalSlot, float]] = {}
+
+        for record in [] if records is None else records:
+            if record.model_id not in arrival_rates:
+                arrival_rates[record.model_id] = {}
+
+            arrival_rates[record.model_id][(record.weekday, record.hour)] = (
+                record.request_count / weeks
+            )
+
+        return arrival_rates
+
+    # models ordered by expected arrivals in the upcoming slot, at least min_arrival_rate
+    def _predict_model_ids(self) -> List[str]:
+        upcoming = utc_now_datetime() + timedelta(seconds=self.lookahead)
+        slot: ArrivalSlot = (upcoming.isoweekday(), upcoming.hour)
+        expected_arrivals: List[Tuple[str, float]] = []
+
+        for model_id, rates in self._arrival_rates.items():
+            rate = rates.get(slot, 0)
+
+            if rate < self.min_arrival_rate:
+                continue
+
+            model = ModelController.instance().get_model(model_id)
+
+            if model is None or not model.enabled:
+                continue
+
+            expected_arrivals.append((model_id, rate))
+
+        expected_arrivals.sort(key=lambda x: x[1], reverse=True)
+
+        return list(map(lambda x: x[0], expected_arrivals))
+
+    # NOTE: the budget is for the cluster, every server prewarms its share, the remainder goes to the first servers
+    #   returns (offset, count) of this server's slice of the predicted models
+    def _server_share(self) -> Tuple[int, int]:
+        server_ids = ServerController.instance().load_healthy_server_ids()
+        server_index = server_ids.index(ServerController.instance().server_id)
+        share, remainder = divmod(self.budget, len(server_ids))
+
+        return (
+            server_index * share + min(server_index, remainder),
+            share + (1 if server_index < remainder else 0),
+        )
+
+    def _prewarmed_instances(self):
+        return list(
+            filter(
+                lambda h: h.prewarmed and h.is_provisioned() and h.is_active(),
+                ModelInstanceController.instance().handlers(),
+            )
+        )
+
+    def _prewarm(self):
+        predicted_model_ids = self._predict_model_ids()
+        offset, count = self._server_share()
+        target_model_ids = predicted_model_ids[offset : offset + count]
+
+        with self._lock:
+            self._predicted_model_ids = predicted_model_ids
+
+        for handler in self._prewarmed_instances():
+            if handler.model_id in target_model_ids:
+                continue
+
+            ModelInstanceController.instance().release_provisioned_instance(
+                handler.model_id, ModelPrewarmer.PREWARM_WORK_REQUEST_ID
+            )
+
+        for model_id in target_model_ids:
+            if (
+                ModelInstanceController.instance().get_instance(
+                    model_id, ModelPrewarmer.PREWARM_WORK_REQUEST_ID
+                )
+                is not None
+            ):
+                continue
+
+            # NOTE: skipped without free capacity, or if the model has an idle instance already
+            ModelInstanceController.instance().provision_instance(
+                model_id,
+                ModelPrewarmer.PREWARM_WORK_REQUEST_ID,
+                provision_timeout=self.instance_ttl,
+                prewarmed=True,
+            )
+
+    def run(self):
+        if self.budget <= 0:
+            ContextLogger.info(self._logger_key, "Prewarming disabled")
+
+            return
+
+        ContextLogger.info(self._logger_key, "Controller started")
+
+        while True:
+            try:
+                now = datetime.now().timestamp()
+
+                if (
+                    self._last_refresh is None
+                    or now - self._last_refresh >= self.refresh_interval
+                ):
+                    self._arrival_rates = self._load_arrival_rates()
+                    self._last_refresh = now
+
+                    ContextLogger.debug(
+                        self._logger_key,
+                        "Loaded arrival rates for [%d] models" % len(self._arrival_rates),
+                    )
+
+                self._prewarm()
+            except:
+                ContextLogger.error(
+                    self._logger_key,
+                    "Failed to prewarm models, error = [%s]" % repr(exc_info()),
+                )
+                traceback.print_exc(file=stdout)
+
+            if self._wait_or_kill(self.check_interval):
+                break
+
+        ContextLogger.info(self._logger_key, "Controller stopped")
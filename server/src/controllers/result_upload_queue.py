@@ -0,0 +1,361 @@
+import traceback
+from datetime import datetime
+from json import dumps
+from queue import Empty, Full, Queue
+from sys import exc_info, stdout
+from threading import Event, Lock, Thread
+from typing import List
+
+from controllers.s3_integration import S3IntegrationController
+from controllers.work_request_controller_stub import WorkRequestControllerStub
+from objects.model_integration import JobResult
+from objects.s3_integration import S3ResultObject
+from objects.work_request import WorkRequest, WorkRequestStatus
+from python_framework.config_utils import load_environment_variable
+from python_framework.graceful_killer import GracefulKiller, KillInstance
+from python_framework.logger import ContextLogger, LogLevel
+from python_framework.time import utc_now
+
+###
+# The ResultUploadQueue uploads WorkRequest results to S3 in the background, so the
+#   WorkRequestWorkers never block on S3.
+#
+# WorkRequests are UPLOADING while their result is queued. Once uploaded they are COMPLETED,
+#   if all attempts (exponential backoff) failed they are FAILED.
+#
+# NOTE: the queue is in-memory, UPLOADING WorkRequests that are not pending in the queue
+#       (e.g. after a restart) are requeued by the WorkRequestWorker / FailedServerHandler.
+###
+
+
+class ResultUpload:
+    work_request: WorkRequest
+    result: JobResult
+    work_request_controller: WorkRequestControllerStub
+    attempt_count: int
+    next_attempt_time: float
+    # uploaded to S3, only the WorkRequest status update is pending
+    uploaded: bool
+
+    def __init__(
+        self,
+        work_request: WorkRequest,
+        result: JobResult,
+        work_request_controller: WorkRequestControllerStub,
+    ):
+        self.work_request = work_request
+        self.result = result
+        self.work_request_controller = work_request_controller
+        self.attempt_count = 0
+        self.next_attempt_time = 0
+        self.uploaded = False
+
+
+class ResultUploadQueueKillInstance(KillInstance):
+    def kill(self):
+        ResultUploadQueue.instance().kill()
+
+
+class ResultUploadQueue(Thread):
+    DEFAULT_QUEUE_SIZE = 100
+    DEFAULT_CONCURRENCY = 4
+    DEFAULT_MAX_ATTEMPTS = 8
+    DEFAULT_BACKOFF = 2
+    DEFAULT_MAX_BACKOFF = 300
+    RETRY_CHECK_WAIT_TIME = 1
+
+    _instance: "ResultUploadQueue" = None
+
+    _logger_key: str = None
+    _kill_event: Event
+
+    _queue: Queue[ResultUpload]
+    _uploaders: List[Thread]
+    # failed uploads, waiting for their next attempt
+    _retries: List[ResultUpload]
+    # ids of all queued, in-progress and retrying uploads
+    _pending_ids: set[int]
+    _lock: Lock
+
+    concurrency: int
+    max_attempts: int
+    backoff: float
+    max_backoff: float
+
+    def __init__(self):
+        Thread.__init__(self)
+
+        self._logger_key = "ResultUploadQueue"
+        self._kill_event = Event()
+
+        self._queue = Queue(
+            maxsize=int(
+                load_environment_variable(
+                    "RESULT_UPLOAD_QUEUE_SIZE",
+                    default=ResultUploadQueue.DEFAULT_QUEUE_SIZE,
+                )
+            )
+        )
+        self._uploaders = []
+        self._retries = []
+        self._pending_ids = set()
+        self._lock = Lock()
+
+        self.concurrency = int(
+            load_environment_variable(
+                "RESULT_UPLOAD_CONCURRENCY",
+                default=ResultUploadQueue.DEFAULT_CONCURRENCY,
+            )
+        )
+        self.max_attempts = int(
+            load_environment_variable(
+                "RESULT_UPLOAD_MAX_ATTEMPTS",
+                default=ResultUploadQueue.DEFAULT_MAX_ATTEMPTS,
+            )
+        )
+        self.backoff = float(
+            load_environment_variable(
+                "RESULT_UPLOAD_BACKOFF", default=ResultUploadQueue.DEFAULT_BACKOFF
+            )
+        )
+        self.max_backoff = float(
+            load_environment_variable(
+                "RESULT_UPLOAD_MAX_BACKOFF",
+                default=ResultUploadQueue.DEFAULT_MAX_BACKOFF,
+            )
+        )
+
+        ContextLogger.instance().create_logger_for_context(
+            self._logger_key,
+            LogLevel.from_string(
+                load_environment_variable(
+                    f"LOG_LEVEL_{self._logger_key}", default=LogLevel.INFO.name
+                )
+            ),
+        )
+
+    @staticmethod
+    def initialize() -> "ResultUploadQueue":
+        if ResultUploadQueue._instance is not None:
+            return ResultUploadQueue._instance
+
+        ResultUploadQueue._instance = ResultUploadQueue()
+        GracefulKiller.instance().register_kill_instance(
+            ResultUploadQueueKillInstance()
+        )
+
+        return ResultUploadQueue._instance
+
+    @staticmethod
+    def instance() -> "ResultUploadQueue":
+        return ResultUploadQueue._instance
+
+    def _wait_or_kill(self, timeout: float) -> bool:
+        return self._kill_event.wait(timeout)
+
+    def kill(self):
+        self._kill_event.set()
+
+    def is_pending(self, work_request_id: int) -> bool:
+        with self._lock:
+            return work_request_id in self._pending_ids
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending_ids)
+
+    # returns False if the queue is full, the caller never waits
+    # NOTE: the rejected (UPLOADING) WorkRequest is requeued once orphaned, see WorkRequestWorker
+    def submit(
+        self,
+        work_request: WorkRequest,
+        result: JobResult,
+        work_request_controller: WorkRequestControllerStub,
+    ) -> bool:
+        with self._lock:
+            if work_request.id in self._pending_ids:
+                return True
+
+            self._pending_ids.add(work_request.id)
+
+        try:
+            self._queue.put_nowait(
+                ResultUpload(work_request, result, work_request_controller)
+            )
+
+            return True
+        except Full:
+            ContextLogger.warn(
+                self._logger_key,
+                "Upload queue full, rejecting result of WorkRequest [%d]"
+                % work_request.id,
+            )
+
+            with self._lock:
+                self._pending_ids.discard(work_request.id)
+
+        return False
+
+    def _upload(self, upload: ResultUpload) -> bool:
+        return S3IntegrationController.instance().upload_result(
+            S3ResultObject(
+                model_id=upload.work_request.model_id,
+                request_id=str(upload.work_request.id),
+                result=dumps(upload.result),
+            )
+        )
+
+    def _complete(
+        self, upload: ResultUpload, status: WorkRequestStatus, reason: str | None
+    ) -> bool:
+        work_request = upload.work_request
+        work_request.request_status = status
+        work_request.request_status_reason = reason
+        work_request.processed_timestamp = utc_now()
+
+        try:
+            if (
+                upload.work_request_controller.update_request(
+                    work_request, retry_count=1
+                )
+                is None
+            ):
+                raise Exception("Failed to update WorkRequest [%d]" % work_request.id)
+
+            return True
+        except:
+            ContextLogger.error(
+                self._logger_key,
+                "Failed to set WorkRequest [%d] to [%s], error = [%s]"
+                % (work_request.id, str(status), repr(exc_info())),
+            )
+
+        return False
+
+    def _discard(self, upload: ResultUpload):
+        with self._lock:
+            self._pending_ids.discard(upload.work_request.id)
+
+    def _handle_upload(self, upload: ResultUpload):
+        upload.attempt_count += 1
+
+        # NOTE: once uploaded, only the status update is retried, the result is not uploaded (or recomputed) again
+        if not upload.uploaded:
+            upload.uploaded = self._upload(upload)
+
+        if upload.uploaded:
+            if self._complete(upload, WorkRequestStatus.COMPLETED, None):
+                self._discard(upload)
+
+                return
+        elif upload.attempt_count >= self.max_attempts:
+            ContextLogger.error(
+                self._logger_key,
+                "Failed to upload result of WorkRequest [%d] after [%d] attempts"
+                % (upload.work_request.id, upload.attempt_count),
+            )
+            # NOTE: if this update fails too, the WorkRequest is requeued once orphaned
+            self._complete(
+                upload, WorkRequestStatus.FAILED, "Failed to upload result to S3"
+            )
+            self._discard(upload)
+
+            return
+
+        if upload.attempt_count >= self.max_attempts:
+            ContextLogger.error(
+                self._logger_key,
+                "Failed to complete uploaded WorkRequest [%d] after [%d] attempts"
+                % (upload.work_request.id, upload.attempt_count),
+            )
+            self._discard(upload)
+
+            return
+
+        backoff = min(
+            self.max_backoff, self.backoff * (2 ** (upload.attempt_count - 1))
+        )
+        upload.next_attempt_time = datetime.now().timestamp() + backoff
+
+        ContextLogger.warn(
+            self._logger_key,
+            "Failed to %s WorkRequest [%d], retrying in [%.0f]s"
+            % (
+                "complete uploaded" if upload.uploaded else "upload result of",
+                upload.work_request.id,
+                backoff,
+            ),
+        )
+
+        with self._lock:
+            self._retries.append(upload)
+
+    def _run_uploader(self):
+        while not self._kill_event.is_set():
+            try:
+                upload = self._queue.get(timeout=ResultUploadQueue.RETRY_CHECK_WAIT_TIME)
+            except Empty:
+                continue
+
+            try:
+                self._handle_upload(upload)
+            except:
+                ContextLogger.error(
+                    self._logger_key,
+                    "Failed to handle upload of WorkRequest [%d], error = [%s]"
+                    % (upload.work_request.id, repr(exc_info())),
+                )
+                traceback.print_exc(file=stdout)
+
+                with self._lock:
+                    self._pending_ids.discard(upload.work_request.id)
+
+    def _requeue_due_retries(self):
+        now = datetime.now().timestamp()
+
+        with self._lock:
+            due_retries = list(filter(lambda u: u.next_attempt_time <= now, self._retries))
+
+            for upload in due_retries:
+                try:
+                    self._queue.put_nowait(upload)
+                except Full:
+                    # NOTE: retried on the next check
+                    break
+
+                self._retries.remove(upload)
+
+    def run(self):
+        ContextLogger.info(self._logger_key, "Controller started")
+
+        for index in range(self.concurrency):
+            uploader = Thread(
+                target=self._run_uploader, name=f"ResultUploader-{index}"
+            )
+            uploader.start()
+            self._uploaders.append(uploader)
+
+        while True:
+            if self._wait_or_kill(ResultUploadQueue.RETRY_CHECK_WAIT_TIME):
+                break
+
+            try:
+                self._requeue_due_retries()
+            except:
+                ContextLogger.error(
+                    self._logger_key,
+                    "Failed to requeue upload retries, error = [%s]" % repr(exc_info()),
+                )
+                traceback.print_exc(file=stdout)
+
+        for uploader in self._uploaders:
+            uploader.join()
+
+        if self.pending_count() > 0:
+            ContextLogger.warn(
+                self._logger_key,
+                "Stopped with [%d] pending uploads, their WorkRequests will be requeued"
+                % self.pending_count(),
+            )
+
+        ContextLogger.info(self._logger_key, "Controller stopped")
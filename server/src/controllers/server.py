@@ -172,6 +172,39 @@ class ServerController(Thread):
 
             return []
 
+    # sorted, includes this server
+    def load_healthy_server_ids(self) -> List[str]:
+        try:
+            servers: List[ServerRecord] = ServerDAO.execute_select_all(
+                ApplicationConfig.instance().database_config,
+            )
+            unhealthy_server_ids = set(
+                map(lambda s: s.server_id, self.load_unhealthy_servers())
+            )
+            server_ids = set(
+                map(
+                    lambda s: s.server_id,
+                    filter(
+                        lambda s: s.server_id not in unhealthy_server_ids, servers
+                    ),
+                )
+            )
+            server_ids.add(self.server_id)
+
+            return sorted(server_ids)
+        except:
+            ContextLogger.error(
+                self._logger_key,
+                "Failed to load healthy servers, error = [%s]" % (repr(exc_info()),),
+            )
+            traceback.print_exc(file=stdout)
+
+            return [self.server_id]
+
+    # NOTE: includes this server
+    def count_healthy_servers(self) -> int:
+        return len(self.load_healthy_server_ids())
+
     def run(self):
         ContextLogger.info(self._logger_key, "controller started")
 
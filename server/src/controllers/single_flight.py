@@ -0,0 +1,287 @@
+from datetime import datetime
+from enum import Enum
+from hashlib import md5
+from threading import Lock
+from typing import Any, Dict, List, Set, Tuple
+
+from python_framework.config_utils import load_environment_variable
+from python_framework.logger import ContextLogger, LogLevel
+
+###
+# The SingleFlightRegistry tracks the (model_id, input) pairs currently being computed by a job.
+#
+# A WorkRequest whose inputs are already in-flight for another WorkRequest (the owner) subscribes
+#   to them instead of submitting them again. Once the owner's job completed, its results are handed
+#   to the subscribers. If the owner fails (or is requeued), the subscribers are marked as FAILED and
+#   are expected to be requeued.
+#
+# NOTE: the registry is in-memory, so inputs are only shared between WorkRequests of the same server.
+###
+
+InFlightKey = Tuple[str, str]  # (model_id, input hash)
+
+
+class SingleFlightState(Enum):
+    PENDING = "PENDING"
+    READY = "READY"
+    FAILED = "FAILED"
+
+
+class InFlightInput:
+    owner_id: int
+    start_time: float
+    subscriber_ids: Set[int]
+
+    def __init__(self, owner_id: int):
+        self.owner_id = owner_id
+        self.start_time = datetime.now().timestamp()
+        self.subscriber_ids = set()
+
+
+class SingleFlightSubscription:
+    pending_keys: Set[InFlightKey]
+    inputs: List[str]
+    results: List[Any]
+    failed: bool
+    # False if the subscriber also submitted a job for its other inputs
+    shares_all_inputs: bool
+
+    def __init__(self):
+        self.pending_keys = set()
+        self.inputs = []
+        self.results = []
+        self.failed = False
+        self.shares_all_inputs = False
+
+
+class SingleFlightRegistry:
+    _instance: "SingleFlightRegistry" = None
+
+    _logger_key: str = None
+
+    _lock: Lock
+    _in_flight: Dict[InFlightKey, InFlightInput]
+    _owned_keys: Dict[int, Set[InFlightKey]]
+    _subscriptions: Dict[int, SingleFlightSubscription]
+
+    enabled: bool
+    ttl: float  # in-flight inputs older than this are considered failed
+
+    def __init__(self) -> None:
+        self._logger_key = "SingleFlightRegistry"
+
+        self._lock = Lock()
+        self._in_flight = {}
+        self._owned_keys = {}
+        self._subscriptions = {}
+
+        self.enabled = (
+            load_environment_variable("SINGLE_FLIGHT_ENABLED", default="TRUE").upper()
+            == "TRUE"
+        )
+        self.ttl = float(load_environment_variable("SINGLE_FLIGHT_TTL", default="3600"))
+
+        ContextLogger.instance().create_logger_for_context(
+            self._logger_key,
+            LogLevel.from_string(
+                load_environment_variable(
+                    f"LOG_LEVEL_{self._logger_key}", default=LogLevel.INFO.name
+                )
+            ),
+        )
+
+    @staticmethod
+    def initialize() -> "SingleFlightRegistry":
+        if SingleFlightRegistry._instance is not None:
+            return SingleFlightRegistry._instance
+
+        SingleFlightRegistry._instance = SingleFlightRegistry()
+
+        return SingleFlightRegistry._instance
+
+    @staticmethod
+    def instance() -> "SingleFlightRegistry":
+        return SingleFlightRegistry._instance
+
+    @staticmethod
+    def _key(model_id: str, input: str) -> InFlightKey:
+        return (model_id, md5(input.encode()).hexdigest())
+
+    # returns (inputs to submit, inputs shared with other WorkRequests)
+    def acquire(
+        self, model_id: str, work_request_id: int, inputs: List[str]
+    ) -> Tuple[List[str], List[str]]:
+        if not self.enabled:
+            return inputs, []
+
+        owned_inputs: List[str] = []
+        shared_inputs: List[str] = []
+        now = datetime.now().timestamp()
+
+        with self._lock:
+            for input in inputs:
+                key = SingleFlightRegistry._key(model_id, input)
+                in_flight_input = self._in_flight.get(key)
+
+                if (
+                    in_flight_input is not None
+                    and in_flight_input.owner_id != work_request_id
+                    and now - in_flight_input.start_time < self.ttl
+                ):
+                    in_flight_input.subscriber_ids.add(work_request_id)
+
+                    if work_request_id not in self._subscriptions:
+                        self._subscriptions[work_request_id] = (
+                            SingleFlightSubscription()
+                        )
+
+                    self._subscriptions[work_request_id].pending_keys.add(key)
+                    shared_inputs.append(input)
+
+                    continue
+
+                if in_flight_input is None:
+                    self._in_flight[key] = InFlightInput(work_request_id)
+
+                    if work_request_id not in self._owned_keys:
+                        self._owned_keys[work_request_id] = set()
+
+                    self._owned_keys[work_request_id].add(key)
+
+                owned_inputs.append(input)
+
+            if len(shared_inputs) > 0:
+                self._subscriptions[work_request_id].shares_all_inputs = (
+                    len(owned_inputs) == 0
+                )
+
+        if len(shared_inputs) > 0:
+            ContextLogger.debug(
+                self._logger_key,
+                "WorkRequest [%d] shares [%d] in-flight inputs"
+                % (work_request_id, len(shared_inputs)),
+            )
+
+        return owned_inputs, shared_inputs
+
+    # hands the owner's results to the subscribers, and releases the owner's in-flight inputs
+    def complete(
+        self,
+        model_id: str,
+        work_request_id: int,
+        inputs: List[str],
+        results: List[Any],
+    ):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            owned_keys = self._owned_keys.get(work_request_id, set())
+
+            for input, result in zip(inputs, results):
+                key = SingleFlightRegistry._key(model_id, input)
+
+                if key not in owned_keys:
+                    continue
+
+                owned_keys.discard(key)
+                in_flight_input = self._in_flight.pop(key, None)
+
+                if in_flight_input is None:
+                    continue
+
+                for subscriber_id in in_flight_input.subscriber_ids:
+                    subscription = self._subscriptions.get(subscriber_id)
+
+                    if subscription is None or key not in subscription.pending_keys:
+                        continue
+
+                    subscription.pending_keys.discard(key)
+                    subscription.inputs.append(input)
+                    subscription.results.append(result)
+
+            self._release(work_request_id)
+
+    def _release(self, work_request_id: int):
+        for key in self._owned_keys.pop(work_request_id, set()):
+            in_flight_input = self._in_flight.pop(key, None)
+
+            if in_flight_input is None:
+                continue
+
+            for subscriber_id in in_flight_input.subscriber_ids:
+                if subscriber_id in self._subscriptions:
+                    self._subscriptions[subscriber_id].failed = True
+
+        subscription = self._subscriptions.pop(work_request_id, None)
+
+        if subscription is None:
+            return
+
+        for key in subscription.pending_keys:
+            if key in self._in_flight:
+                self._in_flight[key].subscriber_ids.discard(work_request_id)
+
+    # releases the WorkRequest's in-flight inputs (failing their subscribers) and its own subscription
+    def release(self, work_request_id: int):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._release(work_request_id)
+
+    def shares_all_inputs(self, work_request_id: int) -> bool:
+        with self._lock:
+            subscription = self._subscriptions.get(work_request_id)
+
+            return subscription is not None and subscription.shares_all_inputs
+
+    # None if the WorkRequest does not share any in-flight inputs
+    def state(self, work_request_id: int) -> SingleFlightState | None:
+        with self._lock:
+            subscription = self._subscriptions.get(work_request_id)
+
+            if subscription is None:
+                return None
+
+            if subscription.failed:
+                return SingleFlightState.FAILED
+
+            if len(subscription.pending_keys) > 0:
+                return SingleFlightState.PENDING
+
+            return SingleFlightState.READY
+
+    # returns (shared inputs, results) of a READY subscription and removes it
+    def collect(self, work_request_id: int) -> Tuple[List[str], List[Any]]:
+        with self._lock:
+            subscription = self._subscriptions.get(work_request_id)
+
+            if (
+                subscription is None
+                or subscription.failed
+                or len(subscription.pending_keys) > 0
+            ):
+                return [], []
+
+            self._subscriptions.pop(work_request_id)
+
+            return subscription.inputs, subscription.results
+
+    # releases the owners of expired in-flight inputs
+    def expire(self):
+        now = datetime.now().timestamp()
+
+        with self._lock:
+            expired_owner_ids = set(
+                in_flight_input.owner_id
+                for in_flight_input in self._in_flight.values()
+                if now - in_flight_input.start_time >= self.ttl
+            )
+
+            for owner_id in expired_owner_ids:
+                ContextLogger.warn(
+                    self._logger_key,
+                    "In-flight inputs of WorkRequest [%d] expired" % owner_id,
+                )
+                self._release(owner_id)
@@ -4,6 +4,8 @@ from uuid import uuid4
 
 import library.auth_utils as AuthUtils
 from config.application_config import ApplicationConfig
+from controllers.model_input_cache import ModelInputCache
+from controllers.model_input_cache_writer import ModelInputCacheWriter
 from controllers.s3_integration import S3IntegrationController
 from controllers.slack_integration import SlackIntegration
 from db.daos.model_input_cache import ModelInputCacheDAO
@@ -102,11 +104,15 @@ class UserAdminController:
 
     def clear_user_contributions(self, user_id: str) -> int:
         try:
+            ModelInputCacheWriter.instance().flush()
+
             results: list[CountRecord] = ModelInputCacheDAO.execute_delete(
                 ApplicationConfig.instance().database_config,
                 user_id=user_id,
             )
 
+            ModelInputCache.instance().clear_memory_cache()
+
             if len(results) == 0 or results[0].count == 0:
                 ContextLogger.debug(self._logger_key, "No records found to delete")
 
@@ -1,29 +1,39 @@
 import traceback
+from json import loads
+from math import ceil
 from random import shuffle
 from sys import exc_info, stdout
 from threading import Event, Thread
 from time import sleep
-from typing import Any, List, Union
+from typing import Any, Dict, List, Union
 
 from config.application_config import ApplicationConfig
 from controllers.model import ModelController
+from controllers.model_instance_handler import ModelInstanceController
 from controllers.s3_integration import S3IntegrationController
 from controllers.server import ServerController
+from controllers.work_request_notifier import WorkRequestEvent, WorkRequestNotifier
 from controllers.work_request_worker import WorkRequestWorker
 from db.daos.shared_record import MapRecord
-from db.daos.work_request import WorkRequestDAO, WorkRequestQuery, WorkRequestRecord
+from db.daos.work_request import (
+    WorkRequestDAO,
+    WorkRequestQuery,
+    WorkRequestQueuePolicy,
+    WorkRequestRecord,
+)
 from db.daos.work_request_stats import (
     WorkRequestStatsDAO,
     WorkRequestStatsQuery,
     WorkRequestStatsRecord,
 )
 from library.process_lock import ProcessLock
-from objects.work_request import WorkRequest, WorkRequestStatus
+from objects.work_request import WorkRequest, WorkRequestPayload, WorkRequestStatus
 from objects.work_request_stats import (
     WorkRequestStatsFilterData,
     WorkRequestStatsModel,
 )
 from python_framework.config_utils import load_environment_variable
+from python_framework.db.transaction_manager import TransactionManager
 from python_framework.graceful_killer import GracefulKiller, KillInstance
 from python_framework.logger import ContextLogger, LogLevel
 from python_framework.thread_safe_list import ThreadSafeList
@@ -43,10 +53,24 @@ class WorkRequestController(Thread):
     WORKER_LOADBALANCE_WAIT_TIME = 20
     ANON_WORK_REQUEST_AUTO_CLEANUP_WAIT_TIME = 300  # check every 5 minutes
     NUM_WORKERS = 4
+    MAX_WORKERS = 8
 
     max_work_request_input_size: int
     anon_work_request_cleanup_age: int  # age in minutes to keep anon work requests for
     anon_work_request_cleanup_batch_size: int
+    queue_policy: WorkRequestQueuePolicy
+    queue_fair_share_window: int
+    queue_anonymous_weight: float
+    queue_registered_weight: float
+    min_workers: int
+    max_workers: int
+    worker_queue_depth: int  # target QUEUED requests per worker
+    worker_rebalance_factor: float
+    worker_steal_min_queue_depth: int
+    bulk_update_size: int  # max WorkRequests per bulk update statement
+    bulk_insert_size: int  # max WorkRequests per bulk insert statement
+    max_work_request_bulk_size: int  # max WorkRequests per bulk submission
+    eager_provisioning: bool  # start the instance pod on submission, see _provision_instances
 
     _instance: "WorkRequestController" = None
 
@@ -56,6 +80,10 @@ class WorkRequestController(Thread):
     _process_lock: ProcessLock
 
     _workers: ThreadSafeList[WorkRequestWorker]
+    # scaled down workers, still finishing their current iteration
+    _retired_workers: ThreadSafeList[WorkRequestWorker]
+    # QUEUED requests per model, refreshed on every load balance
+    _queue_depth: Dict[str, int]
 
     def __init__(self):
         Thread.__init__(self)
@@ -65,6 +93,8 @@ class WorkRequestController(Thread):
 
         self._process_lock = ProcessLock()
         self._workers = ThreadSafeList()
+        self._retired_workers = ThreadSafeList()
+        self._queue_depth = {}
         self.max_work_request_input_size = int(
             load_environment_variable("MAX_WORK_REQUEST_INPUT_SIZE", default="1000")
         )
@@ -76,6 +106,90 @@ class WorkRequestController(Thread):
                 "ANON_WORK_REQUEST_CLEANUP_BATCH_SIZE", default="1000"
             )
         )
+        # order in which QUEUED requests are claimed by the workers
+        self.queue_policy = WorkRequestQueuePolicy(
+            load_environment_variable(
+                "WORK_REQUEST_QUEUE_POLICY",
+                default=WorkRequestQueuePolicy.FAIR_SHARE.value,
+            ).upper()
+        )
+        self.queue_fair_share_window = int(
+            load_environment_variable(
+                "WORK_REQUEST_QUEUE_FAIR_SHARE_WINDOW", default="1000"
+            )
+        )
+        # priority classes, a higher weight gets a larger share of the instances
+        self.queue_anonymous_weight = float(
+            load_environment_variable("WORK_REQUEST_QUEUE_ANONYMOUS_WEIGHT", default="1")
+        )
+        self.queue_registered_weight = float(
+            load_environment_variable(
+                "WORK_REQUEST_QUEUE_REGISTERED_WEIGHT", default="2"
+            )
+        )
+        self.min_workers = max(
+            1,
+            int(
+                load_environment_variable(
+                    "WORK_REQUEST_WORKERS_MIN",
+                    default=WorkRequestController.NUM_WORKERS,
+                )
+            ),
+        )
+        self.max_workers = max(
+            self.min_workers,
+            int(
+                load_environment_variable(
+                    "WORK_REQUEST_WORKERS_MAX",
+                    default=WorkRequestController.MAX_WORKERS,
+                )
+            ),
+        )
+        self.worker_queue_depth = max(
+            1,
+            int(
+                load_environment_variable(
+                    "WORK_REQUEST_WORKER_QUEUE_DEPTH", default="20"
+                )
+            ),
+        )
+        # models are re-partitioned once the busiest worker exceeds [factor] x the average load
+        self.worker_rebalance_factor = float(
+            load_environment_variable(
+                "WORK_REQUEST_WORKER_REBALANCE_FACTOR", default="1.5"
+            )
+        )
+        # idle workers claim QUEUED requests of other workers' models with at least this depth
+        self.worker_steal_min_queue_depth = int(
+            load_environment_variable(
+                "WORK_REQUEST_WORKER_STEAL_MIN_QUEUE_DEPTH", default="5"
+            )
+        )
+        self.bulk_update_size = max(
+            1,
+            int(
+                load_environment_variable(
+                    "WORK_REQUEST_BULK_UPDATE_SIZE", default="500"
+                )
+            ),
+        )
+        self.bulk_insert_size = max(
+            1,
+            int(
+                load_environment_variable(
+                    "WORK_REQUEST_BULK_INSERT_SIZE", default="500"
+                )
+            ),
+        )
+        self.max_work_request_bulk_size = int(
+            load_environment_variable("MAX_WORK_REQUEST_BULK_SIZE", default="1000")
+        )
+        self.eager_provisioning = (
+            load_environment_variable(
+                "WORK_REQUEST_EAGER_PROVISIONING", default="FALSE"
+            ).upper()
+            == "TRUE"
+        )
 
         ContextLogger.instance().create_logger_for_context(
             self._logger_key,
@@ -109,9 +223,7 @@ class WorkRequestController(Thread):
         self._kill_event.set()
 
     def validate_request(self, work_request: WorkRequest) -> tuple[bool, str | None]:
-        models = ModelController.instance().get_models()
-
-        if not any(map(lambda x: x.id == work_request.model_id, models)):
+        if ModelController.instance().get_model(work_request.model_id) is None:
             return (
                 False,
                 "Invalid request body - No model with id [%s]" % work_request.model_id,
@@ -157,6 +269,9 @@ class WorkRequestController(Thread):
                 "WorkRequest inserted, new id = [%s]" % new_work_request.id,
             )
 
+            WorkRequestNotifier.instance().notify(new_work_request)
+            self._provision_instances([new_work_request])
+
             return new_work_request
         except:
             error_str = "Failed to insert WorkRequest, error = [%s]" % (
@@ -167,6 +282,98 @@ class WorkRequestController(Thread):
 
         return None
 
+    # returns the persisted WorkRequests in the order of work_requests, None if the insert failed
+    def create_requests(
+        self, work_requests: List[WorkRequest]
+    ) -> Union[List[WorkRequest], None]:
+        ContextLogger.debug(
+            self._logger_key, "Inserting [%d] new WorkRequests..." % len(work_requests)
+        )
+
+        new_work_requests: List[WorkRequest] = []
+
+        try:
+            for work_request in work_requests:
+                work_request.request_status = WorkRequestStatus.QUEUED
+                work_request.request_date = utc_now()
+
+            # NOTE: all or nothing, the batches are inserted in a single transaction
+            with TransactionManager(
+                ApplicationConfig.instance().database_config
+            ) as conn:
+                for i in range(0, len(work_requests), self.bulk_insert_size):
+                    batch = work_requests[i : i + self.bulk_insert_size]
+                    results: List[WorkRequestRecord] = WorkRequestDAO.execute_query(
+                        WorkRequestQuery.BULK_INSERT,
+                        connection=conn,
+                        query_kwargs={
+                            "work_requests": list(
+                                map(
+                                    lambda x: x.to_record().generate_insert_query_args(),
+                                    batch,
+                                )
+                            ),
+                        },
+                    )
+
+                    if results is None or len(results) != len(batch):
+                        raise Exception(
+                            "Bulk insert returned [%d] records, expected [%d]"
+                            % (0 if results is None else len(results), len(batch))
+                        )
+
+                    new_work_requests.extend(
+                        map(lambda x: WorkRequest.init_from_record(x), results)
+                    )
+
+            for work_request in new_work_requests:
+                work_request.set_payload_loader(self.load_request_payload)
+
+            WorkRequestNotifier.instance().notify_all(new_work_requests)
+            self._provision_instances(new_work_requests)
+
+            ContextLogger.debug(
+                self._logger_key,
+                "[%d] WorkRequests inserted" % len(new_work_requests),
+            )
+
+            return new_work_requests
+        except:
+            error_str = "Failed to insert [%d] WorkRequests, error = [%s]" % (
+                len(work_requests),
+                repr(exc_info()),
+            )
+            ContextLogger.error(self._logger_key, error_str)
+            traceback.print_exc(file=stdout)
+
+        return None
+
+    # overlaps the pod startup with the queueing of the new WorkRequests,
+    #   the pods are assigned once the WorkRequests are claimed (see ModelInstanceController.provision_instance)
+    def _provision_instances(self, work_requests: List[WorkRequest]):
+        if not self.eager_provisioning:
+            return
+
+        for work_request in work_requests:
+            try:
+                if (
+                    ModelInstanceController.instance().provision_instance(
+                        work_request.model_id, work_request.id
+                    )
+                    is None
+                ):
+                    ContextLogger.debug(
+                        self._logger_key,
+                        "Instance not provisioned for WorkRequest [%d]"
+                        % work_request.id,
+                    )
+            except:
+                ContextLogger.warn(
+                    self._logger_key,
+                    "Failed to provision instance for WorkRequest [%d], error = [%s]"
+                    % (work_request.id, repr(exc_info())),
+                )
+
     def _update_request(
         self, work_request: WorkRequest, expected_server_id: str | None = None
     ) -> Union[WorkRequest, None]:
@@ -191,6 +398,8 @@ class WorkRequestController(Thread):
             "WorkRequest update persisted with id = [%s]" % work_request.id,
         )
 
+        WorkRequestNotifier.instance().notify(new_work_request)
+
         return new_work_request
 
     def update_request(
@@ -266,6 +475,83 @@ class WorkRequestController(Thread):
 
         return None
 
+    # returns the updated WorkRequests in the order of work_requests, None for failed updates
+    def update_requests(
+        self,
+        work_requests: List[WorkRequest],
+        enforce_same_server_id: bool = True,
+        expect_null_server_id: bool = False,
+    ) -> List[Union[WorkRequest, None]]:
+        if len(work_requests) == 0:
+            return []
+
+        expected_server_id = None
+
+        if expect_null_server_id:
+            expected_server_id = "NULL"
+        elif enforce_same_server_id:
+            expected_server_id = ServerController.instance().server_id
+
+        updated_work_requests: Dict[int, WorkRequest] = {}
+
+        for i in range(0, len(work_requests), self.bulk_update_size):
+            batch = work_requests[i : i + self.bulk_update_size]
+
+            ContextLogger.debug(
+                self._logger_key,
+                "Persisting [%d] WorkRequest updates..." % len(batch),
+            )
+
+            try:
+                results: List[WorkRequestRecord] = WorkRequestDAO.execute_query(
+                    WorkRequestQuery.BULK_UPDATE,
+                    ApplicationConfig.instance().database_config,
+                    query_kwargs={
+                        "updates": list(
+                            map(
+                                lambda x: x.to_record().generate_update_query_args(),
+                                batch,
+                            )
+                        ),
+                        "expected_server_id": expected_server_id,
+                    },
+                )
+
+                batch_updated_work_requests = (
+                    []
+                    if results is None
+                    else list(map(lambda x: WorkRequest.init_from_record(x), results))
+                )
+
+                for work_request in batch_updated_work_requests:
+                    work_request.set_payload_loader(self.load_request_payload)
+                    updated_work_requests[work_request.id] = work_request
+
+                WorkRequestNotifier.instance().notify_all(batch_updated_work_requests)
+            except:
+                error_str = "Failed to update [%d] WorkRequests, error = [%s]" % (
+                    len(batch),
+                    repr(exc_info()),
+                )
+                ContextLogger.error(self._logger_key, error_str)
+                traceback.print_exc(file=stdout)
+
+        if len(updated_work_requests) < len(work_requests):
+            ContextLogger.warn(
+                self._logger_key,
+                "Failed to update WorkRequests with ids [%s]"
+                % ", ".join(
+                    map(
+                        lambda x: str(x.id),
+                        filter(
+                            lambda x: x.id not in updated_work_requests, work_requests
+                        ),
+                    )
+                ),
+            )
+
+        return list(map(lambda x: updated_work_requests.get(x.id), work_requests))
+
     def get_requests(
         self,
         id: str = None,
@@ -277,6 +563,7 @@ class WorkRequestController(Thread):
         request_statuses: List[str] = None,
         server_ids: List[str] | None = None,
         limit: int = 200,
+        include_payload: bool = True,
     ) -> List[WorkRequest]:
         try:
             results: List[WorkRequestRecord] = WorkRequestDAO.execute_query(
@@ -292,13 +579,20 @@ class WorkRequestController(Thread):
                     "session_id": session_id,
                     "server_ids": server_ids,
                     "limit": limit,
+                    "include_payload": include_payload,
                 },
             )
 
             if results is None or len(results) == 0:
                 return []
 
-            return list(map(lambda x: WorkRequest.init_from_record(x), results))
+            work_requests = list(map(lambda x: WorkRequest.init_from_record(x), results))
+
+            if not include_payload:
+                for work_request in work_requests:
+                    work_request.set_payload_loader(self.load_request_payload)
+
+            return work_requests
         except:
             error_str = "Failed to load WorkRequests, error = [%s]" % (
                 repr(exc_info()),
@@ -308,85 +602,297 @@ class WorkRequestController(Thread):
 
         return []
 
-    def _initialize_workers(self):
-        # TODO: change this to monitor current workers vs config and update worker models
-        # TODO: check for disabled models (remove if ALL scaled down)
-        # TODO: randomize order of models and round-robin between workers
-        if len(self._workers) == WorkRequestController.NUM_WORKERS:
-            return
+    def load_request_payload(
+        self, work_request_id: int
+    ) -> Union[WorkRequestPayload, None]:
+        ContextLogger.trace(
+            self._logger_key,
+            "Loading payload for WorkRequest [%s]..." % str(work_request_id),
+        )
 
-        models = ModelController.instance().get_models()
-        active_model_ids: List[str] = list(
-            map(lambda m: m.id, filter(lambda fm: fm.enabled, models))
+        try:
+            results: List[MapRecord] = WorkRequestDAO.execute_query(
+                WorkRequestQuery.SELECT_PAYLOAD,
+                ApplicationConfig.instance().database_config,
+                query_kwargs={"id": work_request_id},
+            )
+
+            if (
+                results is None
+                or len(results) == 0
+                or results[0].result["requestpayload"] is None
+            ):
+                raise Exception("WorkRequestData not found")
+
+            return WorkRequestPayload.from_object(
+                loads(results[0].result["requestpayload"])
+            )
+        except:
+            error_str = "Failed to load payload for WorkRequest [%s], error = [%s]" % (
+                str(work_request_id),
+                repr(exc_info()),
+            )
+            ContextLogger.error(self._logger_key, error_str)
+            traceback.print_exc(file=stdout)
+
+        return None
+
+    def claim_requests(self, model_ids: List[str], limit: int) -> List[WorkRequest]:
+        if model_ids is None or len(model_ids) == 0 or limit <= 0:
+            return []
+
+        try:
+            results: List[WorkRequestRecord] = WorkRequestDAO.execute_query(
+                WorkRequestQuery.CLAIM_QUEUED,
+                ApplicationConfig.instance().database_config,
+                query_kwargs={
+                    "model_ids": model_ids,
+                    "server_id": ServerController.instance().server_id,
+                    "limit": limit,
+                    "queue_policy": self.queue_policy,
+                    "fair_share_window": self.queue_fair_share_window,
+                    "anonymous_weight": self.queue_anonymous_weight,
+                    "registered_weight": self.queue_registered_weight,
+                },
+            )
+
+            if results is None or len(results) == 0:
+                return []
+
+            claimed_requests = list(
+                map(lambda x: WorkRequest.init_from_record(x), results)
+            )
+
+            ContextLogger.debug(
+                self._logger_key,
+                "Claimed [%d] QUEUED WorkRequests" % len(claimed_requests),
+            )
+
+            WorkRequestNotifier.instance().notify_all(claimed_requests)
+
+            return claimed_requests
+        except:
+            error_str = "Failed to claim QUEUED WorkRequests, error = [%s]" % (
+                repr(exc_info()),
+            )
+            ContextLogger.error(self._logger_key, error_str)
+            traceback.print_exc(file=stdout)
+
+        return []
+
+    def _load_queue_depth(self) -> Dict[str, int]:
+        try:
+            results: List[MapRecord] = WorkRequestDAO.execute_query(
+                WorkRequestQuery.QUEUE_DEPTH,
+                ApplicationConfig.instance().database_config,
+            )
+
+            if results is None:
+                return {}
+
+            return dict(
+                map(
+                    lambda r: (r.result["modelid"], int(r.result["queuedepth"])),
+                    results,
+                )
+            )
+        except:
+            error_str = "Failed to load WorkRequest queue depth, error = [%s]" % (
+                repr(exc_info()),
+            )
+            ContextLogger.error(self._logger_key, error_str)
+            traceback.print_exc(file=stdout)
+
+        return self._queue_depth
+
+    def get_queue_depth(self) -> Dict[str, int]:
+        return dict(self._queue_depth)
+
+    # models of other workers with enough QUEUED requests to be worth stealing, deepest first
+    def get_stealable_model_ids(self, exclude_model_ids: List[str]) -> List[str]:
+        return list(
+            map(
+                lambda item: item[0],
+                sorted(
+                    filter(
+                        lambda item: item[0] not in exclude_model_ids
+                        and item[1] >= self.worker_steal_min_queue_depth,
+                        self._queue_depth.items(),
+                    ),
+                    key=lambda item: item[1],
+                    reverse=True,
+                ),
+            )
         )
-        shuffle(active_model_ids)
-        models_per_worker: List[List[str]] = []
 
-        for x in range(len(active_model_ids)):
-            worker_index = x % WorkRequestController.NUM_WORKERS
+    def _target_workers_count(self) -> int:
+        total_queue_depth = sum(self._queue_depth.values())
 
-            if len(models_per_worker) < worker_index + 1:
-                models_per_worker.append([])
+        return min(
+            self.max_workers,
+            max(self.min_workers, ceil(total_queue_depth / self.worker_queue_depth)),
+        )
 
-            models_per_worker[worker_index].append(active_model_ids[x])
+    def _scale_workers(self):
+        self._retired_workers = ThreadSafeList(
+            filter(lambda w: w.is_alive(), self._retired_workers)
+        )
+        target_workers_count = self._target_workers_count()
+        workers: List[WorkRequestWorker] = list(self._workers)
 
-        workers: List[WorkRequestWorker] = []
+        if target_workers_count > len(workers):
+            for _ in range(target_workers_count - len(workers)):
+                worker = WorkRequestWorker(self)
+                worker.start()
+                workers.append(worker)
 
-        for worker_models in models_per_worker:
-            worker = WorkRequestWorker(self)
-            worker.update_model_ids(worker_models)
-            worker.start()
-            workers.append(worker)
+            ContextLogger.info(
+                self._logger_key, "Scaled workers up to [%d]" % len(workers)
+            )
+        elif target_workers_count < len(workers):
+            # NOTE: scale down one worker per load balance, to avoid flapping
+            retired_worker = workers.pop()
+            retired_worker.kill()
+            self._retired_workers.append(retired_worker)
+
+            ContextLogger.info(
+                self._logger_key, "Scaled workers down to [%d]" % len(workers)
+            )
+        else:
+            return
 
         self._workers = ThreadSafeList(workers)
 
-    def _update_worker_models(self):
-        current_worker_models: List[str] = []
-        models_per_worker: List[List[Any]] = []
+    def _model_load(self, model_id: str) -> int:
+        # NOTE: +1, so models without QUEUED requests are still spread between workers
+        return self._queue_depth.get(model_id, 0) + 1
+
+    # greedy partitioning: heaviest models first, each to the least loaded partition
+    def _partition_models(
+        self, model_ids: List[str], partitions_count: int
+    ) -> tuple[List[List[str]], List[int]]:
+        partitions: List[List[str]] = [[] for _ in range(partitions_count)]
+        partition_loads: List[int] = [0] * partitions_count
 
-        for worker in list(self._workers):
-            models_per_worker.append([worker, list(worker.model_ids), False])
-            current_worker_models.extend(list(worker.model_ids))
+        for model_id in sorted(model_ids, key=self._model_load, reverse=True):
+            partition_index = partition_loads.index(min(partition_loads))
+            partitions[partition_index].append(model_id)
+            partition_loads[partition_index] += self._model_load(model_id)
+
+        return partitions, partition_loads
+
+    def _initialize_workers(self):
+        if len(self._workers) > 0:
+            return
+
+        self._queue_depth = self._load_queue_depth()
+        self._scale_workers()
+        self._update_worker_models(refresh_queue_depth=False)
+
+    def _update_worker_models(self, refresh_queue_depth: bool = True):
+        if refresh_queue_depth:
+            self._queue_depth = self._load_queue_depth()
+            self._scale_workers()
 
         models = ModelController.instance().get_models()
         active_model_ids: List[str] = list(
             map(lambda m: m.id, filter(lambda fm: fm.enabled, models))
         )
+        shuffle(active_model_ids)
 
-        for model_id in current_worker_models:
-            if model_id in active_model_ids:
-                continue
+        # [worker, model_ids, changed]
+        models_per_worker: List[List[Any]] = list(
+            map(
+                lambda w: [
+                    w,
+                    list(filter(lambda m: m in active_model_ids, w.model_ids)),
+                    False,
+                ],
+                self._workers,
+            )
+        )
 
-            for worker_tuple in models_per_worker:
-                if model_id not in worker_tuple[1]:
-                    continue
+        if len(models_per_worker) == 0:
+            return
 
-                worker_tuple[1].remove(model_id)
-                worker_tuple[2] = True  # mark changed
-                break
+        for worker_tuple in models_per_worker:
+            worker_tuple[2] = len(worker_tuple[1]) != len(worker_tuple[0].model_ids)
 
-        for model_id in active_model_ids:
-            if model_id in current_worker_models:
-                continue
+        worker_loads = list(
+            map(lambda w: sum(map(self._model_load, w[1])), models_per_worker)
+        )
+        average_load = sum(map(self._model_load, active_model_ids)) / len(
+            models_per_worker
+        )
+        assigned_model_ids = set(m for w in models_per_worker for m in w[1])
+        unassigned_model_ids = list(
+            filter(lambda m: m not in assigned_model_ids, active_model_ids)
+        )
 
-            best_matched_worker = models_per_worker[0]
+        for model_id in unassigned_model_ids:
+            worker_index = worker_loads.index(min(worker_loads))
+            models_per_worker[worker_index][1].append(model_id)
+            models_per_worker[worker_index][2] = True  # mark changed
+            worker_loads[worker_index] += self._model_load(model_id)
 
-            for worker_tuple in models_per_worker[1:]:
-                if len(worker_tuple[1]) < len(best_matched_worker[1]):
-                    best_matched_worker = worker_tuple
+        if max(worker_loads) > self.worker_rebalance_factor * average_load:
+            partitions, partition_loads = self._partition_models(
+                active_model_ids, len(models_per_worker)
+            )
 
-            best_matched_worker[1].append(model_id)
-            best_matched_worker[2] = True  # mark changed
+            # NOTE: a single hot model cannot be split, only re-partition if it helps (stealing covers the rest)
+            if max(partition_loads) < max(worker_loads):
+                ContextLogger.info(
+                    self._logger_key,
+                    "Re-partitioning models between workers, max load = [%d] -> [%d], average load = [%.1f]"
+                    % (max(worker_loads), max(partition_loads), average_load),
+                )
+
+                for worker_tuple, partition in zip(models_per_worker, partitions):
+                    worker_tuple[2] = worker_tuple[2] or set(worker_tuple[1]) != set(
+                        partition
+                    )
+                    worker_tuple[1] = partition
 
         for updated_worker in filter(lambda w: w[2], models_per_worker):
             updated_worker[0].update_model_ids(updated_worker[1])
 
+    def on_work_request_event(self, event: WorkRequestEvent):
+        if event.request_status == WorkRequestStatus.QUEUED:
+            # new (or requeued) work, wake the worker responsible for the model
+            for worker in list(self._workers):
+                if event.model_id in worker.model_ids:
+                    worker.wake()
+        elif (
+            event.request_status
+            in [WorkRequestStatus.COMPLETED, WorkRequestStatus.FAILED]
+            and event.server_id == ServerController.instance().server_id
+        ):
+            # instance capacity was released on this server, any worker might have queued work
+            for worker in list(self._workers):
+                worker.wake()
+
+        if not self.eager_provisioning:
+            return
+
+        if event.request_status in [
+            WorkRequestStatus.COMPLETED,
+            WorkRequestStatus.FAILED,
+        ] or (
+            event.request_status == WorkRequestStatus.SCHEDULING
+            and event.server_id != ServerController.instance().server_id
+        ):
+            # cancelled, or claimed by another server, before the provisioned pod was assigned
+            ModelInstanceController.instance().release_provisioned_instance(
+                event.model_id, event.work_request_id
+            )
+
     def _stop_workers(self):
         for worker in self._workers:
             if worker.is_alive():
                 worker.kill()
 
-        for worker in self._workers:
+        for worker in list(self._workers) + list(self._retired_workers):
             worker.join()
 
     def mark_workrequest_failed(
@@ -557,6 +1063,8 @@ class WorkRequestController(Thread):
     def run(self):
         ContextLogger.info(self._logger_key, "Controller started")
 
+        WorkRequestNotifier.instance().register_listener(self.on_work_request_event)
+
         # initial wait for models cache to be populated
         if self._wait_or_kill(20):
             return
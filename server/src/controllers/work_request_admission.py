@@ -0,0 +1,515 @@
+import traceback
+from collections import Counter, deque
+from datetime import datetime
+from math import ceil
+from sys import exc_info, stdout
+from threading import Event, Lock, Thread
+from typing import Deque, Dict, List, Tuple
+
+from config.application_config import ApplicationConfig
+from controllers.work_request_notifier import WorkRequestEvent, WorkRequestNotifier
+from db.daos.shared_record import MapRecord
+from db.daos.work_request import WorkRequestDAO, WorkRequestQuery
+from objects.api import GUEST_USER_PATTERN
+from objects.work_request import WorkRequest, WorkRequestStatus
+from python_framework.config_utils import load_environment_variable
+from python_framework.graceful_killer import GracefulKiller, KillInstance
+from python_framework.logger import ContextLogger, LogLevel
+
+###
+# The WorkRequestAdmissionController limits the number of active WorkRequests, per model and per user
+#   (anonymous users per session), before they are persisted.
+#
+# The counters are kept in-memory, updated by the WorkRequest events (see WorkRequestNotifier) and
+#   periodically re-synced from the DB, so they also converge for requests of other servers.
+###
+
+
+class ActiveWorkRequest:
+    model_id: str
+    owner_key: str
+    request_status: str
+
+    def __init__(self, model_id: str, owner_key: str, request_status: str):
+        self.model_id = model_id
+        self.owner_key = owner_key
+        self.request_status = request_status
+
+
+class AdmissionTicket:
+    admitted: bool
+    reason: str | None
+    retry_after: int | None  # seconds
+    model_id: str
+    owner_key: str
+
+    def __init__(
+        self,
+        admitted: bool,
+        model_id: str,
+        owner_key: str,
+        reason: str | None = None,
+        retry_after: int | None = None,
+    ):
+        self.admitted = admitted
+        self.model_id = model_id
+        self.owner_key = owner_key
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class WorkRequestAdmissionControllerKillInstance(KillInstance):
+    def kill(self):
+        WorkRequestAdmissionController.instance().kill()
+
+
+class WorkRequestAdmissionController(Thread):
+    TERMINAL_STATUSES = [WorkRequestStatus.COMPLETED.value, WorkRequestStatus.FAILED.value]
+    MIN_RETRY_AFTER = 5
+    MAX_RETRY_AFTER = 3600
+
+    _instance: "WorkRequestAdmissionController" = None
+
+    _logger_key: str = None
+    _kill_event: Event
+
+    _lock: Lock
+    _active_requests: Dict[int, ActiveWorkRequest]
+    # admitted, not yet persisted, requests (model_id, owner_key)
+    _reservations: List[Tuple[str, str]]
+    _model_queue_depth: Dict[str, int]
+    _owner_active_count: Dict[str, int]
+    # (timestamp, model_id) of processed requests, to estimate the drain rate
+    _processed: Deque[Tuple[float, str]]
+
+    enabled: bool
+    max_model_queue_depth: int
+    max_user_active_requests: int
+    max_anonymous_active_requests: int
+    sync_interval: float
+    rate_window: float
+    default_retry_after: int
+
+    def __init__(self):
+        Thread.__init__(self)
+
+        self._logger_key = "WorkRequestAdmissionController"
+        self._kill_event = Event()
+
+        self._lock = Lock()
+        self._active_requests = {}
+        self._reservations = []
+        self._model_queue_depth = {}
+        self._owner_active_count = {}
+        self._processed = deque()
+
+        self.enabled = (
+            load_environment_variable(
+                "WORK_REQUEST_ADMISSION_ENABLED", default="TRUE"
+            ).upper()
+            == "TRUE"
+        )
+        # QUEUED requests per model, 0 = unlimited
+        self.max_model_queue_depth = int(
+            load_environment_variable(
+                "WORK_REQUEST_ADMISSION_MAX_MODEL_QUEUE_DEPTH", default="500"
+            )
+        )
+        # active (not COMPLETED / FAILED) requests per user, 0 = unlimited
+        self.max_user_active_requests = int(
+            load_environment_variable(
+                "WORK_REQUEST_ADMISSION_MAX_USER_ACTIVE_REQUESTS", default="50"
+            )
+        )
+        # active requests per anonymous session, 0 = unlimited
+        self.max_anonymous_active_requests = int(
+            load_environment_variable(
+                "WORK_REQUEST_ADMISSION_MAX_ANONYMOUS_ACTIVE_REQUESTS", default="5"
+            )
+        )
+        self.sync_interval = float(
+            load_environment_variable(
+                "WORK_REQUEST_ADMISSION_SYNC_INTERVAL", default="30"
+            )
+        )
+        self.rate_window = float(
+            load_environment_variable(
+                "WORK_REQUEST_ADMISSION_RATE_WINDOW", default="600"
+            )
+        )
+        self.default_retry_after = int(
+            load_environment_variable(
+                "WORK_REQUEST_ADMISSION_DEFAULT_RETRY_AFTER", default="60"
+            )
+        )
+
+        ContextLogger.instance().create_logger_for_context(
+            self._logger_key,
+            LogLevel.from_string(
+                load_environment_variable(
+                    f"LOG_LEVEL_{self._logger_key}", default=LogLevel.INFO.name
+                )
+            ),
+        )
+
+    @staticmethod
+    def initialize() -> "WorkRequestAdmissionController":
+        if WorkRequestAdmissionController._instance is not None:
+            return WorkRequestAdmissionController._instance
+
+        WorkRequestAdmissionController._instance = WorkRequestAdmissionController()
+        GracefulKiller.instance().register_kill_instance(
+            WorkRequestAdmissionControllerKillInstance()
+        )
+
+        return WorkRequestAdmissionController._instance
+
+    @staticmethod
+    def instance() -> "WorkRequestAdmissionController":
+        return WorkRequestAdmissionController._instance
+
+    def _wait_or_kill(self, timeout: float) -> bool:
+        return self._kill_event.wait(timeout)
+
+    def kill(self):
+        self._kill_event.set()
+
+    # anonymous users share a UserId, so they are limited per session
+    @staticmethod
+    def owner_key(user_id: str | None, session_id: str | None) -> str:
+        if user_id is not None and GUEST_USER_PATTERN.fullmatch(user_id) is not None:
+            return f"session:{session_id}"
+
+        return f"user:{user_id}"
+
+    @staticmethod
+    def _is_anonymous_owner(owner_key: str) -> bool:
+        return owner_key.startswith("session:")
+
+    def _increment(self, model_id: str, owner_key: str, request_status: str):
+        if request_status == WorkRequestStatus.QUEUED.value:
+            self._model_queue_depth[model_id] = (
+                self._model_queue_depth.get(model_id, 0) + 1
+            )
+
+        self._owner_active_count[owner_key] = (
+            self._owner_active_count.get(owner_key, 0) + 1
+        )
+
+    def _decrement(self, model_id: str, owner_key: str, request_status: str):
+        if request_status == WorkRequestStatus.QUEUED.value:
+            self._model_queue_depth[model_id] = max(
+                0, self._model_queue_depth.get(model_id, 0) - 1
+            )
+
+        self._owner_active_count[owner_key] = max(
+            0, self._owner_active_count.get(owner_key, 0) - 1
+        )
+
+    def _set_active_request(
+        self, work_request_id: int, active_request: ActiveWorkRequest | None
+    ) -> ActiveWorkRequest | None:
+        previous_request = self._active_requests.pop(work_request_id, None)
+
+        if previous_request is not None:
+            self._decrement(
+                previous_request.model_id,
+                previous_request.owner_key,
+                previous_request.request_status,
+            )
+
+        if active_request is not None:
+            self._active_requests[work_request_id] = active_request
+            self._increment(
+                active_request.model_id,
+                active_request.owner_key,
+                active_request.request_status,
+            )
+
+        return previous_request
+
+    def _prune_processed(self, now: float):
+        while len(self._processed) > 0 and self._processed[0][0] < now - self.rate_window:
+            self._processed.popleft()
+
+    # seconds until [excess] requests are expected to be processed, based on the recent drain rate
+    def _estimate_retry_after(self, excess: int, model_id: str | None = None) -> int:
+        now = datetime.now().timestamp()
+        self._prune_processed(now)
+
+        processed_count = sum(
+            1
+            for _, processed_model_id in self._processed
+            if model_id is None or processed_model_id == model_id
+        )
+
+        if processed_count == 0:
+            return self.default_retry_after
+
+        rate = processed_count / self.rate_window
+
+        return max(
+            WorkRequestAdmissionController.MIN_RETRY_AFTER,
+            min(WorkRequestAdmissionController.MAX_RETRY_AFTER, ceil(excess / rate)),
+        )
+
+    def admit(
+        self,
+        model_id: str,
+        user_id: str,
+        session_id: str | None,
+        bypass: bool = False,
+    ) -> AdmissionTicket:
+        owner_key = WorkRequestAdmissionController.owner_key(user_id, session_id)
+
+        if not self.enabled or bypass:
+            return AdmissionTicket(True, model_id, owner_key)
+
+        with self._lock:
+            model_queue_depth = self._model_queue_depth.get(model_id, 0) + sum(
+                1 for m, _ in self._reservations if m == model_id
+            )
+            owner_active_count = self._owner_active_count.get(owner_key, 0) + sum(
+                1 for _, o in self._reservations if o == owner_key
+            )
+            max_owner_active_requests = self._max_owner_active_requests(owner_key)
+
+            if 0 < max_owner_active_requests <= owner_active_count:
+                return AdmissionTicket(
+                    False,
+                    model_id,
+                    owner_key,
+                    reason="Too many active requests [%d], max = [%d]"
+                    % (owner_active_count, max_owner_active_requests),
+                    retry_after=self._estimate_retry_after(
+                        owner_active_count - max_owner_active_requests + 1
+                    ),
+                )
+
+            if 0 < self.max_model_queue_depth <= model_queue_depth:
+                return AdmissionTicket(
+                    False,
+                    model_id,
+                    owner_key,
+                    reason="Too many queued requests for model [%s]" % model_id,
+                    retry_after=self._estimate_retry_after(
+                        model_queue_depth - self.max_model_queue_depth + 1,
+                        model_id=model_id,
+                    ),
+                )
+
+            self._reservations.append((model_id, owner_key))
+
+        return AdmissionTicket(True, model_id, owner_key)
+
+    def _max_owner_active_requests(self, owner_key: str) -> int:
+        return (
+            self.max_anonymous_active_requests
+            if WorkRequestAdmissionController._is_anonymous_owner(owner_key)
+            else self.max_user_active_requests
+        )
+
+    # the largest bulk submission that can ever be admitted for the owner, 0 = unlimited
+    def max_bulk_size(
+        self, user_id: str, session_id: str | None, bypass: bool = False
+    ) -> int:
+        if not self.enabled or bypass:
+            return 0
+
+        return self._max_owner_active_requests(
+            WorkRequestAdmissionController.owner_key(user_id, session_id)
+        )
+
+    # the reason why a bulk submission can never be admitted (more items for a model than its queue depth),
+    #   None if it can be admitted once enough requests are processed
+    def bulk_rejection_reason(
+        self, model_ids: List[str], bypass: bool = False
+    ) -> str | None:
+        if not self.enabled or bypass or self.max_model_queue_depth <= 0:
+            return None
+
+        for model_id, bulk_model_count in Counter(model_ids).items():
+            if bulk_model_count > self.max_model_queue_depth:
+                return (
+                    "Too many items [%d] for model [%s] for the queued requests limit, max = [%d]"
+                    % (bulk_model_count, model_id, self.max_model_queue_depth)
+                )
+
+        return None
+
+    # admits all requests (one per model id) or none, either all returned tickets are admitted,
+    #   or a single rejected ticket is returned
+    # NOTE: see max_bulk_size and bulk_rejection_reason for bulks that are never admitted
+    def admit_bulk(
+        self,
+        model_ids: List[str],
+        user_id: str,
+        session_id: str | None,
+        bypass: bool = False,
+    ) -> List[AdmissionTicket]:
+        owner_key = WorkRequestAdmissionController.owner_key(user_id, session_id)
+
+        if not self.enabled or bypass:
+            return list(
+                map(lambda model_id: AdmissionTicket(True, model_id, owner_key), model_ids)
+            )
+
+        bulk_model_counts = Counter(model_ids)
+
+        with self._lock:
+            owner_active_count = self._owner_active_count.get(owner_key, 0) + sum(
+                1 for _, o in self._reservations if o == owner_key
+            )
+            max_owner_active_requests = self._max_owner_active_requests(owner_key)
+
+            if 0 < max_owner_active_requests < owner_active_count + len(model_ids):
+                return [
+                    AdmissionTicket(
+                        False,
+                        model_ids[0],
+                        owner_key,
+                        reason="Too many active requests [%d] for [%d] new requests, max = [%d]"
+                        % (
+                            owner_active_count,
+                            len(model_ids),
+                            max_owner_active_requests,
+                        ),
+                        retry_after=self._estimate_retry_after(
+                            owner_active_count
+                            + len(model_ids)
+                            - max_owner_active_requests
+                        ),
+                    )
+                ]
+
+            for model_id, bulk_model_count in bulk_model_counts.items():
+                model_queue_depth = self._model_queue_depth.get(model_id, 0) + sum(
+                    1 for m, _ in self._reservations if m == model_id
+                )
+
+                if 0 < self.max_model_queue_depth < model_queue_depth + bulk_model_count:
+                    return [
+                        AdmissionTicket(
+                            False,
+                            model_id,
+                            owner_key,
+                            reason="Too many queued requests for model [%s]" % model_id,
+                            retry_after=self._estimate_retry_after(
+                                model_queue_depth
+                                + bulk_model_count
+                                - self.max_model_queue_depth,
+                                model_id=model_id,
+                            ),
+                        )
+                    ]
+
+            for model_id in model_ids:
+                self._reservations.append((model_id, owner_key))
+
+        return list(
+            map(lambda model_id: AdmissionTicket(True, model_id, owner_key), model_ids)
+        )
+
+    # converts the ticket's reservation into an active request, once persisted (or released on failure)
+    def complete_admission(
+        self, ticket: AdmissionTicket, work_request: WorkRequest | None
+    ):
+        if not ticket.admitted:
+            return
+
+        with self._lock:
+            try:
+                self._reservations.remove((ticket.model_id, ticket.owner_key))
+            except ValueError:
+                # not reserved (admission disabled or bypassed)
+                pass
+
+            if work_request is None or work_request.id in self._active_requests:
+                return
+
+            self._set_active_request(
+                work_request.id,
+                ActiveWorkRequest(
+                    ticket.model_id, ticket.owner_key, WorkRequestStatus.QUEUED.value
+                ),
+            )
+
+    def on_work_request_event(self, event: WorkRequestEvent):
+        now = datetime.now().timestamp()
+
+        with self._lock:
+            if event.request_status in WorkRequestAdmissionController.TERMINAL_STATUSES:
+                if self._set_active_request(event.work_request_id, None) is not None:
+                    self._processed.append((now, event.model_id))
+                    self._prune_processed(now)
+
+                return
+
+            owner_key = (
+                self._active_requests[event.work_request_id].owner_key
+                if event.work_request_id in self._active_requests
+                else WorkRequestAdmissionController.owner_key(
+                    event.user_id, event.session_id
+                )
+            )
+
+            self._set_active_request(
+                event.work_request_id,
+                ActiveWorkRequest(event.model_id, owner_key, event.request_status),
+            )
+
+    def _sync_active_requests(self):
+        results: List[MapRecord] = WorkRequestDAO.execute_query(
+            WorkRequestQuery.SELECT_ACTIVE,
+            ApplicationConfig.instance().database_config,
+        )
+
+        active_requests: Dict[int, ActiveWorkRequest] = {}
+
+        for record in [] if results is None else results:
+            active_requests[record.result["id"]] = ActiveWorkRequest(
+                record.result["modelid"],
+                WorkRequestAdmissionController.owner_key(
+                    record.result["userid"], record.result["sessionid"]
+                ),
+                record.result["requeststatus"],
+            )
+
+        with self._lock:
+            self._active_requests = {}
+            self._model_queue_depth = {}
+            self._owner_active_count = {}
+
+            for work_request_id, active_request in active_requests.items():
+                self._set_active_request(work_request_id, active_request)
+
+        ContextLogger.debug(
+            self._logger_key,
+            "Synced [%d] active WorkRequests" % len(active_requests),
+        )
+
+    def run(self):
+        if not self.enabled:
+            ContextLogger.info(self._logger_key, "Admission control disabled")
+
+            return
+
+        ContextLogger.info(self._logger_key, "Controller started")
+
+        WorkRequestNotifier.instance().register_listener(self.on_work_request_event)
+
+        while True:
+            try:
+                self._sync_active_requests()
+            except:
+                ContextLogger.error(
+                    self._logger_key,
+                    "Failed to sync active WorkRequests, error = [%s]"
+                    % repr(exc_info()),
+                )
+                traceback.print_exc(file=stdout)
+
+            if self._wait_or_kill(self.sync_interval):
+                break
+
+        ContextLogger.info(self._logger_key, "Controller stopped")
@@ -20,6 +20,14 @@ class WorkRequestControllerStub:
     ) -> WorkRequest | None:
         pass
 
+    def update_requests(
+        self,
+        work_requests: list[WorkRequest],
+        enforce_same_server_id: bool = True,
+        expect_null_server_id: bool = False,
+    ) -> list[WorkRequest | None]:
+        pass
+
     def mark_workrequest_failed(
         self, work_request: WorkRequest, reason: str | None = None
     ) -> WorkRequest:
@@ -35,9 +43,16 @@ class WorkRequestControllerStub:
         request_statuses: list[str] = None,
         server_ids: list[str] | None = None,
         limit: int = 200,
+        include_payload: bool = True,
     ) -> list[WorkRequest]:
         pass
 
+    def claim_requests(self, model_ids: list[str], limit: int) -> list[WorkRequest]:
+        pass
+
+    def get_stealable_model_ids(self, exclude_model_ids: list[str]) -> list[str]:
+        pass
+
     def update_work_request_metadata(
         self,
         work_request_id: int,
@@ -0,0 +1,340 @@
+import traceback
+from json import dumps, loads
+from sys import exc_info, stdout
+from threading import Event, Thread
+from typing import Any, Callable
+
+from config.application_config import ApplicationConfig
+from db.daos.work_request import WorkRequestDAO, WorkRequestQuery
+from objects.work_request import WorkRequest
+from python_framework.config_utils import load_environment_variable
+from python_framework.db.postgresutils import ConnectionDetails, create_db_engine
+from python_framework.graceful_killer import GracefulKiller, KillInstance
+from python_framework.logger import ContextLogger, LogLevel
+from python_framework.thread_safe_list import ThreadSafeList
+from sqlalchemy import text
+from sqlalchemy.engine.base import Connection
+
+###
+# The WorkRequestNotifier publishes WorkRequest events (creation + status transitions) on a
+# Postgres channel, and LISTENs on the same channel to wake up the WorkRequestWorkers.
+#
+# NOTE: pg8000 only reads notifications from the socket when a statement is executed,
+#       so the listener executes a trivial statement every POLL_TIME seconds on a dedicated connection.
+#       This is still orders of magnitude cheaper than the full WorkRequest scan.
+###
+
+
+class WorkRequestEvent:
+    work_request_id: int
+    model_id: str
+    request_status: str
+    server_id: str | None
+    user_id: str | None
+    session_id: str | None
+
+    def __init__(
+        self,
+        work_request_id: int,
+        model_id: str,
+        request_status: str,
+        server_id: str | None = None,
+        user_id: str | None = None,
+        session_id: str | None = None,
+    ):
+        self.work_request_id = work_request_id
+        self.model_id = model_id
+        self.request_status = request_status
+        self.server_id = server_id
+        self.user_id = user_id
+        self.session_id = session_id
+
+    @staticmethod
+    def from_object(obj: dict[str, Any]) -> "WorkRequestEvent":
+        return WorkRequestEvent(
+            obj["id"],
+            obj["modelId"],
+            obj["requestStatus"],
+            None if "serverId" not in obj else obj["serverId"],
+            None if "userId" not in obj else obj["userId"],
+            None if "sessionId" not in obj else obj["sessionId"],
+        )
+
+    @staticmethod
+    def from_work_request(work_request: WorkRequest) -> "WorkRequestEvent":
+        return WorkRequestEvent(
+            work_request.id,
+            work_request.model_id,
+            str(work_request.request_status),
+            work_request.server_id,
+            work_request.user_id,
+            (
+                None
+                if work_request.metadata is None
+                or work_request.metadata.tracking_data is None
+                else work_request.metadata.tracking_data.session_id
+            ),
+        )
+
+    def to_object(self) -> dict[str, Any]:
+        return {
+            "id": self.work_request_id,
+            "modelId": self.model_id,
+            "requestStatus": self.request_status,
+            "serverId": self.server_id,
+            "userId": self.user_id,
+            "sessionId": self.session_id,
+        }
+
+
+WorkRequestEventListener = Callable[[WorkRequestEvent], None]
+
+
+class WorkRequestNotifierKillInstance(KillInstance):
+    def kill(self):
+        WorkRequestNotifier.instance().kill()
+
+
+class WorkRequestNotifier(Thread):
+    CHANNEL = "workrequest_events"
+    DEFAULT_POLL_TIME = 1
+    RECONNECT_WAIT_TIME = 10
+
+    _instance: "WorkRequestNotifier" = None
+
+    _logger_key: str = None
+    _kill_event: Event
+
+    _listeners: ThreadSafeList[WorkRequestEventListener]
+    _connection: Connection | None
+
+    enabled: bool
+    poll_time: float
+
+    def __init__(self):
+        Thread.__init__(self)
+
+        self._logger_key = "WorkRequestNotifier"
+        self._kill_event = Event()
+
+        self._listeners = ThreadSafeList()
+        self._connection = None
+
+        self.enabled = (
+            load_environment_variable(
+                "WORK_REQUEST_NOTIFICATIONS_ENABLED", default="TRUE"
+            ).upper()
+            == "TRUE"
+        )
+        self.poll_time = float(
+            load_environment_variable(
+                "WORK_REQUEST_NOTIFIER_POLL_TIME",
+                default=WorkRequestNotifier.DEFAULT_POLL_TIME,
+            )
+        )
+
+        ContextLogger.instance().create_logger_for_context(
+            self._logger_key,
+            LogLevel.from_string(
+                load_environment_variable(
+                    f"LOG_LEVEL_{self._logger_key}", default=LogLevel.INFO.name
+                )
+            ),
+        )
+
+    @staticmethod
+    def initialize() -> "WorkRequestNotifier":
+        if WorkRequestNotifier._instance is not None:
+            return WorkRequestNotifier._instance
+
+        WorkRequestNotifier._instance = WorkRequestNotifier()
+        GracefulKiller.instance().register_kill_instance(
+            WorkRequestNotifierKillInstance()
+        )
+
+        return WorkRequestNotifier._instance
+
+    @staticmethod
+    def instance() -> "WorkRequestNotifier":
+        return WorkRequestNotifier._instance
+
+    def _wait_or_kill(self, timeout: float) -> bool:
+        return self._kill_event.wait(timeout)
+
+    def kill(self):
+        self._kill_event.set()
+
+    def register_listener(self, listener: WorkRequestEventListener):
+        self._listeners.append(listener)
+
+    def notify(self, work_request: WorkRequest) -> bool:
+        if not self.enabled:
+            return False
+
+        event = WorkRequestEvent.from_work_request(work_request)
+
+        try:
+            WorkRequestDAO.execute_query(
+                WorkRequestQuery.NOTIFY,
+                ApplicationConfig.instance().database_config,
+                query_kwargs={
+                    "channel": WorkRequestNotifier.CHANNEL,
+                    "payload": dumps(event.to_object()),
+                },
+            )
+
+            return True
+        except:
+            # NOTE: notifications are best-effort, the periodic worker scan is the safety net
+            ContextLogger.warn(
+                self._logger_key,
+                "Failed to notify WorkRequest event for [%s], error = [%s]"
+                % (str(work_request.id), repr(exc_info())),
+            )
+
+        return False
+
+    def notify_all(self, work_requests: list[WorkRequest]) -> bool:
+        if not self.enabled or len(work_requests) == 0:
+            return False
+
+        payloads = list(
+            map(
+                lambda work_request: dumps(
+                    WorkRequestEvent.from_work_request(work_request).to_object()
+                ),
+                work_requests,
+            )
+        )
+
+        try:
+            WorkRequestDAO.execute_query(
+                WorkRequestQuery.NOTIFY_ALL,
+                ApplicationConfig.instance().database_config,
+                query_kwargs={
+                    "channel": WorkRequestNotifier.CHANNEL,
+                    "payloads": payloads,
+                },
+            )
+
+            return True
+        except:
+            ContextLogger.warn(
+                self._logger_key,
+                "Failed to notify [%d] WorkRequest events, error = [%s]"
+                % (len(work_requests), repr(exc_info())),
+            )
+
+        return False
+
+    def _dispatch(self, payload: str):
+        try:
+            event = WorkRequestEvent.from_object(loads(payload))
+        except:
+            ContextLogger.warn(
+                self._logger_key,
+                "Ignoring invalid WorkRequest event payload [%s]" % payload,
+            )
+
+            return
+
+        ContextLogger.trace(
+            self._logger_key,
+            "Dispatching WorkRequest event [%s]" % dumps(event.to_object()),
+        )
+
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except:
+                ContextLogger.error(
+                    self._logger_key,
+                    "WorkRequest event listener failed, error = [%s]"
+                    % repr(exc_info()),
+                )
+                traceback.print_exc(file=stdout)
+
+    def _connect(self) -> bool:
+        self._disconnect()
+
+        try:
+            engine = create_db_engine(
+                ConnectionDetails.from_db_config(
+                    ApplicationConfig.instance().database_config
+                ),
+                autocommit=True,
+            )
+            self._connection = engine.connect()
+            self._connection.execute(text(f"LISTEN {WorkRequestNotifier.CHANNEL}"))
+
+            ContextLogger.info(
+                self._logger_key,
+                "Listening on channel [%s]" % WorkRequestNotifier.CHANNEL,
+            )
+
+            return True
+        except:
+            ContextLogger.error(
+                self._logger_key,
+                "Failed to LISTEN on channel [%s], error = [%s]"
+                % (WorkRequestNotifier.CHANNEL, repr(exc_info())),
+            )
+            self._disconnect()
+
+        return False
+
+    def _disconnect(self):
+        if self._connection is None:
+            return
+
+        try:
+            self._connection.close()
+        except:
+            pass
+
+        self._connection = None
+
+    def _poll_notifications(self):
+        # forces pg8000 to read pending notifications from the socket
+        self._connection.execute(text("SELECT 1"))
+        notifications = self._connection.connection.connection.notifications
+
+        while len(notifications) > 0:
+            _, channel, payload = notifications.popleft()
+
+            if channel != WorkRequestNotifier.CHANNEL:
+                continue
+
+            self._dispatch(payload)
+
+    def run(self):
+        if not self.enabled:
+            ContextLogger.info(self._logger_key, "Notifications disabled")
+
+            return
+
+        ContextLogger.info(self._logger_key, "Controller started")
+
+        while True:
+            if self._connection is None and not self._connect():
+                if self._wait_or_kill(WorkRequestNotifier.RECONNECT_WAIT_TIME):
+                    break
+
+                continue
+
+            try:
+                self._poll_notifications()
+            except:
+                ContextLogger.error(
+                    self._logger_key,
+                    "Failed to poll notifications, reconnecting. Error = [%s]"
+                    % repr(exc_info()),
+                )
+                self._disconnect()
+
+            if self._wait_or_kill(self.poll_time):
+                break
+
+        self._disconnect()
+
+        ContextLogger.info(self._logger_key, "Controller stopped")
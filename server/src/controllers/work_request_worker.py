@@ -1,24 +1,27 @@
 import traceback
-from json import dumps
+from datetime import datetime
+from math import ceil
 from random import choices
 from string import ascii_lowercase
 from sys import exc_info, stdout
 from threading import Event, Thread
-from time import sleep
-from typing import Dict, List, Set
+from typing import Dict, List, Tuple
 
 from controllers.job_submission_process import JobSubmissionProcess
 from controllers.model import ModelController
 from controllers.model_input_cache import ModelInputCache
 from controllers.model_instance_handler import (
+    ModelInstanceCapacityException,
     ModelInstanceController,
     ModelInstanceHandler,
 )
-from controllers.s3_integration import S3IntegrationController
+from controllers.model_prewarmer import ModelPrewarmer
+from controllers.result_upload_queue import ResultUploadQueue
 from controllers.server import ServerController
+from controllers.single_flight import SingleFlightRegistry, SingleFlightState
 from controllers.work_request_controller_stub import WorkRequestControllerStub
+from objects.instance import JobBatchEntry
 from objects.model_integration import JobResult, JobStatus
-from objects.s3_integration import S3ResultObject
 from objects.work_request import WorkRequest, WorkRequestStatus
 from python_framework.config_utils import load_environment_variable
 from python_framework.logger import ContextLogger, LogLevel
@@ -34,10 +37,21 @@ from python_framework.time import (
 
 class WorkRequestWorker(Thread):
     DEFAULT_PROCESSING_WAIT_TIME = 10
+    DEFAULT_MIN_PROCESSING_WAIT_TIME = 1
     DEFAULT_POD_READY_TIMEOUT = 600
+    DEFAULT_SCHEDULING_GRACE_PERIOD = "2m"
+    DEFAULT_UPLOAD_ORPHAN_TIMEOUT = "5m"
+    DEFAULT_CLAIM_BATCH_SIZE = 10
+    DEFAULT_BATCH_MAX_SIZE = 0
+    DEFAULT_BATCH_REQUEST_MAX_SIZE = 20
+    DEFAULT_BATCH_WAIT_TIME = 2
+    DEFAULT_SHARD_MIN_SIZE = 100
+    DEFAULT_SHARD_MAX_RETRIES = 1
+    DEFAULT_MODEL_SKIP_TIME = 30
 
     _logger_key: str = None
     _kill_event: Event
+    _wake_event: Event
 
     _controller: WorkRequestControllerStub
 
@@ -45,6 +59,22 @@ class WorkRequestWorker(Thread):
     model_ids: ThreadSafeList[str]
     _pod_ready_timeout: int
     _processing_wait_time: int
+    _min_processing_wait_time: float
+    _scheduling_grace_period: str
+    _upload_orphan_timeout: str
+    _claim_batch_size: int
+    _batch_max_size: int
+    _batch_request_max_size: int
+    _batch_wait_time: float
+    _shard_min_size: int
+    _shard_max_retries: int
+    _model_skip_time: float
+
+    # small QUEUED requests, per model, waiting to be (micro-)batched into a single job
+    _pending_batches: Dict[str, List[Tuple[WorkRequest, List[str]]]]
+    _pending_batch_start: Dict[str, float]
+    # models that failed to acquire an instance => skipped until (timestamp), not claimed in the meantime
+    _skipped_model_ids: Dict[str, float]
 
     def __init__(self, controller: WorkRequestControllerStub):
         Thread.__init__(self)
@@ -56,6 +86,7 @@ class WorkRequestWorker(Thread):
 
         self._logger_key = "WorkRequestWorker[%s]" % self.id
         self._kill_event = Event()
+        self._wake_event = Event()
         self._pod_ready_timeout = int(
             load_environment_variable(
                 "WORK_REQUEST_WORKER_POD_READY_TIMEOUT",
@@ -68,6 +99,70 @@ class WorkRequestWorker(Thread):
                 default=WorkRequestWorker.DEFAULT_PROCESSING_WAIT_TIME,
             )
         )
+        # lower bound between scans, protects the DB against notification bursts
+        self._min_processing_wait_time = float(
+            load_environment_variable(
+                "WORK_REQUEST_WORKER_MIN_PROCESSING_WAIT_TIME",
+                default=WorkRequestWorker.DEFAULT_MIN_PROCESSING_WAIT_TIME,
+            )
+        )
+        self._scheduling_grace_period = load_environment_variable(
+            "WORK_REQUEST_WORKER_SCHEDULING_GRACE_PERIOD",
+            default=WorkRequestWorker.DEFAULT_SCHEDULING_GRACE_PERIOD,
+        )
+        # UPLOADING requests without a pending upload are requeued once not updated for this long
+        self._upload_orphan_timeout = load_environment_variable(
+            "WORK_REQUEST_WORKER_UPLOAD_ORPHAN_TIMEOUT",
+            default=WorkRequestWorker.DEFAULT_UPLOAD_ORPHAN_TIMEOUT,
+        )
+        self._claim_batch_size = int(
+            load_environment_variable(
+                "WORK_REQUEST_WORKER_CLAIM_BATCH_SIZE",
+                default=WorkRequestWorker.DEFAULT_CLAIM_BATCH_SIZE,
+            )
+        )
+        # max total entries of a batched job, 0 = batching disabled
+        self._batch_max_size = int(
+            load_environment_variable(
+                "WORK_REQUEST_WORKER_BATCH_MAX_SIZE",
+                default=WorkRequestWorker.DEFAULT_BATCH_MAX_SIZE,
+            )
+        )
+        self._batch_request_max_size = int(
+            load_environment_variable(
+                "WORK_REQUEST_WORKER_BATCH_REQUEST_MAX_SIZE",
+                default=WorkRequestWorker.DEFAULT_BATCH_REQUEST_MAX_SIZE,
+            )
+        )
+        self._batch_wait_time = float(
+            load_environment_variable(
+                "WORK_REQUEST_WORKER_BATCH_WAIT_TIME",
+                default=WorkRequestWorker.DEFAULT_BATCH_WAIT_TIME,
+            )
+        )
+        # min entries per shard, when sharding a large WorkRequest across instances
+        self._shard_min_size = int(
+            load_environment_variable(
+                "WORK_REQUEST_WORKER_SHARD_MIN_SIZE",
+                default=WorkRequestWorker.DEFAULT_SHARD_MIN_SIZE,
+            )
+        )
+        self._shard_max_retries = int(
+            load_environment_variable(
+                "WORK_REQUEST_WORKER_SHARD_MAX_RETRIES",
+                default=WorkRequestWorker.DEFAULT_SHARD_MAX_RETRIES,
+            )
+        )
+        # seconds a model is not claimed, after failing to acquire an instance
+        self._model_skip_time = float(
+            load_environment_variable(
+                "WORK_REQUEST_WORKER_MODEL_SKIP_TIME",
+                default=WorkRequestWorker.DEFAULT_MODEL_SKIP_TIME,
+            )
+        )
+        self._pending_batches = {}
+        self._pending_batch_start = {}
+        self._skipped_model_ids = {}
 
         ContextLogger.instance().create_logger_for_context(
             self._logger_key,
@@ -83,6 +178,46 @@ class WorkRequestWorker(Thread):
 
     def kill(self):
         self._kill_event.set()
+        self._wake_event.set()
+
+    def wake(self):
+        self._wake_event.set()
+
+    # returns True if killed, otherwise waits for a wake-up or the periodic (safety net) scan
+    def _wait_for_work_or_kill(self) -> bool:
+        if self._wait_or_kill(self._min_processing_wait_time):
+            return True
+
+        wait_time = max(0, self._processing_wait_time - self._min_processing_wait_time)
+
+        # pending batches need to be flushed within the batch wait window
+        if len(self._pending_batches) > 0:
+            wait_time = min(wait_time, self._batch_wait_time)
+
+        self._wake_event.wait(wait_time)
+        self._wake_event.clear()
+
+        return self._kill_event.is_set()
+
+    # NOTE: released requests are QUEUED again (and notified), without the skip this worker would re-claim
+    #       them on the next scan
+    def _skip_model(self, model_id: str):
+        self._skipped_model_ids[model_id] = (
+            datetime.now().timestamp() + self._model_skip_time
+        )
+
+    def _is_model_skipped(self, model_id: str) -> bool:
+        skipped_until = self._skipped_model_ids.get(model_id)
+
+        if skipped_until is None:
+            return False
+
+        if skipped_until <= datetime.now().timestamp():
+            del self._skipped_model_ids[model_id]
+
+            return False
+
+        return True
 
     def update_model_ids(self, model_ids: List[str]):
         ContextLogger.info(
@@ -90,14 +225,53 @@ class WorkRequestWorker(Thread):
         )
         self.model_ids = ThreadSafeList(model_ids)
 
-    def _upload_result_to_s3(self, work_request: WorkRequest, result: JobResult):
-        result_obj = S3ResultObject(
-            model_id=work_request.model_id,
-            request_id=str(work_request.id),
-            result=dumps(result),
+    @staticmethod
+    def _payload_entries(work_request: WorkRequest) -> List[str]:
+        return (
+            work_request.request_payload.entries[1:]
+            if work_request.request_payload.has_header
+            else work_request.request_payload.entries
         )
 
-        return S3IntegrationController.instance().upload_result(result_obj)
+    # unique entries, in order of first occurrence. Results are fanned back out by input,
+    #   see ModelInputCache.consolidate_results
+    @staticmethod
+    def _unique_entries(entries: List[str]) -> List[str]:
+        return list(dict.fromkeys(entries))
+
+    # NOTE: job entries are unique, so a payload entry missing from the job entries was cached
+    @staticmethod
+    def _has_cached_results(work_request: WorkRequest, job_entries: List[str]) -> bool:
+        job_entries_set = set(job_entries)
+
+        return any(
+            map(
+                lambda entry: entry not in job_entries_set,
+                WorkRequestWorker._payload_entries(work_request),
+            )
+        )
+
+    # NOTE: the ResultUploadQueue sets the WorkRequest to COMPLETED (or FAILED) once uploaded
+    def _hand_off_result(self, work_request: WorkRequest, result: JobResult):
+        work_request.request_status = WorkRequestStatus.UPLOADING
+        work_request.request_status_reason = None
+        updated_work_request = self._controller.update_request(
+            work_request, retry_count=1
+        )
+
+        if updated_work_request is None:
+            raise Exception("Failed to update WorkRequest [%d]" % work_request.id)
+
+        if not ResultUploadQueue.instance().submit(
+            updated_work_request, result, self._controller
+        ):
+            # NOTE: the orphaned UPLOADING WorkRequest is requeued, see _handle_uploading_requests
+            ContextLogger.warn(
+                self._logger_key,
+                "Failed to queue result upload of WorkRequest [%d]" % work_request.id,
+            )
+
+        return updated_work_request
 
     def _process_failed_job(
         self,
@@ -109,6 +283,9 @@ class WorkRequestWorker(Thread):
         if instance is not None:
             instance.kill()
 
+        # NOTE: fails the WorkRequests waiting for this job's inputs, they are requeued
+        SingleFlightRegistry.instance().release(work_request.id)
+
         work_request.request_status = WorkRequestStatus.FAILED
         work_request.request_status_reason = reason
         work_request.processed_timestamp = utc_now()
@@ -147,8 +324,7 @@ class WorkRequestWorker(Thread):
             ),
         )
 
-        instance.kill()
-
+        # NOTE: the caller releases (or kills) the instance once the job result is processed
         if instance.k8s_pod is None:
             return self._process_failed_job(
                 work_request,
@@ -174,19 +350,42 @@ class WorkRequestWorker(Thread):
                 instance=instance,
             )
 
-        job_payload_entries = (
-            work_request.request_payload.entries[1:]
-            if work_request.request_payload.has_header
-            else work_request.request_payload.entries
-        )
+        job_payload_entries = WorkRequestWorker._payload_entries(work_request)
+
+        if non_cached_inputs is not None and len(result_content) != len(
+            non_cached_inputs
+        ):
+            return self._process_failed_job(
+                work_request,
+                reason="Model result count not the same as model input count",
+                has_cached_results=has_cached_results,
+            )
+
+        job_inputs = non_cached_inputs
+        job_results = _result_content
+
+        if non_cached_inputs is not None:
+            # hand the results to the WorkRequests waiting for this job's inputs
+            SingleFlightRegistry.instance().complete(
+                work_request.model_id, work_request.id, non_cached_inputs, result_content
+            )
+
+            # inputs computed by other WorkRequests' jobs, see SingleFlightRegistry
+            shared_inputs, shared_results = SingleFlightRegistry.instance().collect(
+                work_request.id
+            )
+
+            if len(shared_inputs) > 0:
+                job_inputs = non_cached_inputs + shared_inputs
+                job_results = _result_content + shared_results
 
         if has_cached_results:
             _result_content = (
                 ModelInputCache.instance().hydrate_job_result_with_cached_results(
                     work_request.id,
                     job_payload_entries,
-                    non_cached_inputs,
-                    _result_content,
+                    job_inputs,
+                    job_results,
                 )
             )
 
@@ -196,27 +395,20 @@ class WorkRequestWorker(Thread):
                 )
             except:
                 ContextLogger.warn(self._logger_key, repr(exc_info()))
+        elif job_inputs is not None and len(job_inputs) != len(job_payload_entries):
+            # deduplicated job inputs, fan the results back out to the payload positions
+            _result_content = ModelInputCache.instance().consolidate_results(
+                job_payload_entries, job_inputs, job_results, []
+            )
 
         if len(_result_content) != len(job_payload_entries):
             return self._process_failed_job(
                 work_request,
                 reason="Model result count not the same as model input count",
+                has_cached_results=has_cached_results,
             )
 
-        if not self._upload_result_to_s3(work_request, _result_content):
-            sleep(30)
-
-            if not self._upload_result_to_s3(work_request, _result_content):
-                raise Exception("Failed to upload result to S3, twice")
-
-        work_request.request_status = WorkRequestStatus.COMPLETED
-        work_request.processed_timestamp = utc_now()
-        updated_work_request = self._controller.update_request(
-            work_request, retry_count=1
-        )
-
-        if updated_work_request is None:
-            raise Exception("Failed to update WorkRequest [%d]" % work_request.id)
+        updated_work_request = self._hand_off_result(work_request, _result_content)
 
         if work_request.request_payload.cache_opt_in:
             ModelInputCache.instance().cache_model_results(
@@ -226,6 +418,8 @@ class WorkRequestWorker(Thread):
                 work_request.user_id,
             )
 
+        return updated_work_request
+
     def _handle_processing_work_request(
         self, work_request: WorkRequest, instance: ModelInstanceHandler
     ) -> WorkRequest:
@@ -243,9 +437,40 @@ class WorkRequestWorker(Thread):
 
             return work_request
 
+        # NOTE: a failed job fails the WorkRequest, whatever the state of its shared inputs
+        single_flight_state = (
+            SingleFlightRegistry.instance().state(work_request.id)
+            if instance.job_submission_process.job_status == JobStatus.COMPLETED
+            else None
+        )
+
+        if single_flight_state == SingleFlightState.PENDING:
+            ContextLogger.debug(
+                self._logger_key,
+                "Still waiting for shared in-flight inputs for workrequest [%s]"
+                % str(work_request.id),
+            )
+
+            return work_request
+
+        if single_flight_state == SingleFlightState.FAILED:
+            self._requeue_failed_shared_inputs(
+                work_request,
+                [instance],
+                instance.get_job_entries(work_request.id),
+                instance.get_job_result(work_request.id),
+            )
+
+            return None
+
+        # NOTE: WorkRequests are scanned header-only, this lazily loads the payload
+        if work_request.request_payload is None:
+            raise Exception(
+                "Failed to load payload for WorkRequest [%d]" % work_request.id
+            )
+
         job_submission_process: JobSubmissionProcess = instance.job_submission_process
         job_status: JobStatus = job_submission_process.job_status
-        job_result: JobResult = job_submission_process.job_result
         job_submission_timestamp: str | None = (
             job_submission_process.job_submission_timestamp
         )
@@ -253,11 +478,10 @@ class WorkRequestWorker(Thread):
             job_submission_process.job_completion_timestamp
         )
         job_status_reason: str | None = job_submission_process.job_status_reason
-        job_has_cached_results: bool = len(work_request.request_payload.entries) != len(
-            instance.job_submission_entries
-        )
-        job_non_cached_inputs: list[str] | None = (
-            job_submission_process.job_entries if job_has_cached_results else None
+        job_result: JobResult = instance.get_job_result(work_request.id)
+        job_entries: list[str] | None = instance.get_job_entries(work_request.id)
+        job_has_cached_results: bool = WorkRequestWorker._has_cached_results(
+            work_request, job_entries
         )
 
         try:
@@ -271,7 +495,7 @@ class WorkRequestWorker(Thread):
                     instance,
                     job_result,
                     has_cached_results=job_has_cached_results,
-                    non_cached_inputs=job_non_cached_inputs,
+                    non_cached_inputs=job_entries,
                 )
             elif job_status == JobStatus.FAILED:
                 updated_work_request = self._process_failed_job(
@@ -287,7 +511,15 @@ class WorkRequestWorker(Thread):
                     % (work_request.id, job_status),
                 )
 
-            instance.kill()
+            if not instance.mark_work_request_processed(work_request.id):
+                # NOTE: batched job, the instance is kept till all its WorkRequests are processed
+                return updated_work_request
+
+            if job_status == JobStatus.COMPLETED:
+                # NOTE: kills the instance, unless the model keeps its instances warm
+                instance.release()
+            else:
+                instance.kill()
 
             return updated_work_request
         except:
@@ -297,6 +529,228 @@ class WorkRequestWorker(Thread):
                 % (work_request.id, repr(exc_info())),
             )
 
+            instance.kill()
+            SingleFlightRegistry.instance().release(work_request.id)
+
+            try:
+                return self._controller.mark_workrequest_failed(
+                    work_request, repr(exc_info())
+                )
+            except:
+                pass
+
+            return None
+
+    # the job completed, but the in-flight inputs shared with another WorkRequest failed
+    # NOTE: the job's own results are still handed to the WorkRequests waiting for them
+    def _requeue_failed_shared_inputs(
+        self,
+        work_request: WorkRequest,
+        instances: List[ModelInstanceHandler],
+        job_entries: List[str] | None,
+        job_result: JobResult | None,
+    ):
+        ContextLogger.warn(
+            self._logger_key,
+            "Shared in-flight inputs of WorkRequest [%d] failed, requeueing"
+            % work_request.id,
+        )
+
+        if (
+            job_entries is not None
+            and job_result is not None
+            and len(job_entries) == len(job_result)
+        ):
+            SingleFlightRegistry.instance().complete(
+                work_request.model_id, work_request.id, job_entries, job_result
+            )
+
+        self._release_claimed_request(work_request, "SHARED INPUTS FAILED")
+
+        for instance in instances:
+            if instance.mark_work_request_processed(work_request.id):
+                instance.release()
+
+    # returns True if the failed shards could be re-submitted
+    def _retry_failed_shards(
+        self, work_request: WorkRequest, failed_instances: List[ModelInstanceHandler]
+    ) -> bool:
+        if any(
+            map(lambda i: i.shard_attempt >= self._shard_max_retries, failed_instances)
+        ):
+            return False
+
+        for instance in failed_instances:
+            ContextLogger.warn(
+                self._logger_key,
+                "Shard [%d] of WorkRequest [%d] failed, retrying (attempt [%d])"
+                % (instance.shard_index, work_request.id, instance.shard_attempt + 1),
+            )
+
+            try:
+                ModelInstanceController.instance().retry_shard(instance)
+            except ModelInstanceCapacityException:
+                ContextLogger.warn(
+                    self._logger_key,
+                    "Failed to retry shard [%d] of WorkRequest [%d], error = [%s]"
+                    % (instance.shard_index, work_request.id, repr(exc_info())),
+                )
+
+                return False
+
+        return True
+
+    def _handle_sharded_processing_work_request(
+        self, work_request: WorkRequest, instances: List[ModelInstanceHandler]
+    ) -> WorkRequest:
+        ContextLogger.trace(
+            self._logger_key,
+            "Handling sharded [PROCESSING] workrequest [%d] with [%d] shards..."
+            % (work_request.id, len(instances)),
+        )
+
+        failed_instances = list(
+            filter(
+                lambda i: (
+                    i.is_job_completed()
+                    and i.job_submission_process.job_status != JobStatus.COMPLETED
+                )
+                or (not i.is_job_completed() and not i.is_active()),
+                instances,
+            )
+        )
+        running_instances = list(
+            filter(lambda i: not i.is_job_completed() and i.is_active(), instances)
+        )
+
+        if len(failed_instances) > 0 and self._retry_failed_shards(
+            work_request, failed_instances
+        ):
+            return work_request
+
+        if len(failed_instances) == 0 and len(running_instances) > 0:
+            ContextLogger.debug(
+                self._logger_key,
+                "Still waiting for [%d] of [%d] shards to complete for workrequest [%s]"
+                % (len(running_instances), len(instances), str(work_request.id)),
+            )
+
+            return work_request
+
+        single_flight_state = (
+            SingleFlightRegistry.instance().state(work_request.id)
+            if len(failed_instances) == 0
+            else None
+        )
+
+        if single_flight_state == SingleFlightState.PENDING:
+            ContextLogger.debug(
+                self._logger_key,
+                "Still waiting for shared in-flight inputs for workrequest [%s]"
+                % str(work_request.id),
+            )
+
+            return work_request
+
+        if single_flight_state == SingleFlightState.FAILED:
+            shard_entries: list[str] = []
+            shard_results: JobResult = []
+
+            for instance in instances:
+                shard_entries.extend(instance.job_submission_entries)
+                shard_results.extend(instance.get_job_result(work_request.id) or [])
+
+            self._requeue_failed_shared_inputs(
+                work_request, instances, shard_entries, shard_results
+            )
+
+            return None
+
+        # NOTE: WorkRequests are scanned header-only, this lazily loads the payload
+        if work_request.request_payload is None:
+            raise Exception(
+                "Failed to load payload for WorkRequest [%d]" % work_request.id
+            )
+
+        try:
+            updated_work_request: WorkRequest = work_request.copy()
+            updated_work_request.job_submission_timestamp = min(
+                map(
+                    lambda i: i.job_submission_process.job_submission_timestamp or "",
+                    instances,
+                )
+            )
+            updated_work_request.pod_ready_timestamp = max(
+                map(lambda i: i.pod_ready_timestamp or "", instances)
+            )
+
+            job_entries: list[str] = []
+
+            for instance in instances:
+                job_entries.extend(instance.job_submission_entries)
+
+            job_has_cached_results: bool = WorkRequestWorker._has_cached_results(
+                work_request, job_entries
+            )
+
+            if len(failed_instances) > 0:
+                # NOTE: a single failed shard fails the whole WorkRequest
+                updated_work_request = self._process_failed_job(
+                    updated_work_request,
+                    has_cached_results=job_has_cached_results,
+                    reason="Shard [%d] failed: %s"
+                    % (
+                        failed_instances[0].shard_index,
+                        (
+                            "instance terminated"
+                            if failed_instances[0].job_submission_process is None
+                            else failed_instances[0].job_submission_process.job_status_reason
+                        ),
+                    ),
+                )
+
+                for instance in instances:
+                    instance.kill()
+
+                return updated_work_request
+
+            # merge the shard results, in input order
+            job_result: JobResult = []
+
+            for instance in instances:
+                shard_result = instance.get_job_result(work_request.id)
+
+                if shard_result is None:
+                    raise Exception(
+                        "Shard [%d] result is empty" % instance.shard_index
+                    )
+
+                job_result.extend(shard_result)
+
+            updated_work_request = self._process_completed_job(
+                updated_work_request,
+                instances[0],
+                job_result,
+                has_cached_results=job_has_cached_results,
+                non_cached_inputs=job_entries,
+            )
+
+            for instance in instances:
+                instance.release()
+
+            return updated_work_request
+        except:
+            ContextLogger.error(
+                self._logger_key,
+                "Failed to handle sharded [PROCESSING] request [%d], error = [%s]"
+                % (work_request.id, repr(exc_info())),
+            )
+
+            for instance in instances:
+                instance.kill()
+
+            SingleFlightRegistry.instance().release(work_request.id)
+
             try:
                 return self._controller.mark_workrequest_failed(
                     work_request, repr(exc_info())
@@ -317,11 +771,11 @@ class WorkRequestWorker(Thread):
                     % work_request.id,
                 )
 
-                instance = ModelInstanceController.instance().get_instance(
+                instances = ModelInstanceController.instance().get_instances(
                     work_request.model_id, work_request.id
                 )
 
-                if instance is None:
+                if len(instances) == 0:
                     ContextLogger.warn(
                         self._logger_key,
                         "Failed to find instance for request_id = [%d]"
@@ -334,13 +788,19 @@ class WorkRequestWorker(Thread):
                         % work_request.id,
                     )
 
+                    SingleFlightRegistry.instance().release(work_request.id)
                     updated_work_request = self._controller.mark_workrequest_failed(
                         work_request
                     )
 
                     continue
 
-                self._handle_processing_work_request(work_request, instance)
+                if instances[0].shard_index is not None:
+                    self._handle_sharded_processing_work_request(
+                        work_request, instances
+                    )
+                else:
+                    self._handle_processing_work_request(work_request, instances[0])
             except:
                 ContextLogger.error(
                     self._logger_key,
@@ -354,6 +814,8 @@ class WorkRequestWorker(Thread):
 
     def _handle_scheduling_requests(self, work_requests: List[WorkRequest]):
         ContextLogger.debug(self._logger_key, "Handling [SCHEDULING] requests...")
+        # persisted in a single bulk update, once all requests are handled
+        updates: List[WorkRequest] = []
 
         for work_request in work_requests:
             try:
@@ -363,32 +825,63 @@ class WorkRequestWorker(Thread):
                     % work_request.id,
                 )
 
+                # waiting for inputs in-flight for other WorkRequests, see SingleFlightRegistry
+                if SingleFlightRegistry.instance().shares_all_inputs(work_request.id):
+                    single_flight_state = SingleFlightRegistry.instance().state(
+                        work_request.id
+                    )
+
+                    if single_flight_state == SingleFlightState.PENDING:
+                        continue
+
+                    if single_flight_state == SingleFlightState.READY:
+                        self._complete_from_shared_inputs(work_request)
+
+                        continue
+
+                    ContextLogger.warn(
+                        self._logger_key,
+                        "Shared in-flight inputs of WorkRequest [%d] failed, moving back to [QUEUED]"
+                        % work_request.id,
+                    )
+
+                    SingleFlightRegistry.instance().release(work_request.id)
+                    work_request.request_status = WorkRequestStatus.QUEUED
+                    work_request.request_status_reason = "SHARED INPUTS FAILED"
+                    updates.append(work_request)
+
+                    continue
+
                 # ignore recently created requests
-                if is_date_in_range_from_now(work_request.last_updated, "-2m"):
+                if is_date_in_range_from_now(
+                    work_request.last_updated, f"-{self._scheduling_grace_period}"
+                ):
                     continue
 
-                instance = ModelInstanceController.instance().get_instance(
+                instances = ModelInstanceController.instance().get_instances(
                     work_request.model_id, work_request.id
                 )
 
-                if instance is None:
+                if len(instances) == 0:
                     ContextLogger.warn(
                         self._logger_key,
                         "Failed to find instance for request_id = [%d]. Assuming process failed, moving back to [QUEUED]"
                         % work_request.id,
                     )
 
+                    SingleFlightRegistry.instance().release(work_request.id)
                     work_request.request_status = WorkRequestStatus.QUEUED
                     work_request.request_status_reason = (
                         "FAILED TO FIND REQUESTED INSTANCE"
                     )
-                elif not instance.is_active():
+                elif not all(map(lambda i: i.is_active(), instances)):
                     ContextLogger.warn(
                         self._logger_key,
                         "Instance for request_id = [%d] in in-active state. Assuming process failed, moving back to [QUEUED]"
                         % work_request.id,
                     )
 
+                    SingleFlightRegistry.instance().release(work_request.id)
                     work_request.request_status = WorkRequestStatus.QUEUED
                     work_request.request_status_reason = (
                         "INSTANCE UNEXPECTED IN-ACTIVE STATE"
@@ -401,14 +894,7 @@ class WorkRequestWorker(Thread):
                     )
                     work_request.request_status = WorkRequestStatus.PROCESSING
 
-                updated_work_request = self._controller.update_request(
-                    work_request, retry_count=1
-                )
-
-                if updated_work_request is None:
-                    raise Exception(
-                        "Failed to update WorkRequest [%d]" % work_request.id
-                    )
+                updates.append(work_request)
             except:
                 ContextLogger.error(
                     self._logger_key,
@@ -420,12 +906,56 @@ class WorkRequestWorker(Thread):
                 )
                 traceback.print_exc(file=stdout)
 
-    def _handle_work_request_cache(self, work_request: WorkRequest) -> list[str]:
-        work_request_entries = (
-            work_request.request_payload.entries
-            if not work_request.request_payload.has_header
-            else work_request.request_payload.entries[1:]
+        if len(updates) == 0:
+            return
+
+        for work_request, updated_work_request in zip(
+            updates, self._controller.update_requests(updates)
+        ):
+            if updated_work_request is None:
+                ContextLogger.error(
+                    self._logger_key,
+                    "Failed to update [SCHEDULING] WorkRequest [%d]" % work_request.id,
+                )
+
+    # all inputs of the WorkRequest were computed by other WorkRequests' jobs (or cached)
+    def _complete_from_shared_inputs(self, work_request: WorkRequest):
+        # NOTE: WorkRequests are scanned header-only, this lazily loads the payload
+        if work_request.request_payload is None:
+            raise Exception(
+                "Failed to load payload for WorkRequest [%d]" % work_request.id
+            )
+
+        shared_inputs, shared_results = SingleFlightRegistry.instance().collect(
+            work_request.id
         )
+        payload_entries = WorkRequestWorker._payload_entries(work_request)
+
+        if WorkRequestWorker._has_cached_results(work_request, shared_inputs):
+            job_result = ModelInputCache.instance().hydrate_job_result_with_cached_results(
+                work_request.id, payload_entries, shared_inputs, shared_results
+            )
+
+            try:
+                ModelInputCache.instance().clear_work_request_cached_results(
+                    work_request.id
+                )
+            except:
+                ContextLogger.warn(self._logger_key, repr(exc_info()))
+        else:
+            job_result = ModelInputCache.instance().consolidate_results(
+                payload_entries, shared_inputs, shared_results, []
+            )
+
+        ContextLogger.info(
+            self._logger_key,
+            "Request completed by shared in-flight inputs [%d]" % work_request.id,
+        )
+
+        self._hand_off_result(work_request, job_result)
+
+    def _handle_work_request_cache(self, work_request: WorkRequest) -> list[str]:
+        work_request_entries = WorkRequestWorker._payload_entries(work_request)
 
         if (
             not ModelController.instance()
@@ -435,28 +965,19 @@ class WorkRequestWorker(Thread):
             return work_request_entries
 
         try:
-            cached_results = ModelInputCache.instance().lookup_model_results(
+            reconciliation = ModelInputCache.instance().reconcile_model_results(
                 work_request.model_id, work_request_entries
             )
+            cached_results = reconciliation.cached_records()
 
             if len(cached_results) == 0:
                 return work_request_entries
 
-            non_cached_entries = list(
-                filter(
-                    lambda input: not any(
-                        map(
-                            lambda cached_result: input == cached_result.input,
-                            cached_results,
-                        )
-                    ),
-                    work_request_entries,
-                )
-            )
+            non_cached_entries = reconciliation.non_cached_inputs()
 
             if len(non_cached_entries) > 0:
                 if not ModelInputCache.instance().persist_cached_workrequest_results(
-                    work_request.id, cached_results
+                    work_request.id, work_request_entries, cached_results
                 ):
                     raise Exception(
                         "Failed to persist cached WorkRequest [%d] results, ignoring cache"
@@ -469,11 +990,7 @@ class WorkRequestWorker(Thread):
                 work_request_entries, [], [], cached_results
             )
 
-            if not self._upload_result_to_s3(work_request, job_result):
-                sleep(20)
-
-                if not self._upload_result_to_s3(work_request, job_result):
-                    raise Exception("Failed to upload result to S3, twice")
+            self._hand_off_result(work_request, job_result)
 
             return []
         except:
@@ -483,60 +1000,81 @@ class WorkRequestWorker(Thread):
             )
             traceback.print_exc(file=stdout)
 
-            return work_request.request_payload.entries
+            return work_request_entries
+
+    def _release_claimed_request(self, work_request: WorkRequest, reason: str):
+        self._release_claimed_requests([(work_request, reason)])
 
+    # releases the claimed WorkRequests back to QUEUED, in a single bulk update
+    def _release_claimed_requests(self, releases: List[Tuple[WorkRequest, str]]):
+        if len(releases) == 0:
+            return
+
+        for work_request, reason in releases:
+            SingleFlightRegistry.instance().release(work_request.id)
+            work_request.request_status = WorkRequestStatus.QUEUED
+            work_request.request_status_reason = reason
+            work_request.server_id = None
+
+        updated_work_requests = self._controller.update_requests(
+            list(map(lambda r: r[0], releases))
+        )
+
+        for (work_request, _), updated_work_request in zip(
+            releases, updated_work_requests
+        ):
+            if updated_work_request is None:
+                ContextLogger.error(
+                    self._logger_key,
+                    "Failed to release claimed WorkRequest [%d]" % work_request.id,
+                )
+
+    # NOTE: work_requests are expected to be claimed already (SCHEDULING, with this server's id)
     def _handle_queued_requests(self, work_requests: List[WorkRequest]):
         ContextLogger.debug(self._logger_key, "Handling [QUEUED] requests...")
 
-        # skip list based on failed instance creation, NOT due to job submit failures
-        skipped_model_ids: Set[str] = set()
+        # released in a single bulk update, once all requests are handled
+        releases: List[Tuple[WorkRequest, str]] = []
 
         for work_request in work_requests:
-            if work_request.model_id in skipped_model_ids:
+            # skipped after failed instance creation, NOT due to job submit failures
+            if self._is_model_skipped(work_request.model_id):
                 ContextLogger.warn(
                     self._logger_key,
                     "Skipping WorkRequest [%d] with model id = [%s]"
                     % (work_request.id, work_request.model_id),
                 )
+                releases.append((work_request, "SKIPPED"))
                 continue
 
             if ModelInstanceController.instance().max_instances_limit_reached():
                 ContextLogger.warn(
                     self._logger_key,
-                    "Max Concurrent Model Instances reached, skipping queued WorkRequests",
+                    "Max Concurrent Model Instances reached, releasing claimed WorkRequest [%d]"
+                    % work_request.id,
                 )
-                return
-
-            updated_work_request: WorkRequest = None
+                releases.append((work_request, "MAX CONCURRENT INSTANCES REACHED"))
+                continue
 
-            try:
-                work_request.request_status = WorkRequestStatus.SCHEDULING
-                work_request.server_id = ServerController.instance().server_id
-                updated_work_request = self._controller.update_request(
-                    work_request, expect_null_server_id=True, retry_count=0
+            if not ModelInstanceController.instance().has_capacity(
+                work_request.model_id
+            ):
+                ContextLogger.warn(
+                    self._logger_key,
+                    "Model [%s] capacity reached, releasing claimed WorkRequest [%d]"
+                    % (work_request.model_id, work_request.id),
                 )
+                releases.append((work_request, "MODEL CAPACITY REACHED"))
+                continue
 
-                if updated_work_request is None:
-                    raise Exception(
-                        "Failed to persist updated WorkRequest [%d]" % work_request.id
-                    )
+            updated_work_request: WorkRequest = work_request
 
+            try:
                 non_cached_inputs = self._handle_work_request_cache(
                     updated_work_request
                 )
 
                 if len(non_cached_inputs) == 0:
-                    updated_work_request.request_status = WorkRequestStatus.COMPLETED
-                    updated_work_request.processed_timestamp = utc_now()
-                    updated_work_request = self._controller.update_request(
-                        updated_work_request, retry_count=1
-                    )
-
-                    if updated_work_request is None:
-                        raise Exception(
-                            "Failed to update WorkRequest [%d]" % work_request.id
-                        )
-
                     ContextLogger.info(
                         self._logger_key,
                         "Request completed by cached results [%d]" % work_request.id,
@@ -544,55 +1082,37 @@ class WorkRequestWorker(Thread):
 
                     continue
 
-                work_request_entries = (
-                    work_request.request_payload.entries
-                    if not work_request.request_payload.has_header
-                    else work_request.request_payload.entries[1:]
+                job_submission_entries = WorkRequestWorker._unique_entries(
+                    non_cached_inputs
                 )
 
-                instance = ModelInstanceController.instance().request_instance(
-                    work_request.model_id,
-                    str(work_request.id),
-                    ignore_max_concurrent_limit=True,
-                    job_submission_entries=(
-                        work_request_entries
-                        if non_cached_inputs is None or len(non_cached_inputs) == 0
-                        else non_cached_inputs
-                    ),
-                    work_request_controller=self._controller,
-                )
-
-                if instance is None:
-                    ContextLogger.warn(
+                if len(job_submission_entries) < len(non_cached_inputs):
+                    ContextLogger.debug(
                         self._logger_key,
-                        "Failed to acquire instance for WorkRequest [%d]. Setting status to [QUEUED] and adding model id [%s] to skip list"
-                        % (work_request.id, work_request.model_id),
+                        "Removed [%d] duplicate inputs from WorkRequest [%d]"
+                        % (
+                            len(non_cached_inputs) - len(job_submission_entries),
+                            work_request.id,
+                        ),
                     )
-                    skipped_model_ids.add(work_request.model_id)
 
-                    updated_work_request.request_status = WorkRequestStatus.QUEUED
-                    updated_work_request.request_status_reason = (
-                        "FAILED TO ACQUIRE MODEL INSTANCE"
-                    )
-                    updated_work_request = self._controller.update_request(
-                        updated_work_request, retry_count=1
+                # inputs in-flight for other WorkRequests are not submitted again,
+                #   their results are collected once the other jobs completed
+                job_submission_entries, shared_entries = (
+                    SingleFlightRegistry.instance().acquire(
+                        work_request.model_id, work_request.id, job_submission_entries
                     )
-
-                    if updated_work_request is None:
-                        raise Exception("Failed to persist updated WorkRequest")
-
-                    continue
-
-                updated_work_request.request_status = WorkRequestStatus.PROCESSING
-                updated_work_request = self._controller.update_request(
-                    updated_work_request, retry_count=0
                 )
 
-                if updated_work_request is None:
-                    raise Exception("Failed to persist updated WorkRequest")
+                if len(job_submission_entries) == 0:
+                    # NOTE: stays [SCHEDULING], see _handle_scheduling_requests
+                    ContextLogger.info(
+                        self._logger_key,
+                        "WorkRequest [%d] waiting for [%d] shared in-flight inputs"
+                        % (work_request.id, len(shared_entries)),
+                    )
 
-                if not instance.wait_for_pod_created(timeout=30):
-                    raise Exception("Pod failed to create within [30]s")
+                    continue
             except:
                 ContextLogger.error(
                     self._logger_key,
@@ -604,36 +1124,399 @@ class WorkRequestWorker(Thread):
                 )
                 traceback.print_exc(file=stdout)
 
-                # set request status to FAILED if job submission failed
-                if updated_work_request is not None and (
-                    updated_work_request.request_status == WorkRequestStatus.SCHEDULING
-                    or updated_work_request.request_status
-                    == WorkRequestStatus.PROCESSING
-                ):
-                    try:
-                        self._controller.mark_workrequest_failed(
-                            updated_work_request, repr(exc_info())
-                        )
-                    except:
-                        ContextLogger.error(
-                            self._logger_key,
-                            "Failed to mark WorkRequest [%s] failed, error = [%s]"
-                            % (str(updated_work_request.id), repr(exc_info())),
+                self._mark_failed(updated_work_request, repr(exc_info()))
+
+                continue
+
+            if self._can_batch(job_submission_entries):
+                self._add_to_pending_batch(work_request, job_submission_entries)
+
+                continue
+
+            shard_count = self._shard_count(
+                work_request.model_id, job_submission_entries
+            )
+
+            if shard_count > 1:
+                self._schedule_sharded_job(
+                    work_request, job_submission_entries, shard_count
+                )
+            elif not self._schedule_job(
+                work_request.model_id, [(work_request, job_submission_entries)]
+            ):
+                self._skip_model(work_request.model_id)
+
+        self._release_claimed_requests(releases)
+        self._flush_pending_batches()
+
+    def _mark_failed(self, work_request: WorkRequest | None, reason: str):
+        # set request status to FAILED if job submission failed
+        if work_request is None or (
+            work_request.request_status != WorkRequestStatus.SCHEDULING
+            and work_request.request_status != WorkRequestStatus.PROCESSING
+        ):
+            return
+
+        SingleFlightRegistry.instance().release(work_request.id)
+
+        try:
+            self._controller.mark_workrequest_failed(work_request, reason)
+        except:
+            ContextLogger.error(
+                self._logger_key,
+                "Failed to mark WorkRequest [%s] failed, error = [%s]"
+                % (str(work_request.id), repr(exc_info())),
+            )
+
+    # returns False if no instance could be acquired for the model
+    def _schedule_job(
+        self, model_id: str, batch: List[Tuple[WorkRequest, List[str]]]
+    ) -> bool:
+        leader_work_request = batch[0][0]
+        job_batch: List[JobBatchEntry] | None = (
+            None
+            if len(batch) == 1
+            else JobBatchEntry.build_batch(
+                list(map(lambda b: (str(b[0].id), b[1]), batch))
+            )
+        )
+        job_submission_entries = (
+            batch[0][1]
+            if job_batch is None
+            else JobBatchEntry.batch_entries(job_batch)
+        )
+        work_request_ids = ", ".join(map(lambda b: str(b[0].id), batch))
+
+        if job_batch is not None:
+            ContextLogger.info(
+                self._logger_key,
+                "Batching WorkRequests [%s] into a single job with [%d] entries"
+                % (work_request_ids, len(job_submission_entries)),
+            )
+
+        try:
+            # prefer a warm (idle) instance of the same model over a new pod
+            instance = ModelInstanceController.instance().acquire_idle_instance(
+                model_id,
+                str(leader_work_request.id),
+                job_submission_entries,
+                work_request_controller=self._controller,
+                job_batch=job_batch,
+            )
+
+            if instance is not None:
+                ContextLogger.info(
+                    self._logger_key,
+                    "Re-using warm instance for WorkRequests [%s]" % work_request_ids,
+                )
+
+                if instance.prewarmed:
+                    ModelPrewarmer.instance().record_hit(model_id)
+            else:
+                try:
+                    instance = ModelInstanceController.instance().request_instance(
+                        model_id,
+                        str(leader_work_request.id),
+                        job_submission_entries=job_submission_entries,
+                        work_request_controller=self._controller,
+                        job_batch=job_batch,
+                    )
+                    ModelPrewarmer.instance().record_cold_start(model_id)
+                except ModelInstanceCapacityException:
+                    # NOTE: another worker took the capacity since it was checked
+                    ContextLogger.warn(
+                        self._logger_key,
+                        "Capacity reached for WorkRequests [%s], error = [%s]"
+                        % (work_request_ids, repr(exc_info())),
+                    )
+
+            if instance is None:
+                ContextLogger.warn(
+                    self._logger_key,
+                    "Failed to acquire instance for WorkRequests [%s]. Setting status to [QUEUED] and adding model id [%s] to skip list"
+                    % (work_request_ids, model_id),
+                )
+
+                self._release_claimed_requests(
+                    list(
+                        map(
+                            lambda b: (b[0], "FAILED TO ACQUIRE MODEL INSTANCE"),
+                            batch,
                         )
+                    )
+                )
+
+                return False
+
+            for work_request, _ in batch:
+                work_request.request_status = WorkRequestStatus.PROCESSING
+
+            updated_work_requests = self._controller.update_requests(
+                list(map(lambda b: b[0], batch))
+            )
+
+            if any(map(lambda x: x is None, updated_work_requests)):
+                raise Exception(
+                    "Failed to persist updated WorkRequests [%s]" % work_request_ids
+                )
+
+            if not instance.wait_for_pod_created(timeout=30):
+                raise Exception("Pod failed to create within [30]s")
+        except:
+            ContextLogger.error(
+                self._logger_key,
+                "Failed to handle [QUEUED] WorkRequests [%s], error = [%s]"
+                % (
+                    work_request_ids,
+                    repr(exc_info()),
+                ),
+            )
+            traceback.print_exc(file=stdout)
+
+            for work_request, _ in batch:
+                self._mark_failed(work_request, repr(exc_info()))
+
+        return True
+
+    # K = min(model max shards, available capacity, entries / min shard size)
+    def _shard_count(self, model_id: str, job_submission_entries: List[str]) -> int:
+        model = ModelController.instance().get_model(model_id)
+
+        if model is None or model.details.max_shards <= 1:
+            return 1
+
+        return max(
+            1,
+            min(
+                model.details.max_shards,
+                ModelInstanceController.instance().available_model_instances_count(
+                    model_id
+                ),
+                ceil(len(job_submission_entries) / max(1, self._shard_min_size)),
+            ),
+        )
+
+    def _schedule_sharded_job(
+        self,
+        work_request: WorkRequest,
+        job_submission_entries: List[str],
+        shard_count: int,
+    ):
+        # contiguous shards, so the results can be merged in input order
+        shard_size = ceil(len(job_submission_entries) / shard_count)
+        shards = [
+            job_submission_entries[i : i + shard_size]
+            for i in range(0, len(job_submission_entries), shard_size)
+        ]
+
+        ContextLogger.info(
+            self._logger_key,
+            "Sharding WorkRequest [%d] with [%d] entries across [%d] instances"
+            % (work_request.id, len(job_submission_entries), len(shards)),
+        )
+
+        instances: List[ModelInstanceHandler] = []
+
+        try:
+            try:
+                instances = (
+                    ModelInstanceController.instance().request_sharded_instances(
+                        work_request.model_id,
+                        str(work_request.id),
+                        shards,
+                        work_request_controller=self._controller,
+                    )
+                )
+            except ModelInstanceCapacityException:
+                ContextLogger.warn(
+                    self._logger_key,
+                    "Capacity reached for sharded WorkRequest [%d], releasing it, error = [%s]"
+                    % (work_request.id, repr(exc_info())),
+                )
+                self._release_claimed_request(work_request, "MODEL CAPACITY REACHED")
+                self._skip_model(work_request.model_id)
+
+                return
+
+            work_request.request_status = WorkRequestStatus.PROCESSING
+
+            if self._controller.update_request(work_request, retry_count=0) is None:
+                raise Exception(
+                    "Failed to persist updated WorkRequest [%d]" % work_request.id
+                )
+
+            for instance in instances:
+                if not instance.wait_for_pod_created(timeout=30):
+                    raise Exception(
+                        "Pod for shard [%d] failed to create within [30]s"
+                        % instance.shard_index
+                    )
+        except:
+            ContextLogger.error(
+                self._logger_key,
+                "Failed to handle sharded [QUEUED] WorkRequest [%d], error = [%s]"
+                % (work_request.id, repr(exc_info())),
+            )
+            traceback.print_exc(file=stdout)
+
+            for instance in instances:
+                instance.kill()
+
+            self._mark_failed(work_request, repr(exc_info()))
+
+    def _can_batch(self, job_submission_entries: List[str]) -> bool:
+        return (
+            self._batch_max_size > 0
+            and len(job_submission_entries) <= self._batch_request_max_size
+            and len(job_submission_entries) < self._batch_max_size
+        )
+
+    def _add_to_pending_batch(
+        self, work_request: WorkRequest, job_submission_entries: List[str]
+    ):
+        model_id = work_request.model_id
+
+        if model_id not in self._pending_batches:
+            self._pending_batches[model_id] = []
+            self._pending_batch_start[model_id] = datetime.now().timestamp()
+
+        pending_batch = self._pending_batches[model_id]
+        pending_size = sum(map(lambda b: len(b[1]), pending_batch))
+
+        # batch is full, submit it and start a new one
+        if pending_size + len(job_submission_entries) > self._batch_max_size:
+            self._flush_pending_batch(model_id)
+            self._add_to_pending_batch(work_request, job_submission_entries)
+
+            return
+
+        pending_batch.append((work_request, job_submission_entries))
+
+    def _flush_pending_batch(self, model_id: str):
+        pending_batch = self._pending_batches.pop(model_id, [])
+        self._pending_batch_start.pop(model_id, None)
+
+        if len(pending_batch) == 0:
+            return
+
+        if not ModelInstanceController.instance().has_capacity(model_id):
+            ContextLogger.warn(
+                self._logger_key,
+                "Model [%s] capacity reached, releasing pending batch" % model_id,
+            )
+
+            self._release_claimed_requests(
+                list(
+                    map(
+                        lambda b: (b[0], "MAX CONCURRENT INSTANCES REACHED"),
+                        pending_batch,
+                    )
+                )
+            )
+
+            return
+
+        if not self._schedule_job(model_id, pending_batch):
+            self._skip_model(model_id)
+
+    def _flush_pending_batches(self):
+        now = datetime.now().timestamp()
+
+        for model_id in list(self._pending_batches.keys()):
+            pending_size = sum(map(lambda b: len(b[1]), self._pending_batches[model_id]))
+
+            if (
+                pending_size < self._batch_max_size
+                and now - self._pending_batch_start[model_id] < self._batch_wait_time
+            ):
+                continue
+
+            self._flush_pending_batch(model_id)
+
+    def _release_pending_batches(self):
+        releases: List[Tuple[WorkRequest, str]] = []
+
+        for model_id in list(self._pending_batches.keys()):
+            for work_request, _ in self._pending_batches.pop(model_id):
+                releases.append((work_request, "WORKER STOPPED"))
+
+        self._pending_batch_start.clear()
+        self._release_claimed_requests(releases)
+
+    def _claim_queued_requests(self) -> List[WorkRequest]:
+        claim_limit = min(
+            self._claim_batch_size,
+            ModelInstanceController.instance().available_instances_count(),
+        )
+
+        if claim_limit <= 0:
+            ContextLogger.debug(
+                self._logger_key,
+                "Max Concurrent Model Instances reached, not claiming queued WorkRequests",
+            )
+
+            return []
+
+        # only claim for models that can still get an instance
+        model_ids = list(
+            filter(
+                lambda model_id: not self._is_model_skipped(model_id)
+                and ModelInstanceController.instance().has_capacity(model_id),
+                self.model_ids,
+            )
+        )
+
+        return self._controller.claim_requests(model_ids, claim_limit)
+
+    # an idle worker claims QUEUED requests of other (overloaded) workers' models
+    # NOTE: the owning worker handles the stolen requests once they are PROCESSING
+    def _steal_queued_requests(self) -> List[WorkRequest]:
+        claim_limit = min(
+            self._claim_batch_size,
+            ModelInstanceController.instance().available_instances_count(),
+        )
+
+        if claim_limit <= 0:
+            return []
+
+        model_ids = list(
+            filter(
+                lambda model_id: not self._is_model_skipped(model_id)
+                and ModelInstanceController.instance().has_capacity(model_id),
+                self._controller.get_stealable_model_ids(list(self.model_ids)),
+            )
+        )
+
+        if len(model_ids) == 0:
+            return []
+
+        stolen_requests = self._controller.claim_requests(model_ids, claim_limit)
+
+        if len(stolen_requests) > 0:
+            ContextLogger.info(
+                self._logger_key,
+                "Stole [%d] QUEUED WorkRequests from models [%s]"
+                % (len(stolen_requests), ", ".join(model_ids)),
+            )
+
+        return stolen_requests
 
     def _handle_work_requests(self):
+        SingleFlightRegistry.instance().expire()
+
         ContextLogger.debug(self._logger_key, "Loading WorkRequests from DB...")
+        # NOTE: QUEUED requests are claimed separately, see _claim_queued_requests
         results: List[WorkRequest] = self._controller.get_requests(
             model_ids=self.model_ids,
             request_statuses=[
-                WorkRequestStatus.QUEUED.value,
                 WorkRequestStatus.SCHEDULING.value,
                 WorkRequestStatus.PROCESSING.value,
+                WorkRequestStatus.UPLOADING.value,
             ],
             server_ids=[
-                "NULL",
                 ServerController.instance().server_id,
             ],
+            include_payload=False,
         )
         ContextLogger.debug(self._logger_key, "WorkRequests loaded from DB.")
 
@@ -650,8 +1533,48 @@ class WorkRequestWorker(Thread):
                 self._handle_processing_work_requests(requests)
             elif status == WorkRequestStatus.SCHEDULING:
                 self._handle_scheduling_requests(requests)
-            elif status == WorkRequestStatus.QUEUED:
-                self._handle_queued_requests(requests)
+
+        self._handle_uploading_requests(
+            list(
+                filter(
+                    lambda r: r.request_status == WorkRequestStatus.UPLOADING,
+                    results,
+                )
+            )
+        )
+
+        claimed_requests = self._claim_queued_requests()
+
+        if len(claimed_requests) == 0:
+            claimed_requests = self._steal_queued_requests()
+
+        if len(claimed_requests) > 0:
+            self._handle_queued_requests(claimed_requests)
+        else:
+            self._flush_pending_batches()
+
+    # requeues UPLOADING WorkRequests whose result upload is not pending (e.g. lost on restart)
+    def _handle_uploading_requests(self, work_requests: List[WorkRequest]):
+        releases: List[Tuple[WorkRequest, str]] = []
+
+        for work_request in work_requests:
+            if ResultUploadQueue.instance().is_pending(work_request.id):
+                continue
+
+            # NOTE: only requeued once orphaned for the timeout, the upload might have completed
+            #       after the WorkRequests were loaded
+            if is_date_in_range_from_now(
+                work_request.last_updated, f"-{self._upload_orphan_timeout}"
+            ):
+                continue
+
+            ContextLogger.warn(
+                self._logger_key,
+                "Requeueing orphaned [UPLOADING] WorkRequest [%d]" % work_request.id,
+            )
+            releases.append((work_request, "REQUEUED"))
+
+        self._release_claimed_requests(releases)
 
     def _handle_failed_work_requests(self):
         ContextLogger.debug(self._logger_key, "Loading failed WorkRequests from DB...")
@@ -681,6 +1604,7 @@ class WorkRequestWorker(Thread):
                 ModelInstanceController.instance().ensure_instance_terminated(
                     work_request.model_id, work_request.id
                 )
+                SingleFlightRegistry.instance().release(work_request.id)
             except:
                 ContextLogger.error(
                     self._logger_key,
@@ -696,7 +1620,7 @@ class WorkRequestWorker(Thread):
         ContextLogger.info(self._logger_key, "Controller started")
 
         while True:
-            if self._wait_or_kill(self._processing_wait_time):
+            if self._wait_for_work_or_kill():
                 break
 
             try:
@@ -709,4 +1633,6 @@ class WorkRequestWorker(Thread):
                 ContextLogger.error(self._logger_key, error_str)
                 traceback.print_exc(file=stdout)
 
+        self._release_pending_batches()
+
         ContextLogger.info(self._logger_key, "Controller stopped")
@@ -10,6 +10,10 @@ from python_framework.time import timestamp_to_utc_timestamp
 class ModelInputCacheQuery(Enum):
     DELETE_BY_USER_ID = "DELETE_BY_USER_ID"
     DELETE_BY_MODEL_ID = "DELETE_BY_MODEL_ID"
+    BULK_INSERT = "BULK_INSERT"
+    SELECT_INPUT_HASHES = "SELECT_INPUT_HASHES"
+    SELECT_INPUT_HASHES_SINCE = "SELECT_INPUT_HASHES_SINCE"
+    COUNT_BY_MODEL_ID = "COUNT_BY_MODEL_ID"
 
 
 class ModelInputCacheRecord(DAORecord):
@@ -54,6 +58,27 @@ class ModelInputCacheRecord(DAORecord):
         return super().generate_delete_query_args()
 
 
+class ModelInputCacheHashRecord(DAORecord):
+    input_hash: str
+
+    def __init__(self, result: dict):
+        super().__init__(result)
+
+        self.input_hash = result["inputhash"]
+
+    def generate_insert_query_args(self) -> Dict[str, Union[str, int, bool, float]]:
+        return super().generate_insert_query_args()
+
+    def generate_update_query_args(self) -> Dict[str, Union[str, int, bool, float]]:
+        return super().generate_update_query_args()
+
+    def generate_upsert_query_args(self) -> Dict[str, Union[str, int, bool, float]]:
+        return super().generate_upsert_query_args()
+
+    def generate_delete_query_args(self) -> Dict[str, Union[str, int, bool, float]]:
+        return super().generate_delete_query_args()
+
+
 class ModelInputCacheSelectBatchQuery(DAOQuery):
     model_id: str
     input_hashes: list[str]
@@ -92,6 +117,89 @@ class ModelInputCacheSelectBatchQuery(DAOQuery):
         return sql, field_map
 
 
+# NOTE: keyset pagination on the primary key, pass the last InputHash of the previous page as after_input_hash
+class ModelInputCacheSelectHashesQuery(DAOQuery):
+    model_id: str
+    after_input_hash: str | None
+    limit: int
+
+    def __init__(
+        self, model_id: str, after_input_hash: str | None = None, limit: int = 10000
+    ):
+        super().__init__(ModelInputCacheHashRecord)
+
+        self.model_id = model_id
+        self.after_input_hash = after_input_hash
+        self.limit = limit
+
+    def to_sql(self):
+        field_map = {
+            "query_ModelId": self.model_id,
+            "query_AfterInputHash": (
+                "" if self.after_input_hash is None else self.after_input_hash
+            ),
+            "query_Limit": self.limit,
+        }
+
+        sql = """
+            SELECT InputHash
+            FROM ModelInputCache
+            WHERE ModelId = :query_ModelId
+            AND InputHash > :query_AfterInputHash
+            ORDER BY InputHash
+            LIMIT :query_Limit
+        """
+
+        return sql, field_map
+
+
+# hashes of the entries cached since the given (utc) timestamp
+class ModelInputCacheSelectHashesSinceQuery(DAOQuery):
+    model_id: str
+    since: str
+
+    def __init__(self, model_id: str, since: str):
+        super().__init__(ModelInputCacheHashRecord)
+
+        self.model_id = model_id
+        self.since = since
+
+    def to_sql(self):
+        field_map = {
+            "query_ModelId": self.model_id,
+            "query_Since": self.since,
+        }
+
+        sql = """
+            SELECT InputHash
+            FROM ModelInputCache
+            WHERE ModelId = :query_ModelId
+            AND LastUpdated >= :query_Since
+        """
+
+        return sql, field_map
+
+
+class ModelInputCacheCountByModelQuery(DAOQuery):
+    def __init__(self, model_id: str):
+        super().__init__(CountRecord)
+
+        self.model_id = model_id
+
+    def to_sql(self):
+        field_map = {
+            "query_ModelId": self.model_id,
+        }
+
+        sql = """
+            SELECT count(*) as count
+            FROM ModelInputCache
+            WHERE ModelId = :query_ModelId
+        """
+
+        return sql, field_map
+
+
 class ModelInputCacheInsertQuery(DAOQuery):
     def __init__(
         self,
@@ -149,6 +257,62 @@ class ModelInputCacheInsertQuery(DAOQuery):
         return sql, field_map
 
 
+class ModelInputCacheBulkInsertQuery(DAOQuery):
+    def __init__(
+        self,
+        entries: list[Dict[str, Union[str, int, bool, float]]],
+    ):
+        super().__init__(CountRecord)
+
+        # NOTE: entries with model_id, input_hash, input, result and user_id
+        self.entries = entries
+
+    def to_sql(self):
+        field_map = {}
+        values = []
+
+        for index, entry in enumerate(self.entries):
+            field_map[f"query_ModelId_{index}"] = entry["model_id"]
+            field_map[f"query_InputHash_{index}"] = entry["input_hash"]
+            field_map[f"query_Input_{index}"] = entry["input"]
+            field_map[f"query_Result_{index}"] = entry["result"]
+            field_map[f"query_UserId_{index}"] = entry["user_id"]
+
+            values.append(
+                f"""(
+                    CAST(:query_ModelId_{index} AS text),
+                    CAST(:query_InputHash_{index} AS text),
+                    CAST(:query_Input_{index} AS text),
+                    CAST(:query_Result_{index} AS jsonb),
+                    CAST(:query_UserId_{index} AS text),
+                    CURRENT_TIMESTAMP
+                )"""
+            )
+
+        sql = """
+            WITH InsertedRecords AS (
+                INSERT INTO ModelInputCache (
+                    ModelId,
+                    InputHash,
+                    Input,
+                    Result,
+                    UserId,
+                    LastUpdated
+                )
+                VALUES %s
+                ON CONFLICT
+                DO NOTHING -- simply ignore conflicts, cache value SHOULD always be the same
+                RETURNING ModelId, InputHash
+            )
+            SELECT count(*) as count
+            FROM InsertedRecords
+        """ % ",".join(
+            values
+        )
+
+        return sql, field_map
+
+
 class ModelInputCacheDeleteByUserQuery(DAOQuery):
     def __init__(
         self,
@@ -210,4 +374,8 @@ class ModelInputCacheDAO(BaseDAO.DAO):
         BaseDAO.DELETE_QUERY_KEY: ModelInputCacheDeleteByUserQuery,
         ModelInputCacheQuery.DELETE_BY_USER_ID: ModelInputCacheDeleteByUserQuery,
         ModelInputCacheQuery.DELETE_BY_MODEL_ID: ModelInputCacheDeleteByModelQuery,
+        ModelInputCacheQuery.BULK_INSERT: ModelInputCacheBulkInsertQuery,
+        ModelInputCacheQuery.SELECT_INPUT_HASHES: ModelInputCacheSelectHashesQuery,
+        ModelInputCacheQuery.SELECT_INPUT_HASHES_SINCE: ModelInputCacheSelectHashesSinceQuery,
+        ModelInputCacheQuery.COUNT_BY_MODEL_ID: ModelInputCacheCountByModelQuery,
     }
@@ -8,6 +8,7 @@ from python_framework.time import timestamp_to_utc_timestamp
 class ModelInstanceRecord(DAORecord):
     model_id: str
     work_request_id: int
+    shard_index: int
     instance_id: str | None
     instance_details: str | None
     state: str
@@ -20,6 +21,7 @@ class ModelInstanceRecord(DAORecord):
 
         self.model_id = result["modelid"]
         self.work_request_id = result["workrequestid"]
+        self.shard_index = 0 if "shardindex" not in result else result["shardindex"]
         self.instance_id = result["instanceid"]
         self.instance_details = result["instancedetails"]
         self.state = result["state"]
@@ -41,6 +43,7 @@ class ModelInstanceRecord(DAORecord):
         return {
             "model_id": self.model_id,
             "work_request_id": self.work_request_id,
+            "shard_index": self.shard_index,
             "instance_id": self.instance_id,
             "instance_details": self.instance_details,
             "state": self.state,
@@ -56,6 +59,7 @@ class ModelInstanceRecord(DAORecord):
 class ModelInstanceExtendedRecord(DAORecord):
     model_id: str
     work_request_id: int
+    shard_index: int
     instance_id: str | None
     instance_details: str | None
     state: str
@@ -71,6 +75,7 @@ class ModelInstanceExtendedRecord(DAORecord):
 
         self.model_id = result["modelid"]
         self.work_request_id = result["workrequestid"]
+        self.shard_index = 0 if "shardindex" not in result else result["shardindex"]
         self.instance_id = result["instanceid"]
         self.instance_details = result["instancedetails"]
         self.state = result["state"]
@@ -100,6 +105,7 @@ class ModelInstanceExtendedRecord(DAORecord):
 class ModelInstanceUpsertQuery(DAOQuery):
     model_id: str
     work_request_id: int
+    shard_index: int
     instance_id: str | None
     instance_details: str | None
     state: str
@@ -117,11 +123,13 @@ class ModelInstanceUpsertQuery(DAOQuery):
         termination_reason: str | None,
         job_submission_process: str | None,
         expected_last_updated: str | None,
+        shard_index: int = 0,
     ):
         super().__init__(ModelInstanceRecord)
 
         self.model_id = model_id
         self.work_request_id = work_request_id
+        self.shard_index = shard_index
         self.instance_id = instance_id
         self.instance_details = instance_details
         self.state = state
@@ -134,6 +142,7 @@ class ModelInstanceUpsertQuery(DAOQuery):
         field_map = {
             "query_ModelId": self.model_id,
             "query_WorkRequestId": self.work_request_id,
+            "query_ShardIndex": self.shard_index,
             "query_InstanceId": self.instance_id,
             "query_InstanceDetails": self.instance_details,
             "query_State": self.state,
@@ -146,6 +155,7 @@ class ModelInstanceUpsertQuery(DAOQuery):
             INSERT INTO ModelInstance (
                 ModelId,
                 WorkRequestId,
+                ShardIndex,
                 InstanceId,
                 InstanceDetails,
                 State,
@@ -156,6 +166,7 @@ class ModelInstanceUpsertQuery(DAOQuery):
             VALUES (
                 :query_ModelId,
                 :query_WorkRequestId,
+                :query_ShardIndex,
                 :query_InstanceId,
                 :query_InstanceDetails,
                 :query_State,
@@ -163,7 +174,7 @@ class ModelInstanceUpsertQuery(DAOQuery):
                 :query_JobSubmissionProcess,
                 CURRENT_TIMESTAMP
             )
-            ON CONFLICT (ModelId, WorkRequestId)
+            ON CONFLICT (ModelId, WorkRequestId, ShardIndex)
             DO UPDATE
             SET InstanceId = EXCLUDED.InstanceId,
                 InstanceDetails = EXCLUDED.InstanceDetails,
@@ -173,10 +184,12 @@ class ModelInstanceUpsertQuery(DAOQuery):
                 LastUpdated = EXCLUDED.LastUpdated
             WHERE ModelInstance.ModelId = EXCLUDED.ModelId
             AND ModelInstance.WorkRequestId = EXCLUDED.WorkRequestId
+            AND ModelInstance.ShardIndex = EXCLUDED.ShardIndex
             AND ModelInstance.LastUpdated = :query_ExpectedLastUpdated
             RETURNING
                 ModelInstance.ModelId,
                 ModelInstance.WorkRequestId,
+                ModelInstance.ShardIndex,
                 ModelInstance.InstanceId,
                 ModelInstance.InstanceDetails::text,
                 ModelInstance.State,
@@ -271,6 +284,7 @@ class ModelInstanceSelectFilteredQuery(DAOQuery):
             SELECT
                 ModelInstance.ModelId,
                 ModelInstance.WorkRequestId,
+                ModelInstance.ShardIndex,
                 ModelInstance.InstanceId,
                 ModelInstance.InstanceDetails::text,
                 ModelInstance.State,
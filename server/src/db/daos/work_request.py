@@ -12,6 +12,21 @@ class WorkRequestQuery(Enum):
     DELETE_BY_USER = "DELETE_BY_USER"
     DELETE_BY_ANON_USER = "DELETE_BY_ANON_USER"
     UPDATE_JOB_METADATA = "UPDATE_JOB_METADATA"
+    NOTIFY = "NOTIFY"
+    CLAIM_QUEUED = "CLAIM_QUEUED"
+    SELECT_PAYLOAD = "SELECT_PAYLOAD"
+    QUEUE_DEPTH = "QUEUE_DEPTH"
+    BULK_UPDATE = "BULK_UPDATE"
+    NOTIFY_ALL = "NOTIFY_ALL"
+    SELECT_ACTIVE = "SELECT_ACTIVE"
+    BULK_INSERT = "BULK_INSERT"
+
+
+class WorkRequestQueuePolicy(Enum):
+    # oldest first
+    FIFO = "FIFO"
+    # round-robin between users (anonymous users per session), weighted per priority class
+    FAIR_SHARE = "FAIR_SHARE"
 
 
 class WorkRequestRecord(DAORecord):
@@ -150,6 +165,7 @@ class WorkRequestSelectFilteredQuery(DAOQuery):
         session_id: str = None,
         server_ids: List[str] = None,
         limit: int = 200,
+        include_payload: bool = True,
     ):
         super().__init__(WorkRequestRecord)
 
@@ -162,6 +178,7 @@ class WorkRequestSelectFilteredQuery(DAOQuery):
         self.session_id = session_id
         self.server_ids = server_ids
         self.limit = limit
+        self.include_payload = include_payload
 
     def to_sql(self):
         field_map = {}
@@ -227,12 +244,22 @@ class WorkRequestSelectFilteredQuery(DAOQuery):
                     "WorkRequest.ServerId IN (%s)" % ",".join(other_server_ids)
                 )
 
+        # NOTE: header-only mode skips the (large) payload, see WorkRequest.request_payload
+        payload_column = ""
+        payload_join = ""
+
+        if self.include_payload:
+            payload_column = "WorkRequestData.RequestPayload::text,"
+            payload_join = """
+            LEFT JOIN WorkRequestData
+                ON WorkRequest.Id = WorkRequestData.RequestId"""
+
         sql = """
             SELECT
                 WorkRequest.Id,
                 WorkRequest.ModelId,
                 WorkRequest.UserId,
-                WorkRequestData.RequestPayload::text,
+                %s
                 WorkRequest.RequestDate::text,
                 WorkRequest.Metadata::text,
                 WorkRequest.RequestStatus,
@@ -244,13 +271,13 @@ class WorkRequestSelectFilteredQuery(DAOQuery):
                 WorkRequest.ProcessedTimestamp::text,
                 WorkRequest.InputSize,
                 WorkRequest.ServerId
-            FROM WorkRequest
-            LEFT JOIN WorkRequestData
-                ON WorkRequest.Id = WorkRequestData.RequestId
+            FROM WorkRequest%s
             %s
             ORDER BY WorkRequest.RequestDate DESC, WorkRequest.ModelId ASC
             LIMIT %d
         """ % (
+            payload_column,
+            payload_join,
             "" if len(custom_filters) == 0 else "WHERE " + " AND ".join(custom_filters),
             self.limit,
         )
@@ -393,6 +420,156 @@ class WorkRequestInsertQuery(DAOQuery):
         return sql, field_map
 
 
+class WorkRequestBulkInsertQuery(DAOQuery):
+    def __init__(
+        self,
+        work_requests: List[Dict[str, Union[str, int, bool, float]]],
+    ):
+        super().__init__(WorkRequestRecord)
+
+        # NOTE: entries as generated by WorkRequestRecord.generate_insert_query_args
+        self.work_requests = work_requests
+
+    def to_sql(self):
+        field_map = {}
+        values = []
+
+        for index, work_request in enumerate(self.work_requests):
+            field_map[f"query_InputIndex_{index}"] = index
+            field_map[f"query_ModelId_{index}"] = work_request["model_id"]
+            field_map[f"query_UserId_{index}"] = work_request["user_id"]
+            field_map[f"query_RequestPayload_{index}"] = work_request["request_payload"]
+            field_map[f"query_RequestDate_{index}"] = work_request["request_date"]
+            field_map[f"query_Metadata_{index}"] = work_request["metadata"]
+            field_map[f"query_RequestStatus_{index}"] = work_request["request_status"]
+            field_map[f"query_RequestStatusReason_{index}"] = work_request[
+                "request_status_reason"
+            ]
+            field_map[f"query_InputSize_{index}"] = work_request["input_size"]
+            field_map[f"query_ServerId_{index}"] = work_request["server_id"]
+
+            values.append(
+                f"""(
+                    CAST(:query_InputIndex_{index} AS int),
+                    CAST(:query_ModelId_{index} AS text),
+                    CAST(:query_UserId_{index} AS text),
+                    CAST(:query_RequestPayload_{index} AS jsonb),
+                    CAST(:query_RequestDate_{index} AS timestamp),
+                    CAST(:query_Metadata_{index} AS jsonb),
+                    CAST(:query_RequestStatus_{index} AS text),
+                    CAST(:query_RequestStatusReason_{index} AS text),
+                    CAST(:query_InputSize_{index} AS int),
+                    CAST(:query_ServerId_{index} AS text)
+                )"""
+            )
+
+        # NOTE: the ids are allocated upfront, to insert the WorkRequestData rows in the same statement
+        #       and to return the WorkRequests in input order. The payload is not returned.
+        sql = """
+            WITH WorkRequestInput AS (
+                SELECT
+                    nextval(pg_get_serial_sequence('workrequest', 'id')) AS Id,
+                    WorkRequestValues.*
+                FROM (
+                    VALUES %s
+                ) AS WorkRequestValues (
+                    InputIndex,
+                    ModelId,
+                    UserId,
+                    RequestPayload,
+                    RequestDate,
+                    Metadata,
+                    RequestStatus,
+                    RequestStatusReason,
+                    InputSize,
+                    ServerId
+                )
+            ),
+
+            WorkRequestInsert AS (
+                INSERT INTO WorkRequest (
+                    Id,
+                    ModelId,
+                    UserId,
+                    RequestDate,
+                    Metadata,
+                    RequestStatus,
+                    RequestStatusReason,
+                    LastUpdated,
+                    InputSize,
+                    ServerId
+                )
+                SELECT
+                    Id,
+                    ModelId,
+                    UserId,
+                    RequestDate,
+                    Metadata,
+                    RequestStatus,
+                    RequestStatusReason,
+                    CURRENT_TIMESTAMP,
+                    InputSize,
+                    ServerId
+                FROM WorkRequestInput
+                RETURNING
+                    Id,
+                    ModelId,
+                    UserId,
+                    RequestDate,
+                    Metadata,
+                    RequestStatus,
+                    RequestStatusReason,
+                    ModelJobId,
+                    LastUpdated,
+                    PodReadyTimestamp,
+                    JobSubmissionTimestamp,
+                    ProcessedTimestamp,
+                    InputSize,
+                    ServerId
+            ),
+
+            WorkRequestDataInsert AS (
+                INSERT INTO WorkRequestData (
+                    RequestId,
+                    RequestPayload,
+                    RequestDate
+                )
+                SELECT
+                    WorkRequestInsert.Id,
+                    WorkRequestInput.RequestPayload,
+                    WorkRequestInsert.RequestDate
+                FROM WorkRequestInsert
+                INNER JOIN WorkRequestInput
+                    ON WorkRequestInsert.Id = WorkRequestInput.Id
+                RETURNING RequestId
+            )
+
+            SELECT
+                WorkRequestInsert.Id,
+                WorkRequestInsert.ModelId,
+                WorkRequestInsert.UserId,
+                WorkRequestInsert.RequestDate::text,
+                WorkRequestInsert.Metadata::text,
+                WorkRequestInsert.RequestStatus,
+                WorkRequestInsert.RequestStatusReason,
+                WorkRequestInsert.ModelJobId,
+                WorkRequestInsert.LastUpdated::text,
+                WorkRequestInsert.PodReadyTimestamp::text,
+                WorkRequestInsert.JobSubmissionTimestamp::text,
+                WorkRequestInsert.ProcessedTimestamp::text,
+                WorkRequestInsert.InputSize,
+                WorkRequestInsert.ServerId
+            FROM WorkRequestInsert
+            INNER JOIN WorkRequestInput
+                ON WorkRequestInsert.Id = WorkRequestInput.Id
+            INNER JOIN WorkRequestDataInsert
+                ON WorkRequestInsert.Id = WorkRequestDataInsert.RequestId
+            ORDER BY WorkRequestInput.InputIndex ASC
+        """ % ",".join(values)
+
+        return sql, field_map
+
+
 class WorkRequestUpdateQuery(DAOQuery):
     def __init__(
         self,
@@ -499,6 +676,119 @@ class WorkRequestUpdateQuery(DAOQuery):
         return sql, field_map
 
 
+class WorkRequestBulkUpdateQuery(DAOQuery):
+    def __init__(
+        self,
+        updates: List[Dict[str, Union[str, int, bool, float]]],
+        expected_server_id: str | None = None,
+    ):
+        super().__init__(WorkRequestRecord)
+
+        # NOTE: entries as generated by WorkRequestRecord.generate_update_query_args
+        self.updates = updates
+        self.expected_server_id = expected_server_id
+
+    def to_sql(self):
+        field_map = {}
+        values = []
+
+        for index, update in enumerate(self.updates):
+            field_map[f"query_Id_{index}"] = update["id"]
+            field_map[f"query_ExpectedLastUpdated_{index}"] = update[
+                "expected_last_updated"
+            ]
+            field_map[f"query_RequestStatus_{index}"] = update["request_status"]
+            field_map[f"query_RequestStatusReason_{index}"] = update[
+                "request_status_reason"
+            ]
+            field_map[f"query_ModelJobId_{index}"] = update["model_job_id"]
+            field_map[f"query_PodReadyTimestamp_{index}"] = update[
+                "pod_ready_timestamp"
+            ]
+            field_map[f"query_JobSubmissionTimestamp_{index}"] = update[
+                "job_submission_timestamp"
+            ]
+            field_map[f"query_ProcessedTimestamp_{index}"] = update[
+                "processed_timestamp"
+            ]
+            field_map[f"query_ServerId_{index}"] = update["server_id"]
+
+            values.append(
+                f"""(
+                    CAST(:query_Id_{index} AS bigint),
+                    CAST(:query_ExpectedLastUpdated_{index} AS timestamp),
+                    CAST(:query_RequestStatus_{index} AS text),
+                    CAST(:query_RequestStatusReason_{index} AS text),
+                    CAST(:query_ModelJobId_{index} AS text),
+                    CAST(:query_PodReadyTimestamp_{index} AS timestamp),
+                    CAST(:query_JobSubmissionTimestamp_{index} AS timestamp),
+                    CAST(:query_ProcessedTimestamp_{index} AS timestamp),
+                    CAST(:query_ServerId_{index} AS text)
+                )"""
+            )
+
+        custom_filters = []
+
+        if self.expected_server_id is not None:
+            if self.expected_server_id == "NULL":
+                custom_filters.append("WorkRequest.ServerId IS NULL")
+            else:
+                custom_filters.append(
+                    f"WorkRequest.ServerId = '{self.expected_server_id}'"
+                )
+
+        # NOTE: only the rows matching their expected LastUpdated (and ServerId) are updated,
+        #       the returned rows are the successful updates. The payload is not returned.
+        sql = """
+            UPDATE WorkRequest
+            SET
+                RequestStatus = WorkRequestUpdate.RequestStatus,
+                RequestStatusReason = WorkRequestUpdate.RequestStatusReason,
+                ModelJobId = WorkRequestUpdate.ModelJobId,
+                LastUpdated = CURRENT_TIMESTAMP,
+                PodReadyTimestamp = WorkRequestUpdate.PodReadyTimestamp,
+                JobSubmissionTimestamp = WorkRequestUpdate.JobSubmissionTimestamp,
+                ProcessedTimestamp = WorkRequestUpdate.ProcessedTimestamp,
+                ServerId = WorkRequestUpdate.ServerId
+            FROM (
+                VALUES %s
+            ) AS WorkRequestUpdate (
+                Id,
+                ExpectedLastUpdated,
+                RequestStatus,
+                RequestStatusReason,
+                ModelJobId,
+                PodReadyTimestamp,
+                JobSubmissionTimestamp,
+                ProcessedTimestamp,
+                ServerId
+            )
+            WHERE WorkRequest.Id = WorkRequestUpdate.Id
+            AND WorkRequest.LastUpdated = WorkRequestUpdate.ExpectedLastUpdated
+            %s
+            RETURNING
+                WorkRequest.Id,
+                WorkRequest.ModelId,
+                WorkRequest.UserId,
+                WorkRequest.RequestDate::text,
+                WorkRequest.Metadata::text,
+                WorkRequest.RequestStatus,
+                WorkRequest.RequestStatusReason,
+                WorkRequest.ModelJobId,
+                WorkRequest.LastUpdated::text,
+                WorkRequest.PodReadyTimestamp::text,
+                WorkRequest.JobSubmissionTimestamp::text,
+                WorkRequest.ProcessedTimestamp::text,
+                WorkRequest.InputSize,
+                WorkRequest.ServerId
+        """ % (
+            ",".join(values),
+            "" if len(custom_filters) == 0 else "AND " + " AND ".join(custom_filters),
+        )
+
+        return sql, field_map
+
+
 class WorkRequestDeleteByUserQuery(DAOQuery):
     def __init__(
         self,
@@ -529,7 +819,7 @@ class WorkRequestDeleteByUserQuery(DAOQuery):
             ),
 
             DeletedWRCache AS (
-                DELETE FROM WorkRequestResultCacheTemp
+                DELETE FROM WorkRequestPartialResult
                 WHERE WorkRequestId IN (
                     SELECT Id FROM WorkRequestsToDelete
                 )
@@ -619,7 +909,7 @@ class WorkRequestDeleteByAnonUserQuery(DAOQuery):
             ),
 
             DeletedWRCache AS (
-                DELETE FROM WorkRequestResultCacheTemp
+                DELETE FROM WorkRequestPartialResult
                 WHERE WorkRequestId IN (
                     SELECT Id FROM WorkRequestsToDelete
                 )
@@ -733,6 +1023,310 @@ class WorkRequestUpdateJobMetadataQuery(DAOQuery):
         return sql, field_map
 
 
+class WorkRequestClaimQueuedQuery(DAOQuery):
+    def __init__(
+        self,
+        model_ids: List[str],
+        server_id: str,
+        limit: int = 10,
+        queue_policy: WorkRequestQueuePolicy = WorkRequestQueuePolicy.FIFO,
+        fair_share_window: int = 1000,
+        anonymous_weight: float = 1,
+        registered_weight: float = 1,
+    ):
+        super().__init__(WorkRequestRecord)
+
+        self.model_ids = model_ids
+        self.server_id = server_id
+        self.limit = limit
+        self.queue_policy = queue_policy
+        self.fair_share_window = fair_share_window
+        self.anonymous_weight = anonymous_weight
+        self.registered_weight = registered_weight
+
+    def _claim_candidates_sql(self, model_ids_str: str) -> str:
+        if self.queue_policy != WorkRequestQueuePolicy.FAIR_SHARE:
+            return """
+                SELECT Id, 0 AS ClaimShareRank
+                FROM WorkRequest
+                WHERE RequestStatus = 'QUEUED'
+                AND (ServerId IS NULL OR ServerId = :query_ServerId)
+                AND ModelId IN (%s)
+                ORDER BY RequestDate ASC
+                LIMIT %d
+                FOR UPDATE SKIP LOCKED
+            """ % (
+                model_ids_str,
+                self.limit,
+            )
+
+        # NOTE: window functions are not allowed together with FOR UPDATE, hence the ranking CTEs.
+        #       The ranking is done over the oldest [fair_share_window] QUEUED requests only,
+        #       which bounds the cost of the claim and guarantees the whole backlog is eventually reached.
+        #       A share's rank counts its in-flight (SCHEDULING / PROCESSING) requests, on any model,
+        #       so a user with many running requests yields to users with none.
+        share_key = """
+            CASE WHEN UserId LIKE '%00000-0000-0000-0000-000000000000'
+                THEN COALESCE(Metadata->'trackingData'->>'sessionId', Metadata->>'sessionId', UserId)
+                ELSE UserId
+            END
+        """
+
+        return """
+                WITH QueueWindow AS (
+                    SELECT
+                        Id,
+                        RequestDate,
+                        %s AS ShareKey,
+                        CASE WHEN UserId LIKE '%%00000-0000-0000-0000-000000000000'
+                            THEN CAST(:query_AnonymousWeight AS float)
+                            ELSE CAST(:query_RegisteredWeight AS float)
+                        END AS ShareWeight
+                    FROM WorkRequest
+                    WHERE RequestStatus = 'QUEUED'
+                    AND (ServerId IS NULL OR ServerId = :query_ServerId)
+                    AND ModelId IN (%s)
+                    ORDER BY RequestDate ASC
+                    LIMIT %d
+                ),
+
+                InFlightShares AS (
+                    SELECT %s AS ShareKey, COUNT(*) AS InFlightCount
+                    FROM WorkRequest
+                    WHERE RequestStatus IN ('SCHEDULING', 'PROCESSING')
+                    GROUP BY 1
+                ),
+
+                RankedQueue AS (
+                    SELECT
+                        QueueWindow.Id,
+                        QueueWindow.RequestDate,
+                        (
+                            ROW_NUMBER() OVER (PARTITION BY QueueWindow.ShareKey ORDER BY QueueWindow.RequestDate ASC)
+                            + COALESCE(InFlightShares.InFlightCount, 0)
+                        ) / QueueWindow.ShareWeight AS ShareRank
+                    FROM QueueWindow
+                    LEFT JOIN InFlightShares
+                        ON QueueWindow.ShareKey = InFlightShares.ShareKey
+                )
+
+                SELECT WorkRequest.Id, RankedQueue.ShareRank AS ClaimShareRank
+                FROM WorkRequest
+                INNER JOIN RankedQueue
+                    ON WorkRequest.Id = RankedQueue.Id
+                WHERE WorkRequest.RequestStatus = 'QUEUED'
+                ORDER BY RankedQueue.ShareRank ASC, RankedQueue.RequestDate ASC
+                LIMIT %d
+                FOR UPDATE OF WorkRequest SKIP LOCKED
+        """ % (
+            share_key,
+            model_ids_str,
+            self.fair_share_window,
+            share_key,
+            self.limit,
+        )
+
+    def to_sql(self):
+        field_map = {
+            "query_ServerId": self.server_id,
+        }
+
+        if self.queue_policy == WorkRequestQueuePolicy.FAIR_SHARE:
+            field_map["query_AnonymousWeight"] = float(self.anonymous_weight)
+            field_map["query_RegisteredWeight"] = float(self.registered_weight)
+
+        # NOTE: SKIP LOCKED ensures concurrent claims (other workers / servers) never block on,
+        #       or double-claim, the same rows. Requests QUEUED with our own ServerId (e.g. failed
+        #       instance acquisition) can be re-claimed by this server only.
+        sql = """
+            WITH ClaimCandidates AS (
+                %s
+            ),
+
+            WorkRequestClaim AS (
+                UPDATE WorkRequest
+                SET
+                    RequestStatus = 'SCHEDULING',
+                    ServerId = :query_ServerId,
+                    LastUpdated = CURRENT_TIMESTAMP
+                FROM ClaimCandidates
+                WHERE WorkRequest.Id = ClaimCandidates.Id
+                RETURNING
+                    WorkRequest.Id,
+                    WorkRequest.ModelId,
+                    WorkRequest.UserId,
+                    WorkRequest.RequestDate,
+                    WorkRequest.Metadata,
+                    WorkRequest.RequestStatus,
+                    WorkRequest.RequestStatusReason,
+                    WorkRequest.ModelJobId,
+                    WorkRequest.LastUpdated,
+                    WorkRequest.PodReadyTimestamp,
+                    WorkRequest.JobSubmissionTimestamp,
+                    WorkRequest.ProcessedTimestamp,
+                    WorkRequest.InputSize,
+                    WorkRequest.ServerId
+            )
+
+            SELECT
+                WorkRequestClaim.Id,
+                WorkRequestClaim.ModelId,
+                WorkRequestClaim.UserId,
+                WorkRequestData.RequestPayload::text,
+                WorkRequestClaim.RequestDate::text,
+                WorkRequestClaim.Metadata::text,
+                WorkRequestClaim.RequestStatus,
+                WorkRequestClaim.RequestStatusReason,
+                WorkRequestClaim.ModelJobId,
+                WorkRequestClaim.LastUpdated::text,
+                WorkRequestClaim.PodReadyTimestamp::text,
+                WorkRequestClaim.JobSubmissionTimestamp::text,
+                WorkRequestClaim.ProcessedTimestamp::text,
+                WorkRequestClaim.InputSize,
+                WorkRequestClaim.ServerId
+            FROM WorkRequestClaim
+            INNER JOIN ClaimCandidates
+                ON WorkRequestClaim.Id = ClaimCandidates.Id
+            LEFT JOIN WorkRequestData
+                ON WorkRequestClaim.Id = WorkRequestData.RequestId
+            ORDER BY ClaimCandidates.ClaimShareRank ASC, WorkRequestClaim.RequestDate ASC
+        """ % self._claim_candidates_sql(
+            ",".join(map(lambda x: "'%s'" % x, self.model_ids))
+        )
+
+        return sql, field_map
+
+
+class WorkRequestSelectPayloadQuery(DAOQuery):
+    def __init__(self, id: int):
+        super().__init__(MapRecord)
+
+        self.id = id
+
+    def to_sql(self):
+        field_map = {
+            "query_Id": self.id,
+        }
+
+        sql = """
+            SELECT
+                RequestId,
+                RequestPayload::text
+            FROM WorkRequestData
+            WHERE RequestId = :query_Id
+        """
+
+        return sql, field_map
+
+
+class WorkRequestQueueDepthQuery(DAOQuery):
+    def __init__(self):
+        super().__init__(MapRecord)
+
+    def to_sql(self):
+        field_map = {}
+
+        sql = """
+            SELECT
+                ModelId,
+                COUNT(*) AS QueueDepth
+            FROM WorkRequest
+            WHERE RequestStatus = 'QUEUED'
+            GROUP BY ModelId
+        """
+
+        return sql, field_map
+
+
+class WorkRequestSelectActiveQuery(DAOQuery):
+    def __init__(self):
+        super().__init__(MapRecord)
+
+    def to_sql(self):
+        field_map = {}
+
+        # NOTE: header-only, used to (re)build the in-memory admission counters
+        sql = """
+            SELECT
+                Id,
+                ModelId,
+                UserId,
+                COALESCE(Metadata->'trackingData'->>'sessionId', Metadata->>'sessionId') AS SessionId,
+                RequestStatus
+            FROM WorkRequest
+            WHERE RequestStatus NOT IN ('COMPLETED', 'FAILED')
+        """
+
+        return sql, field_map
+
+
+class WorkRequestNotifyQuery(DAOQuery):
+    def __init__(
+        self,
+        channel: str,
+        payload: str,
+    ):
+        super().__init__(MapRecord)
+
+        self.channel = channel
+        self.payload = payload
+
+    def to_sql(self):
+        field_map = {
+            "query_Channel": self.channel,
+            "query_Payload": self.payload,
+        }
+
+        # NOTE: pg_notify returns void, so we wrap it to return a mappable row
+        #       the notification is only delivered once the transaction commits
+        sql = """
+            SELECT 1 AS notified
+            FROM (
+                SELECT pg_notify(:query_Channel, :query_Payload)
+            ) AS Notification
+        """
+
+        return sql, field_map
+
+
+class WorkRequestNotifyAllQuery(DAOQuery):
+    def __init__(
+        self,
+        channel: str,
+        payloads: List[str],
+    ):
+        super().__init__(MapRecord)
+
+        self.channel = channel
+        self.payloads = payloads
+
+    def to_sql(self):
+        field_map = {
+            "query_Channel": self.channel,
+        }
+
+        for index, payload in enumerate(self.payloads):
+            field_map[f"query_Payload_{index}"] = payload
+
+        # NOTE: same as WorkRequestNotifyQuery, for many events in a single statement
+        sql = """
+            SELECT COUNT(*) AS notified
+            FROM (
+                SELECT pg_notify(:query_Channel, Notification.Payload)
+                FROM (
+                    VALUES %s
+                ) AS Notification (Payload)
+            ) AS Notifications
+        """ % ",".join(
+            map(
+                lambda index: f"(CAST(:query_Payload_{index} AS text))",
+                range(len(self.payloads)),
+            )
+        )
+
+        return sql, field_map
+
+
 class WorkRequestDAO(BaseDAO.DAO):
     queries = {
         BaseDAO.SELECT_ALL_QUERY_KEY: WorkRequestSelectAllQuery,
@@ -742,4 +1336,12 @@ class WorkRequestDAO(BaseDAO.DAO):
         WorkRequestQuery.DELETE_BY_ANON_USER: WorkRequestDeleteByAnonUserQuery,
         WorkRequestQuery.SELECT_FILTERED: WorkRequestSelectFilteredQuery,
         WorkRequestQuery.UPDATE_JOB_METADATA: WorkRequestUpdateJobMetadataQuery,
+        WorkRequestQuery.NOTIFY: WorkRequestNotifyQuery,
+        WorkRequestQuery.CLAIM_QUEUED: WorkRequestClaimQueuedQuery,
+        WorkRequestQuery.SELECT_PAYLOAD: WorkRequestSelectPayloadQuery,
+        WorkRequestQuery.QUEUE_DEPTH: WorkRequestQueueDepthQuery,
+        WorkRequestQuery.BULK_UPDATE: WorkRequestBulkUpdateQuery,
+        WorkRequestQuery.NOTIFY_ALL: WorkRequestNotifyAllQuery,
+        WorkRequestQuery.SELECT_ACTIVE: WorkRequestSelectActiveQuery,
+        WorkRequestQuery.BULK_INSERT: WorkRequestBulkInsertQuery,
     }
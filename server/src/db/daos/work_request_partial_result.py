@@ -0,0 +1,129 @@
+from typing import Dict, Union
+
+import python_framework.db.dao.dao as BaseDAO
+from python_framework.db.dao.objects import DAOQuery, DAORecord
+
+
+class WorkRequestPartialResultRecord(DAORecord):
+    work_request_id: int
+    results: str  # serialized json, see ModelInputCache.persist_cached_workrequest_results
+
+    def __init__(self, result: dict):
+        super().__init__(result)
+
+        self.work_request_id = result["workrequestid"]
+        self.results = None if "results" not in result else result["results"]
+
+    def generate_insert_query_args(self) -> Dict[str, Union[str, int, bool, float]]:
+        return {
+            "work_request_id": self.work_request_id,
+            "results": self.results,
+        }
+
+    def generate_update_query_args(self) -> Dict[str, Union[str, int, bool, float]]:
+        return super().generate_update_query_args()
+
+    def generate_upsert_query_args(self) -> Dict[str, Union[str, int, bool, float]]:
+        return super().generate_upsert_query_args()
+
+    def generate_delete_query_args(self) -> Dict[str, Union[str, int, bool, float]]:
+        return {
+            "work_request_id": self.work_request_id,
+        }
+
+
+class WorkRequestPartialResultSelectQuery(DAOQuery):
+    work_request_id: int
+
+    def __init__(self, work_request_id: int):
+        super().__init__(WorkRequestPartialResultRecord)
+
+        self.work_request_id = work_request_id
+
+    def to_sql(self):
+        field_map = {
+            "query_WorkRequestId": self.work_request_id,
+        }
+
+        sql = """
+            SELECT
+                WorkRequestId,
+                Results
+            FROM WorkRequestPartialResult
+            WHERE WorkRequestId = :query_WorkRequestId
+        """
+
+        return sql, field_map
+
+
+class WorkRequestPartialResultInsertQuery(DAOQuery):
+    def __init__(
+        self,
+        work_request_id: int,
+        results: str,
+    ):
+        super().__init__(WorkRequestPartialResultRecord)
+
+        self.work_request_id = work_request_id
+        self.results = results
+
+    def to_sql(self):
+        field_map = {
+            "query_WorkRequestId": self.work_request_id,
+            "query_Results": self.results,
+        }
+
+        # NOTE: a requeued WorkRequest replaces its previous partial result
+        sql = """
+            INSERT INTO WorkRequestPartialResult (
+                WorkRequestId,
+                Results,
+                LastUpdated
+            )
+            VALUES (
+                :query_WorkRequestId,
+                :query_Results,
+                CURRENT_TIMESTAMP
+            )
+            ON CONFLICT (WorkRequestId)
+            DO UPDATE
+            SET
+                Results = EXCLUDED.Results,
+                LastUpdated = EXCLUDED.LastUpdated
+            RETURNING
+                WorkRequestId
+        """
+
+        return sql, field_map
+
+
+class WorkRequestPartialResultDeleteQuery(DAOQuery):
+    def __init__(
+        self,
+        work_request_id: int,
+    ):
+        super().__init__(WorkRequestPartialResultRecord)
+
+        self.work_request_id = work_request_id
+
+    def to_sql(self):
+        field_map = {
+            "query_WorkRequestId": self.work_request_id,
+        }
+
+        sql = """
+            DELETE FROM WorkRequestPartialResult
+            WHERE WorkRequestId = :query_WorkRequestId
+            RETURNING
+                WorkRequestId
+        """
+
+        return sql, field_map
+
+
+class WorkRequestPartialResultDAO(BaseDAO.DAO):
+    queries = {
+        BaseDAO.SELECT_QUERY_KEY: WorkRequestPartialResultSelectQuery,
+        BaseDAO.INSERT_QUERY_KEY: WorkRequestPartialResultInsertQuery,
+        BaseDAO.DELETE_QUERY_KEY: WorkRequestPartialResultDeleteQuery,
+    }
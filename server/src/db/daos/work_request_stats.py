@@ -9,6 +9,7 @@ from python_framework.time import timestamp_to_utc_timestamp
 
 class WorkRequestStatsQuery(Enum):
     FILTERED_STATS = "FILTERED_STATS"
+    ARRIVAL_COUNTS = "ARRIVAL_COUNTS"
 
 
 class WorkRequestStatsRecord(DAORecord):
@@ -315,7 +316,59 @@ class WorkRequestFilteredStatsQuery(DAOQuery):
         return sql, field_map
 
 
+class WorkRequestArrivalCountRecord(DAORecord):
+    model_id: str
+    weekday: int  # ISO weekday, 1 = Monday
+    hour: int
+    request_count: int
+
+    def __init__(self, result: dict):
+        super().__init__(result)
+
+        self.model_id = result["model_id"]
+        self.weekday = int(result["weekday"])
+        self.hour = int(result["hour"])
+        self.request_count = int(result["request_count"])
+
+    def generate_insert_query_args(self) -> Dict[str, Union[str, int, bool, float]]:
+        return super().generate_insert_query_args()
+
+    def generate_update_query_args(self) -> Dict[str, Union[str, int, bool, float]]:
+        return super().generate_update_query_args()
+
+    def generate_upsert_query_args(self) -> Dict[str, Union[str, int, bool, float]]:
+        return super().generate_upsert_query_args()
+
+    def generate_delete_query_args(self) -> Dict[str, Union[str, int, bool, float]]:
+        return super().generate_delete_query_args()
+
+
+# WorkRequests per model, by weekday + hour of their RequestDate (UTC)
+class WorkRequestArrivalCountsQuery(DAOQuery):
+    def __init__(self, request_date_from: str):
+        super().__init__(WorkRequestArrivalCountRecord)
+
+        self.request_date_from = request_date_from
+
+    def to_sql(self):
+        field_map = {"query_RequestDateFrom": self.request_date_from}
+
+        sql = """
+            SELECT
+                ModelId AS model_id,
+                EXTRACT(ISODOW FROM RequestDate)::int AS weekday,
+                EXTRACT(HOUR FROM RequestDate)::int AS hour,
+                count(*) AS request_count
+            FROM WorkRequest
+            WHERE RequestDate >= :query_RequestDateFrom
+            GROUP BY 1, 2, 3
+        """
+
+        return sql, field_map
+
+
 class WorkRequestStatsDAO(BaseDAO.DAO):
     queries = {
         WorkRequestStatsQuery.FILTERED_STATS: WorkRequestFilteredStatsQuery,
+        WorkRequestStatsQuery.ARRIVAL_COUNTS: WorkRequestArrivalCountsQuery,
     }
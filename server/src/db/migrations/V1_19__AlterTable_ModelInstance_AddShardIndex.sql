@@ -0,0 +1,8 @@
+ALTER TABLE ModelInstance
+  ADD COLUMN ShardIndex INT NOT NULL DEFAULT 0;
+
+ALTER TABLE ModelInstance
+  DROP CONSTRAINT MODELINSTANCE_PK_MODELID_WORKREQUESTID;
+
+ALTER TABLE ModelInstance
+  ADD CONSTRAINT MODELINSTANCE_PK_MODELID_WORKREQUESTID_SHARDINDEX PRIMARY KEY (ModelId, WorkRequestId, ShardIndex);
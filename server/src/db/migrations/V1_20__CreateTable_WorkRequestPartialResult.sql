@@ -0,0 +1,8 @@
+CREATE TABLE IF NOT EXISTS WorkRequestPartialResult (
+    WorkRequestId bigint NOT NULL,
+    Results text NOT NULL,
+    LastUpdated timestamp NOT NULL
+);
+
+ALTER TABLE WorkRequestPartialResult
+  ADD CONSTRAINT WORKREQUESTPARTIALRESULT_PK_WORKREQUESTID PRIMARY KEY (WorkRequestId);
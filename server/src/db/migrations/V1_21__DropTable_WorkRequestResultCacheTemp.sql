@@ -0,0 +1,2 @@
+-- replaced by WorkRequestPartialResult. In-flight WorkRequests are requeued (and their cache re-checked) on server restart
+DROP TABLE IF EXISTS WorkRequestResultCacheTemp;
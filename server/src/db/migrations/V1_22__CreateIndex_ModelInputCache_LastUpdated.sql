@@ -0,0 +1 @@
+CREATE INDEX IF NOT EXISTS MODELINPUTCACHE_MODELID_LASTUPDATED_INDEX ON ModelInputCache (ModelId, LastUpdated);
@@ -0,0 +1,60 @@
+from math import ceil, log
+
+###
+# Bloom filter of md5 hex digests (e.g. ModelInputCache input hashes).
+#   The k bit indexes are derived from the digest itself (double hashing), no additional hashing is needed.
+#
+# NOTE: not thread-safe, see ModelInputCacheFilter
+###
+
+
+class BloomFilter:
+    capacity: int  # expected number of entries
+    bit_count: int
+    hash_count: int
+    count: int  # number of added entries (including duplicates)
+
+    _bits: bytearray
+
+    def __init__(self, capacity: int, false_positive_rate: float):
+        self.capacity = max(1, capacity)
+        self.bit_count = max(
+            8,
+            ceil(-self.capacity * log(false_positive_rate) / (log(2) ** 2)),
+        )
+        self.hash_count = max(1, round(self.bit_count / self.capacity * log(2)))
+        self.count = 0
+
+        self._bits = bytearray(ceil(self.bit_count / 8))
+
+    def _indexes(self, digest: str):
+        h1 = int(digest[:16], 16)
+        h2 = int(digest[16:32], 16) | 1
+
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.bit_count
+
+    def add(self, digest: str):
+        for index in self._indexes(digest):
+            self._bits[index >> 3] |= 1 << (index & 7)
+
+        self.count += 1
+
+    def might_contain(self, digest: str) -> bool:
+        for index in self._indexes(digest):
+            if not self._bits[index >> 3] & (1 << (index & 7)):
+                return False
+
+        return True
+
+    def memory_bytes(self) -> int:
+        return len(self._bits)
+
+    def is_over_capacity(self) -> bool:
+        return self.count > self.capacity
+
+    # estimated from the fill ratio of the bits
+    def false_positive_rate(self) -> float:
+        set_bits = sum(map(int.bit_count, self._bits))
+
+        return (set_bits / self.bit_count) ** self.hash_count
@@ -0,0 +1,99 @@
+from hashlib import md5
+from typing import Callable, Dict, Generic, Iterator, List, Set, TypeVar
+
+###
+# Reconciles the inputs of a WorkRequest with their cached results, in linear time:
+#   - every input is hashed once, in input order
+#   - the unique hashes are looked up in fixed-size batches (see lookup_batches)
+#   - the found records are indexed by hash, inputs are partitioned into hit / miss indexes
+#
+# The records are only required to have an `input_hash` attribute (e.g. ModelInputCacheRecord).
+###
+
+T = TypeVar("T")
+
+
+def hash_input(input: str) -> str:
+    return md5(input.encode()).hexdigest()
+
+
+class CacheReconciliation(Generic[T]):
+    inputs: List[str]
+    input_hashes: List[str]  # by input index
+    # unique hashes, in order of first occurrence => input
+    unique_inputs: Dict[str, str]
+    records: Dict[str, T]  # found records by hash
+    # hashes known to be not cached (e.g. by a Bloom filter), these are not looked up
+    known_misses: Set[str]
+
+    def __init__(self, inputs: List[str]):
+        self.inputs = inputs
+        self.input_hashes = list(map(hash_input, inputs))
+        self.unique_inputs = {}
+        self.records = {}
+        self.known_misses = set()
+
+        for input, input_hash in zip(inputs, self.input_hashes):
+            self.unique_inputs.setdefault(input_hash, input)
+
+    def unique_hashes(self) -> List[str]:
+        return list(self.unique_inputs.keys())
+
+    def pending_hashes(self) -> List[str]:
+        return list(
+            filter(
+                lambda input_hash: input_hash not in self.records
+                and input_hash not in self.known_misses,
+                self.unique_inputs,
+            )
+        )
+
+    # pending (not yet found) unique hashes, in chunks of at most batch_size
+    def lookup_batches(self, batch_size: int) -> Iterator[List[str]]:
+        pending_hashes = self.pending_hashes()
+
+        for index in range(0, len(pending_hashes), batch_size):
+            yield pending_hashes[index : index + batch_size]
+
+    def add_records(self, records: List[T]):
+        for record in records:
+            self.records.setdefault(record.input_hash, record)
+
+    def add_known_misses(self, input_hashes: List[str]):
+        self.known_misses.update(input_hashes)
+
+    def lookup(self, lookup: Callable[[List[str]], List[T]], batch_size: int):
+        for batch in self.lookup_batches(batch_size):
+            self.add_records(lookup(batch))
+
+    def input_for_hash(self, input_hash: str) -> str | None:
+        return self.unique_inputs.get(input_hash)
+
+    def hit_indexes(self) -> List[int]:
+        return [i for i, h in enumerate(self.input_hashes) if h in self.records]
+
+    def miss_indexes(self) -> List[int]:
+        return [i for i, h in enumerate(self.input_hashes) if h not in self.records]
+
+    def is_complete(self) -> bool:
+        return len(self.records) == len(self.unique_inputs)
+
+    # found records, one per unique input, in order of first occurrence
+    def cached_records(self) -> List[T]:
+        return [
+            self.records[input_hash]
+            for input_hash in self.unique_inputs
+            if input_hash in self.records
+        ]
+
+    # non-cached inputs, in input order (including duplicates)
+    def non_cached_inputs(self) -> List[str]:
+        return [self.inputs[i] for i in self.miss_indexes()]
+
+    # non-cached inputs, once, in order of first occurrence
+    def unique_non_cached_inputs(self) -> List[str]:
+        return [
+            input
+            for input_hash, input in self.unique_inputs.items()
+            if input_hash not in self.records
+        ]
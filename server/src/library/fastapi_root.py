@@ -91,6 +91,7 @@ class FastAPIRoot(object):
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            expose_headers=["Retry-After"],
         )
 
         logging.getLogger("uvicorn.access").addFilter(
@@ -0,0 +1,103 @@
+from collections import OrderedDict
+from threading import Lock
+from time import time
+from typing import Any, Callable, Hashable, Tuple
+
+###
+# Thread-safe, size-bounded LRU cache.
+#   Entries are evicted (least recently used first) once the total size of the entries exceeds max_bytes.
+#   The size of an entry is provided by the caller (estimated, e.g. length of the serialized value).
+###
+
+
+class LRUCache:
+    _lock: Lock
+    # key => (value, size, inserted at)
+    _entries: "OrderedDict[Hashable, Tuple[Any, int, float]]"
+    _size: int
+
+    max_bytes: int
+    ttl: float | None  # in seconds, entries never expire if None
+
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self, max_bytes: int, ttl: float | None = None) -> None:
+        self._lock = Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def size(self) -> int:
+        return self._size
+
+    def count(self) -> int:
+        return len(self._entries)
+
+    def _is_expired(self, inserted_at: float, now: float) -> bool:
+        return self.ttl is not None and now - inserted_at > self.ttl
+
+    def _remove(self, key: Hashable):
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+    def get(self, key: Hashable) -> Any | None:
+        if not self.enabled():
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or self._is_expired(entry[2], time()):
+                if entry is not None:
+                    self._remove(key)
+
+                self.misses += 1
+
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int):
+        # NOTE: entries larger than the cache are never kept
+        if not self.enabled() or size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (value, size, time())
+            self._size += size
+
+            while self._size > self.max_bytes:
+                evicted_key = next(iter(self._entries))
+                self._remove(evicted_key)
+                self.evictions += 1
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        with self._lock:
+            keys = list(filter(predicate, self._entries.keys()))
+
+            for key in keys:
+                self._remove(key)
+
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
@@ -21,6 +21,149 @@ from objects.work_request import WorkRequest, WorkRequestModel
 from pydantic import BaseModel
 
 
+# A WorkRequest's slice of a (micro-)batched job submission
+class JobBatchEntry:
+    work_request_id: str
+    entries: list[str]
+    offset: int
+
+    def __init__(self, work_request_id: str, entries: list[str], offset: int = 0):
+        self.work_request_id = str(work_request_id)
+        self.entries = entries
+        self.offset = offset
+
+    @staticmethod
+    def build_batch(
+        work_request_entries: list[tuple[str, list[str]]],
+    ) -> list["JobBatchEntry"]:
+        batch: list[JobBatchEntry] = []
+        offset = 0
+
+        for work_request_id, entries in work_request_entries:
+            batch.append(JobBatchEntry(work_request_id, entries, offset))
+            offset += len(entries)
+
+        return batch
+
+    @staticmethod
+    def batch_entries(batch: list["JobBatchEntry"]) -> list[str]:
+        return [entry for batch_entry in batch for entry in batch_entry.entries]
+
+
+# current (non-idle) instance usage, as tracked by the ModelInstanceController
+class InstanceCapacity:
+    max_instances: int
+    active_instances: int
+    idle_instances: int
+    memory_budget: int  # in megabytes, 0 = unlimited
+    memory_in_use: int  # in megabytes
+    model_instances: dict[str, int]
+    memory_class_instances: dict[str, int]
+
+    def __init__(
+        self,
+        max_instances: int,
+        active_instances: int,
+        idle_instances: int,
+        memory_budget: int,
+        memory_in_use: int,
+        model_instances: dict[str, int],
+        memory_class_instances: dict[str, int],
+    ):
+        self.max_instances = max_instances
+        self.active_instances = active_instances
+        self.idle_instances = idle_instances
+        self.memory_budget = memory_budget
+        self.memory_in_use = memory_in_use
+        self.model_instances = model_instances
+        self.memory_class_instances = memory_class_instances
+
+
+class InstanceCapacityModel(BaseModel):
+    max_instances: int
+    active_instances: int
+    idle_instances: int
+    memory_budget: int
+    memory_in_use: int
+    model_instances: dict[str, int]
+    memory_class_instances: dict[str, int]
+
+    @staticmethod
+    def from_object(obj: InstanceCapacity) -> "InstanceCapacityModel":
+        return InstanceCapacityModel(
+            max_instances=obj.max_instances,
+            active_instances=obj.active_instances,
+            idle_instances=obj.idle_instances,
+            memory_budget=obj.memory_budget,
+            memory_in_use=obj.memory_in_use,
+            model_instances=obj.model_instances,
+            memory_class_instances=obj.memory_class_instances,
+        )
+
+
+# prewarmed instances (see ModelPrewarmer) and their hit rate, per model
+class ModelPrewarmStats:
+    budget: int
+    predicted_model_ids: list[str]
+    prewarmed_model_ids: list[str]
+    hits: dict[str, int]
+    cold_starts: dict[str, int]
+
+    def __init__(
+        self,
+        budget: int,
+        predicted_model_ids: list[str],
+        prewarmed_model_ids: list[str],
+        hits: dict[str, int],
+        cold_starts: dict[str, int],
+    ):
+        self.budget = budget
+        self.predicted_model_ids = predicted_model_ids
+        self.prewarmed_model_ids = prewarmed_model_ids
+        self.hits = hits
+        self.cold_starts = cold_starts
+
+    # WorkRequests served by a prewarmed instance, out of all WorkRequests that needed a new pod
+    def hit_rate(self, model_id: str | None = None) -> float:
+        hits = (
+            sum(self.hits.values()) if model_id is None else self.hits.get(model_id, 0)
+        )
+        cold_starts = (
+            sum(self.cold_starts.values())
+            if model_id is None
+            else self.cold_starts.get(model_id, 0)
+        )
+
+        return 0 if hits + cold_starts == 0 else hits / (hits + cold_starts)
+
+
+class ModelPrewarmStatsModel(BaseModel):
+    budget: int
+    predicted_model_ids: list[str]
+    prewarmed_model_ids: list[str]
+    hits: dict[str, int]
+    cold_starts: dict[str, int]
+    hit_rate: float
+    model_hit_rates: dict[str, float]
+
+    @staticmethod
+    def from_object(obj: ModelPrewarmStats) -> "ModelPrewarmStatsModel":
+        return ModelPrewarmStatsModel(
+            budget=obj.budget,
+            predicted_model_ids=obj.predicted_model_ids,
+            prewarmed_model_ids=obj.prewarmed_model_ids,
+            hits=obj.hits,
+            cold_starts=obj.cold_starts,
+            hit_rate=obj.hit_rate(),
+            model_hit_rates=dict(
+                map(
+                    lambda model_id: (model_id, obj.hit_rate(model_id)),
+                    set(obj.hits.keys()) | set(obj.cold_starts.keys()),
+                )
+            ),
+        )
+
+
 class ModelInstance:
     model_id: str
     work_request_id: int
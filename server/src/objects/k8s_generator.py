@@ -209,3 +209,20 @@ def generate_tolerations(model_size_megabytes: int) -> List[V1Toleration]:
         )
 
     return tolerations
+
+
+# the (preferred) node sku of the model, see generate_affinity
+def generate_memory_class(model_size_megabytes: int) -> str:
+    if model_size_megabytes <= 1024:
+        return "2Gi"
+
+    if model_size_megabytes <= 3072:
+        return "4Gi"
+
+    if model_size_megabytes <= 7168:
+        return "8Gi"
+
+    if model_size_megabytes <= 15360:
+        return "16Gi"
+
+    return "XL"
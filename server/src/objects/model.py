@@ -3,6 +3,7 @@ from json import dumps, loads
 from typing import Any, Dict, Union
 
 from db.daos.model import ModelRecord
+from db.daos.model_input_cache import ModelInputCacheRecord
 from objects.k8s import K8sPodResources
 from objects.k8s_model import K8sPodResourcesModel
 from pydantic import BaseModel
@@ -112,6 +113,10 @@ class ModelDetails:
     image_tag: str
     cache_enabled: bool
     identification_details: ModelIdentificationDetails | None
+    # seconds a ready instance is kept warm for the next request, 0 = disabled
+    instance_idle_timeout: int
+    # max number of instances a single (large) request is split across, 1 = disabled
+    max_shards: int
 
     def __init__(
         self,
@@ -125,6 +130,8 @@ class ModelDetails:
         image_tag: str = "latest",
         cache_enabled: bool = False,
         identification_details: ModelIdentificationDetails | None = None,
+        instance_idle_timeout: int = 0,
+        max_shards: int = 1,
     ):
         self.template_version = template_version
         self.description = description
@@ -145,6 +152,8 @@ class ModelDetails:
         self.image_tag = image_tag
         self.cache_enabled = cache_enabled
         self.identification_details = identification_details
+        self.instance_idle_timeout = instance_idle_timeout
+        self.max_shards = max_shards
 
     def copy(self) -> "ModelDetails":
         return ModelDetails(
@@ -160,6 +169,8 @@ class ModelDetails:
             None
             if self.identification_details is None
             else self.identification_details.copy(),
+            self.instance_idle_timeout,
+            self.max_shards,
         )
 
     @staticmethod
@@ -198,6 +209,17 @@ class ModelDetails:
                     obj["identificationDetails"]
                 )
             ),
+            (
+                0
+                if "instanceIdleTimeout" not in obj
+                or obj["instanceIdleTimeout"] is None
+                else obj["instanceIdleTimeout"]
+            ),
+            (
+                1
+                if "maxShards" not in obj or obj["maxShards"] is None
+                else obj["maxShards"]
+            ),
         )
 
     def to_object(self) -> Dict[str, Any]:
@@ -216,6 +238,8 @@ class ModelDetails:
                 if self.identification_details is None
                 else self.identification_details.to_object()
             ),
+            "instanceIdleTimeout": self.instance_idle_timeout,
+            "maxShards": self.max_shards,
         }
 
     def __str__(self):
@@ -273,6 +297,8 @@ class ModelDetailsApiModel(BaseModel):
     image_tag: str
     cache_enabled: bool
     identification_details: ModelIdentificationDetailsModel | None = None
+    instance_idle_timeout: int | None = None
+    max_shards: int | None = None
 
     @staticmethod
     def from_object(model_details: ModelDetails) -> "ModelDetailsApiModel":
@@ -292,6 +318,8 @@ class ModelDetailsApiModel(BaseModel):
                     model_details.identification_details
                 )
             ),
+            instance_idle_timeout=model_details.instance_idle_timeout,
+            max_shards=model_details.max_shards,
         )
 
     def to_object(self) -> ModelDetails:
@@ -310,6 +338,8 @@ class ModelDetailsApiModel(BaseModel):
                 if self.identification_details is None
                 else self.identification_details.to_object()
             ),
+            0 if self.instance_idle_timeout is None else self.instance_idle_timeout,
+            1 if self.max_shards is None else self.max_shards,
         )
 
 
@@ -450,6 +480,158 @@ class ModelScalingInfoModel(BaseModel):
         )
 
 
+class ModelCachedResultsRequestModel(BaseModel):
+    inputs: list[str]
+
+
+class ModelCachedResultModel(BaseModel):
+    input: str
+    result: Any
+
+
+class ModelCachedResultsModel(BaseModel):
+    hits: list[ModelCachedResultModel]
+    misses: list[str]
+
+    @staticmethod
+    def from_object(
+        hits: list[ModelInputCacheRecord], misses: list[str]
+    ) -> "ModelCachedResultsModel":
+        return ModelCachedResultsModel(
+            hits=list(
+                map(
+                    lambda record: ModelCachedResultModel(
+                        input=record.input, result=loads(record.result)
+                    ),
+                    hits,
+                )
+            ),
+            misses=misses,
+        )
+
+
+class ModelInputCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+    def __init__(
+        self,
+        hits: int,
+        misses: int,
+        evictions: int,
+        entries: int,
+        size_bytes: int,
+        max_bytes: int,
+    ):
+        self.hits = hits
+        self.misses = misses
+        self.evictions = evictions
+        self.entries = entries
+        self.size_bytes = size_bytes
+        self.max_bytes = max_bytes
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+
+        return 0 if lookups == 0 else self.hits / lookups
+
+
+class ModelInputCacheStatsModel(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    hit_rate: float
+
+    @staticmethod
+    def from_object(obj: ModelInputCacheStats) -> "ModelInputCacheStatsModel":
+        return ModelInputCacheStatsModel(
+            hits=obj.hits,
+            misses=obj.misses,
+            evictions=obj.evictions,
+            entries=obj.entries,
+            size_bytes=obj.size_bytes,
+            max_bytes=obj.max_bytes,
+            hit_rate=obj.hit_rate(),
+        )
+
+
+class ModelInputCacheFilterStats:
+    model_id: str
+    entries: int
+    capacity: int
+    memory_bytes: int
+    hash_count: int
+    estimated_false_positive_rate: float
+    skipped_lookups: int
+    false_positives: int
+    built_at: str
+
+    def __init__(
+        self,
+        model_id: str,
+        entries: int,
+        capacity: int,
+        memory_bytes: int,
+        hash_count: int,
+        estimated_false_positive_rate: float,
+        skipped_lookups: int,
+        false_positives: int,
+        built_at: str,
+    ):
+        self.model_id = model_id
+        self.entries = entries
+        self.capacity = capacity
+        self.memory_bytes = memory_bytes
+        self.hash_count = hash_count
+        self.estimated_false_positive_rate = estimated_false_positive_rate
+        self.skipped_lookups = skipped_lookups
+        self.false_positives = false_positives
+        self.built_at = built_at
+
+    # non-cached inputs that were still looked up in the database, out of all non-cached inputs
+    def observed_false_positive_rate(self) -> float:
+        non_cached = self.skipped_lookups + self.false_positives
+
+        return 0 if non_cached == 0 else self.false_positives / non_cached
+
+
+class ModelInputCacheFilterStatsModel(BaseModel):
+    model_id: str
+    entries: int
+    capacity: int
+    memory_bytes: int
+    hash_count: int
+    estimated_false_positive_rate: float
+    observed_false_positive_rate: float
+    skipped_lookups: int
+    false_positives: int
+    built_at: str
+
+    @staticmethod
+    def from_object(
+        obj: ModelInputCacheFilterStats,
+    ) -> "ModelInputCacheFilterStatsModel":
+        return ModelInputCacheFilterStatsModel(
+            model_id=obj.model_id,
+            entries=obj.entries,
+            capacity=obj.capacity,
+            memory_bytes=obj.memory_bytes,
+            hash_count=obj.hash_count,
+            estimated_false_positive_rate=obj.estimated_false_positive_rate,
+            observed_false_positive_rate=obj.observed_false_positive_rate(),
+            skipped_lookups=obj.skipped_lookups,
+            false_positives=obj.false_positives,
+            built_at=obj.built_at,
+        )
+
+
 class ModelUpdate:
     id: str
     details: ModelDetails
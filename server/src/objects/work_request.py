@@ -1,6 +1,6 @@
 from enum import Enum
 from json import dumps, loads
-from typing import Any, Dict, List, Union
+from typing import Any, Callable, Dict, List, Union
 
 from db.daos.work_request import WorkRequestRecord
 from pydantic import BaseModel, Field
@@ -54,6 +54,7 @@ class WorkRequestStatus(Enum):
     QUEUED = "QUEUED"
     SCHEDULING = "SCHEDULING"
     PROCESSING = "PROCESSING"
+    UPLOADING = "UPLOADING"
     FAILED = "FAILED"
     COMPLETED = "COMPLETED"
 
@@ -163,11 +164,15 @@ class WorkRequestMetadata:
         }
 
 
+WorkRequestPayloadLoader = Callable[[int], Union[WorkRequestPayload, None]]
+
+
 class WorkRequest:
     id: int
     model_id: str
     user_id: str
-    request_payload: WorkRequestPayload | None
+    _request_payload: WorkRequestPayload | None
+    _payload_loader: WorkRequestPayloadLoader | None
     request_date: str
     metadata: WorkRequestMetadata
     request_status: WorkRequestStatus
@@ -201,7 +206,8 @@ class WorkRequest:
         self.id = id
         self.model_id = model_id
         self.user_id = user_id
-        self.request_payload = request_payload
+        self._request_payload = request_payload
+        self._payload_loader = None
         self.request_date = request_date
         self.metadata = metadata
         self.request_status = request_status
@@ -214,6 +220,28 @@ class WorkRequest:
         self.input_size = input_size
         self.server_id = server_id
 
+    @property
+    def request_payload(self) -> WorkRequestPayload | None:
+        # NOTE: header-only WorkRequests load the payload on first access
+        if self._request_payload is None and self._payload_loader is not None:
+            self._request_payload = self._payload_loader(self.id)
+
+            if self._request_payload is not None:
+                self._payload_loader = None
+
+        return self._request_payload
+
+    @request_payload.setter
+    def request_payload(self, request_payload: WorkRequestPayload | None):
+        self._request_payload = request_payload
+        self._payload_loader = None
+
+    def set_payload_loader(self, payload_loader: WorkRequestPayloadLoader | None):
+        self._payload_loader = payload_loader
+
+    def is_payload_loaded(self) -> bool:
+        return self._request_payload is not None
+
     @staticmethod
     def init_from_record(record: WorkRequestRecord) -> "WorkRequest":
         request_payload: WorkRequestPayload | None = None
@@ -254,11 +282,11 @@ class WorkRequest:
         )
 
     def copy(self) -> "WorkRequest":
-        return WorkRequest(
+        work_request = WorkRequest(
             self.id,
             self.model_id,
             self.user_id,
-            self.request_payload,
+            self._request_payload,
             self.request_date,
             self.metadata,
             self.request_status,
@@ -271,6 +299,9 @@ class WorkRequest:
             self.input_size,
             self.server_id,
         )
+        work_request.set_payload_loader(self._payload_loader)
+
+        return work_request
 
     def to_record(self) -> WorkRequestRecord:
         return WorkRequestRecord.init(
@@ -279,8 +310,8 @@ class WorkRequest:
             userid=self.user_id,
             requestpayload=(
                 None
-                if self.request_payload is None
-                else dumps(self.request_payload.to_object())
+                if self._request_payload is None
+                else dumps(self._request_payload.to_object())
             ),
             requestdate=self.request_date,
             metadata=dumps(self.metadata.to_object()),
@@ -369,6 +400,15 @@ class WorkRequestCreateModel(BaseModel):
         }
 
 
+class WorkRequestBulkCreateModel(BaseModel):
+    items: List[WorkRequestCreateModel]
+
+
+class WorkRequestBulkCreateResultModel(BaseModel):
+    # in the order of the submitted items
+    ids: List[int]
+
+
 # Result is either a Json list or a CSV file of lines
 WorkRequestResult = List[Union[str, Dict[str, Any]]]
 
@@ -0,0 +1,11 @@
+###
+# Unit tests of the dependency-free server modules (e.g. library).
+#
+# From the server base directory:
+#   python -m pytest tests
+###
+
+from os.path import dirname, join
+from sys import path
+
+path.insert(0, join(dirname(dirname(__file__)), "src"))
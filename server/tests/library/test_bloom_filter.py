@@ -0,0 +1,59 @@
+from library.bloom_filter import BloomFilter
+from library.cache_reconciliation import hash_input
+
+
+def test_no_false_negatives():
+    bloom_filter = BloomFilter(1000, 0.01)
+    digests = [hash_input("added-%d" % i) for i in range(1000)]
+
+    for digest in digests:
+        bloom_filter.add(digest)
+
+    assert all(map(bloom_filter.might_contain, digests))
+    assert bloom_filter.count == 1000
+    assert not bloom_filter.is_over_capacity()
+
+
+def test_false_positives_within_rate():
+    bloom_filter = BloomFilter(1000, 0.01)
+
+    for i in range(1000):
+        bloom_filter.add(hash_input("added-%d" % i))
+
+    false_positives = sum(
+        bloom_filter.might_contain(hash_input("missing-%d" % i)) for i in range(10000)
+    )
+
+    # NOTE: false positives are allowed, only bounded (expected ~100 of 10000)
+    assert false_positives < 300
+    assert bloom_filter.false_positive_rate() < 0.03
+
+
+def test_empty_filter_contains_nothing():
+    bloom_filter = BloomFilter(100, 0.01)
+
+    assert not any(
+        bloom_filter.might_contain(hash_input("missing-%d" % i)) for i in range(100)
+    )
+    assert bloom_filter.false_positive_rate() == 0
+
+
+def test_over_capacity():
+    bloom_filter = BloomFilter(10, 0.01)
+
+    for i in range(11):
+        bloom_filter.add(hash_input("added-%d" % i))
+
+    assert bloom_filter.is_over_capacity()
+    assert all(
+        bloom_filter.might_contain(hash_input("added-%d" % i)) for i in range(11)
+    )
+
+
+def test_sizing():
+    bloom_filter = BloomFilter(1000, 0.01)
+
+    # ~9.6 bits and ~7 hashes per entry for a 1% false positive rate
+    assert 9000 <= bloom_filter.bit_count <= 10000
+    assert bloom_filter.hash_count == 7
+    assert bloom_filter.memory_bytes() == (bloom_filter.bit_count + 7) // 8
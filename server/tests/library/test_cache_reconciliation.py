@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+from typing import List
+
+from library.cache_reconciliation import CacheReconciliation, hash_input
+
+
+@dataclass
+class Record:
+    input_hash: str
+    result: str
+
+
+def cached_lookup(cached_inputs: List[str], lookups: List[List[str]]):
+    table = {
+        hash_input(input): Record(hash_input(input), input) for input in cached_inputs
+    }
+
+    def lookup(input_hashes: List[str]) -> List[Record]:
+        lookups.append(input_hashes)
+
+        return [table[h] for h in input_hashes if h in table]
+
+    return lookup
+
+
+def test_duplicates_are_looked_up_once():
+    inputs = ["a", "b", "a", "c", "b", "a"]
+    lookups = []
+
+    reconciliation = CacheReconciliation(inputs)
+    reconciliation.lookup(cached_lookup(["b"], lookups), batch_size=10)
+
+    assert reconciliation.unique_hashes() == list(map(hash_input, ["a", "b", "c"]))
+    assert lookups == [list(map(hash_input, ["a", "b", "c"]))]
+    assert reconciliation.hit_indexes() == [1, 4]
+    assert reconciliation.miss_indexes() == [0, 2, 3, 5]
+    assert [r.result for r in reconciliation.cached_records()] == ["b"]
+    assert reconciliation.non_cached_inputs() == ["a", "a", "c", "a"]
+    assert reconciliation.unique_non_cached_inputs() == ["a", "c"]
+    assert not reconciliation.is_complete()
+
+
+def test_all_cached_is_complete():
+    inputs = ["a", "b", "a"]
+
+    reconciliation = CacheReconciliation(inputs)
+    reconciliation.lookup(cached_lookup(inputs, []), batch_size=1)
+
+    assert reconciliation.is_complete()
+    assert reconciliation.miss_indexes() == []
+    assert reconciliation.non_cached_inputs() == []
+    assert reconciliation.pending_hashes() == []
+
+
+def test_known_misses_are_not_looked_up():
+    inputs = ["a", "b", "c", "b"]
+    lookups = []
+
+    reconciliation = CacheReconciliation(inputs)
+    reconciliation.add_known_misses([hash_input("a"), hash_input("c")])
+    reconciliation.lookup(cached_lookup(["b"], lookups), batch_size=10)
+
+    assert lookups == [[hash_input("b")]]
+    assert reconciliation.is_complete() is False
+    assert reconciliation.hit_indexes() == [1, 3]
+    assert reconciliation.unique_non_cached_inputs() == ["a", "c"]
+
+
+def test_all_known_misses_skip_the_lookup():
+    inputs = ["a", "b"]
+    lookups = []
+
+    reconciliation = CacheReconciliation(inputs)
+    reconciliation.add_known_misses(reconciliation.unique_hashes())
+    reconciliation.lookup(cached_lookup(inputs, lookups), batch_size=10)
+
+    assert lookups == []
+    assert reconciliation.non_cached_inputs() == inputs
+
+
+def test_lookup_batches_are_split_by_batch_size():
+    inputs = [str(i) for i in range(7)] + ["0", "1"]
+
+    reconciliation = CacheReconciliation(inputs)
+    batches = list(reconciliation.lookup_batches(3))
+
+    assert list(map(len, batches)) == [3, 3, 1]
+    assert sum(batches, []) == reconciliation.unique_hashes()
+
+
+def test_lookup_batches_skip_found_records():
+    inputs = ["a", "b", "c"]
+
+    reconciliation = CacheReconciliation(inputs)
+    reconciliation.add_records([Record(hash_input("b"), "b")])
+
+    assert list(reconciliation.lookup_batches(10)) == [
+        [hash_input("a"), hash_input("c")]
+    ]
+
+
+def test_first_record_per_hash_is_kept():
+    reconciliation = CacheReconciliation(["a"])
+    reconciliation.add_records([Record(hash_input("a"), "first")])
+    reconciliation.add_records([Record(hash_input("a"), "second")])
+
+    assert [r.result for r in reconciliation.cached_records()] == ["first"]
+
+
+def test_empty_inputs():
+    lookups = []
+
+    reconciliation = CacheReconciliation([])
+    reconciliation.lookup(cached_lookup([], lookups), batch_size=10)
+
+    assert lookups == []
+    assert reconciliation.is_complete()
+    assert reconciliation.non_cached_inputs() == []
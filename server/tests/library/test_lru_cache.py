@@ -0,0 +1,107 @@
+from unittest.mock import patch
+
+from library.lru_cache import LRUCache
+
+
+def test_get_put():
+    cache = LRUCache(100)
+    cache.put("a", 1, 10)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert (cache.count(), cache.size()) == (1, 10)
+
+
+def test_least_recently_used_is_evicted():
+    cache = LRUCache(30)
+    cache.put("a", 1, 10)
+    cache.put("b", 2, 10)
+    cache.put("c", 3, 10)
+
+    # "a" becomes the most recently used
+    assert cache.get("a") == 1
+
+    cache.put("d", 4, 10)
+
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in ["a", "c", "d"]] == [1, 3, 4]
+    assert cache.evictions == 1
+    assert cache.size() == 30
+
+
+def test_evicts_until_within_max_bytes():
+    cache = LRUCache(30)
+    cache.put("a", 1, 10)
+    cache.put("b", 2, 10)
+    cache.put("c", 3, 25)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.evictions == 2
+    assert cache.size() == 25
+
+
+def test_put_replaces_existing_entry():
+    cache = LRUCache(30)
+    cache.put("a", 1, 10)
+    cache.put("a", 2, 20)
+
+    assert cache.get("a") == 2
+    assert (cache.count(), cache.size()) == (1, 20)
+    assert cache.evictions == 0
+
+
+def test_entry_larger_than_cache_is_not_kept():
+    cache = LRUCache(30)
+    cache.put("a", 1, 10)
+    cache.put("b", 2, 31)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+
+def test_disabled():
+    cache = LRUCache(0)
+    cache.put("a", 1, 0)
+
+    assert not cache.enabled()
+    assert cache.get("a") is None
+    assert cache.count() == 0
+
+
+def test_invalidate():
+    cache = LRUCache(100)
+    cache.put(("model-1", "a"), 1, 10)
+    cache.put(("model-1", "b"), 2, 10)
+    cache.put(("model-2", "a"), 3, 10)
+
+    assert cache.invalidate(lambda key: key[0] == "model-1") == 2
+    assert cache.get(("model-1", "a")) is None
+    assert cache.get(("model-2", "a")) == 3
+    assert (cache.count(), cache.size()) == (1, 10)
+
+
+def test_clear():
+    cache = LRUCache(100)
+    cache.put("a", 1, 10)
+    cache.clear()
+
+    assert cache.get("a") is None
+    assert (cache.count(), cache.size()) == (0, 0)
+
+
+def test_expired_entries_are_removed():
+    cache = LRUCache(100, ttl=60)
+
+    with patch("library.lru_cache.time", return_value=1000):
+        cache.put("a", 1, 10)
+
+    with patch("library.lru_cache.time", return_value=1060):
+        assert cache.get("a") == 1
+
+    with patch("library.lru_cache.time", return_value=1061):
+        assert cache.get("a") is None
+
+    assert (cache.count(), cache.size()) == (0, 0)